@@ -2,6 +2,8 @@ from langchain_core.prompts import ChatPromptTemplate
 from typing import Any, Optional
 import re
 
+from core.alphas.helper_rewrite import use_shared_transforms
+
 class AlphaCodeRefinerAgent:
     """
     Post-processing agent for Quantreo alpha code.
@@ -11,7 +13,7 @@ class AlphaCodeRefinerAgent:
     - Keep logic identical, but enforce Quantreo conventions.
     - ONE function returning Tuple[pd.Series, pd.Series] = (alpha, condition).
     - NumPy-style docstring is REQUIRED.
-    - Helpers must be SERIES-based (ema(x,n), sma(x,n)).
+    - Helpers (ema, sma, std, zscore, rank, lag, clip) are imported from core.alphas.transforms.
     - Remove unused imports/helpers/parameters.
     - No 'future_' tokens (strip prefix deterministically).
     - No look-ahead (rolling/ewm = past/current only).
@@ -33,17 +35,17 @@ class AlphaCodeRefinerAgent:
              "   Prefer: window_ema: int = 20, window_sma: int = 50, eps: float = 1e-12 (if they are used).\n"
              "2) Return EXACTLY Tuple[pd.Series, pd.Series]: (alpha, condition).\n"
              "3) NumPy-style docstring REQUIRED with Parameters / Returns / Notes.\n"
-             "4) Helpers MUST be SERIES-based:\n"
-             "   - ema(x, n) = x.ewm(span=n, adjust=False).mean()\n"
-             "   - sma(x, n) = x.rolling(window=n).mean()\n"
-             "   Define ONLY helpers that are actually used by the function.\n"
+             "4) Helpers are NOT defined in the file: import them from the shared library, e.g.\n"
+             "   from core.alphas.transforms import ema, sma, std, zscore, rank, lag, clip\n"
+             "   Import ONLY the transforms actually used. Replace any local ema/sma/std/zscore/rank/lag/clip "
+             "definition and any .rolling(...)/.ewm(...) call by the shared transform (abs is the builtin abs).\n"
              "5) Replace any string math passed to helpers (e.g., ema(df,'a*b',n)) with real pandas expressions using Series variables.\n"
              "6) Validate required columns:\n"
              "   required = {{<columns referenced like df['col']>}};\n"
              "   missing = required - set(df.columns); if missing: raise ValueError(...)\n"
              "7) Protect divisions with epsilon: denom.abs().clip(lower=eps)\n"
              "8) No look-ahead: use only rolling/ewm past/current; leave NaNs as-is.\n"
-             "9) Imports: keep ONLY what is used. Always `import pandas as pd`; add `from typing import Tuple` if type hints use Tuple; add `import numpy as np` only if np.* is used.\n"
+             "9) Imports: keep ONLY what is used. Always `import pandas as pd`; add `from typing import Tuple` if type hints use Tuple; add `import numpy as np` only if np.* is used; import transforms from core.alphas.transforms.\n"
              "10) Remove any 'future_' tokens everywhere (strip the prefix deterministically).\n"
              "11) Remove unused imports, helpers and function parameters.\n"
              "12) Do not add any comments or text outside the code."),
@@ -97,6 +99,9 @@ class AlphaCodeRefinerAgent:
         for helper in ["std", "rank", "zscore"]:
             code = self._drop_helper_if_unused(code, helper)
 
+        # Swap redefined helpers (ema, sma, zscore, rank via Rolling.apply, ...) for the shared kernels
+        code, _ = use_shared_transforms(code)
+
         # Collapse excessive blank lines
         code = re.sub(r"\n{3,}", "\n\n", code)
 
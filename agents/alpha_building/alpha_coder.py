@@ -48,15 +48,18 @@ class AlphaCoderAgent:
              "4) Absolutely NO look-ahead. Leave NaNs from rolling/EMA as-is (no fillna or forward-fill).\n"
              "5) Fully vectorized numpy/pandas only. Do not use loops. Do not use DataFrame.apply over rows. "
              "Do not use Rolling.apply with lambdas.\n"
-             "6) Allowed transforms must be applied via small SERIES-based helpers only (define only what you use): "
-             "sma(x, n) = x.rolling(window=n).mean(); ema(x, n) = x.ewm(span=n, adjust=False).mean(); "
-             "std(x, n); zscore(x, n); rank(x, n); abs(x); clip(x, lo, hi); lag(x, n). "
-             "Do NOT call .rolling(...) or .ewm(...) directly in the main body; only inside helpers.\n"
+             "6) Allowed transforms come from the shared Quantreo library and must NOT be redefined: "
+             "`from core.alphas.transforms import sma, ema, std, zscore, rank, lag, clip` (import only what you use). "
+             "They are Series-based and NaN-consistent: sma(x, n), ema(x, n) (span=n, adjust=False), std(x, n), "
+             "zscore(x, n), rank(x, n) (rolling rank of the current value), lag(x, n), clip(x, lo, hi); "
+             "use the builtin abs(x). "
+             "Do NOT call .rolling(...) or .ewm(...) in the code.\n"
              "7) Function signature must be MINIMAL: df: pd.DataFrame first, then only hyperparameters actually used "
              "(e.g., ema_window, sma_window, eps=1e-12). Do NOT invent parameters mirroring feature windows "
              "(e.g., tail_returns_window); feature windows are already encoded in the column names.\n"
              "8) Imports at the top and only if used: always `import pandas as pd`; add `from typing import Tuple` if you "
-             "use Tuple in type hints; add `import numpy as np` only if you call np.*. Do not import unused names.\n"
+             "use Tuple in type hints; add `import numpy as np` only if you call np.*; import the transforms you call "
+             "from core.alphas.transforms. Do not import unused names.\n"
              "Always put at the top: from typing import Tuple.\n"
              "9) Never reference tokens starting with `future_`. If such tokens appear in YAML, treat them as their "
              "ex-ante equivalents (strip the prefix).\n"
@@ -2,7 +2,7 @@
 #  ALPHA FORMULATOR AGENT
 # ==========================================================
 from langchain_core.prompts import ChatPromptTemplate
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from pathlib import Path
 import yaml
 import re
@@ -24,6 +24,7 @@ class AlphaFormulatorAgent:
         """
         self.llm = llm
         self.prompt_template = self._build_prompt()
+        self.batch_prompt_template = self._build_batch_prompt()
 
     # ------------------------------------------------------------------
     def _build_prompt(self) -> ChatPromptTemplate:
@@ -63,6 +64,72 @@ class AlphaFormulatorAgent:
             )
         ])
 
+    # ------------------------------------------------------------------
+    def _build_batch_prompt(self) -> ChatPromptTemplate:
+        """
+        Same rules and schema as `_build_prompt`, for K concepts at once:
+        one YAML document per concept, separated by '---', each echoing the
+        concept id in meta.concept_id so results can be mapped back.
+        """
+        return ChatPromptTemplate.from_messages([
+            (
+                "system",
+                "You are a senior quantitative researcher. You receive SEVERAL alpha_concept YAMLs, "
+                "each with an id, and must convert EACH of them into ONE concrete alpha formula. "
+                "Output YAML only.\n\n"
+                "Rules:\n"
+                "- Output exactly one YAML document per concept, separated by a line '---'. "
+                "No markdown. No code fences.\n"
+                "- Root keys of each document: 'alpha_formula' and 'meta'.\n"
+                "- meta.concept_id must repeat the id of the concept the formula belongs to.\n"
+                "- Use only simple math and standard transforms:\n"
+                "  +, -, *, /, abs(), zscore(x), rank(x), ema(x, n), sma(x, n), std(x, n), lag(x, n)\n"
+                "- Use features listed in each concept's related_features.\n"
+                "- Keep formulas parsimonious (2 or 3 terms plus optional conditioning).\n"
+                "- Reject or strip any token starting with future_.\n\n"
+                "Required YAML schema (per document):\n"
+                "alpha_formula:\n"
+                "  name: <short formula name>\n"
+                "  formula: <expression>\n"
+                "  conditioning: <boolean expression or null>\n"
+                "meta:\n"
+                "  concept_id: <id of the concept>\n"
+            ),
+            (
+                "user",
+                "Here are the {n_concepts} alpha_concepts:\n\n{concepts_yaml}\n\n"
+                "Return {n_concepts} YAML documents separated by '---', following the schema above. "
+                "No markdown, no fences."
+            )
+        ])
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _clean(raw_output: str) -> str:
+        # Remove unwanted markdown-like artifacts
+        cleaned = re.sub(r"^```[a-zA-Z]*\s*", "", raw_output.strip()).strip()
+        return re.sub(r"```$", "", cleaned).strip()
+
+    @staticmethod
+    def _validate(parsed: Any, concept: Dict[str, Any]) -> Dict[str, Any]:
+        """Check the schema of ONE parsed document and attach the concept name (raises ValueError)."""
+        if not isinstance(parsed, dict) or "alpha_formula" not in parsed:
+            raise ValueError("Missing 'alpha_formula' at root level.")
+
+        af = parsed["alpha_formula"]
+        if not isinstance(af, dict) or not af.get("formula"):
+            raise ValueError("Invalid or empty 'formula' field.")
+
+        # Use concept name as formula name fallback
+        concept_name = concept.get("alpha_concept", {}).get("name") or "unnamed_formula"
+        parsed["alpha_formula"]["name"] = concept_name
+
+        # Fill metadata
+        if not isinstance(parsed.get("meta"), dict):
+            parsed["meta"] = {}
+        parsed["meta"]["concept_name"] = concept_name
+        return parsed
+
     # ------------------------------------------------------------------
     def formulate_alpha(self, concept: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
@@ -80,10 +147,7 @@ class AlphaFormulatorAgent:
         messages = self.prompt_template.format_messages(concept_yaml=concept_yaml)
         response = self.llm.invoke(messages)
         raw_output = response.content.strip()
-
-        # Remove unwanted markdown-like artifacts
-        cleaned = re.sub(r"^```[a-zA-Z]*\s*", "", raw_output).strip()
-        cleaned = re.sub(r"```$", "", cleaned).strip()
+        cleaned = self._clean(raw_output)
 
         try:
             parsed = yaml.safe_load(cleaned)
@@ -92,22 +156,7 @@ class AlphaFormulatorAgent:
             if isinstance(parsed, list):
                 parsed = next((d for d in parsed if isinstance(d, dict) and "alpha_formula" in d), None)
 
-            # Validate structure
-            if not isinstance(parsed, dict) or "alpha_formula" not in parsed:
-                raise ValueError("Missing 'alpha_formula' at root level.")
-
-            af = parsed["alpha_formula"]
-            if not isinstance(af, dict) or not af.get("formula"):
-                raise ValueError("Invalid or empty 'formula' field.")
-
-            # Use concept name as formula name fallback
-            concept_name = concept.get("alpha_concept", {}).get("name") or "unnamed_formula"
-            parsed["alpha_formula"]["name"] = concept_name
-
-            # Fill metadata
-            parsed.setdefault("meta", {})
-            parsed["meta"]["concept_name"] = concept_name
-
+            parsed = self._validate(parsed, concept)
             print("[INFO] Alpha formula parsed successfully.")
             return parsed
 
@@ -117,6 +166,82 @@ class AlphaFormulatorAgent:
             print(f"[ERROR] Failed to parse YAML: {e}")
             return None
 
+    # ------------------------------------------------------------------
+    def formulate_batch(
+        self,
+        concepts: Dict[str, Dict[str, Any]],
+        batch_size: int = 5,
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Formulate many concepts with one LLM call per `batch_size` concepts.
+
+        Args:
+            concepts: {basename: alpha_concept dict}. The basename is the id
+                the model must echo in meta.concept_id.
+            batch_size: Concepts packed into one prompt.
+
+        Returns:
+            {basename: alpha_formula dict or None}, in the input order. Items
+            missing from the batch answer or failing validation are retried
+            with a single `formulate_alpha` call; an unparseable answer
+            falls back to single calls for the whole batch.
+        """
+        ids = list(concepts)
+        results: Dict[str, Optional[Dict[str, Any]]] = {}
+        for start in range(0, len(ids), max(batch_size, 1)):
+            chunk = ids[start:start + max(batch_size, 1)]
+            parsed = self._formulate_chunk(chunk, concepts) if len(chunk) > 1 else {}
+            for cid in chunk:
+                if cid not in parsed:
+                    print(f"[INFO] Single-call fallback for {cid}.")
+                    parsed[cid] = self.formulate_alpha(concepts[cid])
+                results[cid] = parsed[cid]
+        return results
+
+    def _formulate_chunk(self, chunk: List[str], concepts: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """One batched call; returns only the items that parsed and validated."""
+        concepts_yaml = "\n---\n".join(
+            yaml.safe_dump({"id": cid, **concepts[cid]}, sort_keys=False) for cid in chunk
+        )
+        messages = self.batch_prompt_template.format_messages(
+            n_concepts=len(chunk), concepts_yaml=concepts_yaml
+        )
+        raw_output = self.llm.invoke(messages).content.strip()
+
+        try:
+            docs = [d for d in yaml.safe_load_all(self._clean(raw_output)) if d is not None]
+        except yaml.YAMLError as e:
+            Path("debug_alpha_formulator_output.yaml").write_text(raw_output, encoding="utf-8")
+            print(f"[ERROR] Failed to parse batch YAML ({len(chunk)} concepts): {e}")
+            return {}
+        # A single document holding a list of formulas is accepted as well
+        if len(docs) == 1 and isinstance(docs[0], list):
+            docs = docs[0]
+
+        # Map by echoed id; documents without a known id are matched by position
+        # only when the answer has exactly one document per concept
+        by_id: Dict[str, Any] = {}
+        positional = len(docs) == len(chunk)
+        for i, doc in enumerate(docs):
+            meta = doc.get("meta") if isinstance(doc, dict) else None
+            cid = meta.get("concept_id") if isinstance(meta, dict) else None
+            if cid not in chunk and positional:
+                cid = chunk[i]
+            if cid in chunk and cid not in by_id:
+                by_id[cid] = doc
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for cid, doc in by_id.items():
+            try:
+                doc = self._validate(doc, concepts[cid])
+            except ValueError as e:
+                print(f"[ERROR] Invalid formula for {cid}: {e}")
+                continue
+            doc["meta"].pop("concept_id", None)
+            out[cid] = doc
+        print(f"[INFO] Batch formulation: {len(out)}/{len(chunk)} formulas parsed from one call.")
+        return out
+
     # ------------------------------------------------------------------
     def save(self, alpha_yaml: Dict[str, Any], output_dir: Path, basename: Optional[str] = None):
         """
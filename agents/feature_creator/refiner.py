@@ -2,10 +2,12 @@
 
 from langchain_core.prompts import ChatPromptTemplate
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, List, Optional, Tuple
 from pathlib import Path
 import re
 
+from core.utils.llm_cache import invoke_uncached
+
 
 class FeatureCodeRefinerAgent:
     """
@@ -23,6 +25,7 @@ class FeatureCodeRefinerAgent:
     def __init__(self, llm: Any):
         self.llm = llm
         self.prompt_template = self._build_prompt()
+        self.perf_prompt_template = self._build_perf_prompt()
 
     # ------------------------------------------------------------------
     # Prompt template
@@ -50,6 +53,33 @@ class FeatureCodeRefinerAgent:
             ),
         ])
 
+    def _build_perf_prompt(self) -> ChatPromptTemplate:
+        return ChatPromptTemplate.from_messages([
+            (
+                "system",
+                "You are a senior quantitative software engineer optimizing Python feature code "
+                "for the Quantreo framework.\n\n"
+                "The code below was rejected by the performance gate. Rewrite it so that it is fully vectorized "
+                "while returning EXACTLY the same values (same index, same NaN positions).\n"
+                "Follow these rules strictly:\n"
+                "1. No Python loops, comprehensions, iterrows/itertuples, and no .apply / .map with lambdas "
+                "(including rolling(...).apply).\n"
+                "2. Use native pandas/numpy operations instead: rolling(...).mean/std/sum/min/max/quantile/rank, "
+                "shift, diff, cumsum, np.where, numpy.lib.stride_tricks.sliding_window_view.\n"
+                "   e.g. x.rolling(n).apply(lambda w: w.iloc[0]) is x.shift(n - 1); "
+                "x.rolling(n).apply(lambda w: w.iloc[k]) is x.shift(n - 1 - k) once the window is full.\n"
+                "3. Keep the function name, signature, docstring, comments and the logic.\n"
+                "4. Always return valid Python code — no markdown, no text explanations."
+            ),
+            (
+                "user",
+                "Performance issues found:\n{issues}\n\n"
+                "{rejected}"
+                "Code to optimize:\n\n{code}\n\n"
+                "Return only the optimized Python code."
+            ),
+        ])
+
     # ------------------------------------------------------------------
     # Core refine method
     # ------------------------------------------------------------------
@@ -72,6 +102,46 @@ class FeatureCodeRefinerAgent:
         print("✅ Code successfully refined by FeatureCodeRefinerAgent.")
         return cleaned_code
 
+    # ------------------------------------------------------------------
+    # Performance rewrite
+    # ------------------------------------------------------------------
+    def optimize(
+        self,
+        code_str: str,
+        issues: List[str],
+        rejected: Optional[List[Tuple[Optional[str], str]]] = None,
+    ) -> Optional[str]:
+        """
+        Ask the LLM for a vectorized rewrite of code rejected by the performance gate.
+        Retries must get a fresh answer, so the response cache is bypassed.
+
+        `rejected` lists the (candidate code, reason) of the previous rewrites
+        that were not kept, so the next attempt does not repeat them.
+        """
+        previous = ""
+        for i, (candidate, reason) in enumerate(rejected or [], start=1):
+            previous += f"Previous rewrite #{i} was rejected: {reason}\n"
+            if candidate:
+                previous += f"\n{candidate}\n\n"
+        if previous:
+            previous += "Fix these problems in the new rewrite.\n\n"
+
+        messages = self.perf_prompt_template.format_messages(
+            code=code_str,
+            issues="\n".join(f"- {i}" for i in issues),
+            rejected=previous,
+        )
+        response = invoke_uncached(self.llm, messages)
+        optimized = response.content.strip()
+
+        match = re.search(r"```(?:python)?\n(.*?)```", optimized, re.DOTALL)
+        optimized_code = match.group(1).strip() if match else optimized
+
+        if "def " not in optimized_code:
+            print("❌ No valid function definition found after optimization.")
+            return None
+        return optimized_code
+
     # ------------------------------------------------------------------
     # Save method
     # ------------------------------------------------------------------
@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 from pathlib import Path
 from typing import Any, Dict, Optional
+import hashlib
 import yaml
 import re
 
@@ -14,10 +15,20 @@ class FeatureDSRObserver:
     DSR observation (Definition, Stability, Robustness).
     """
 
+    # Bump when the expected DSR structure changes; prompt text edits are
+    # picked up by the fingerprint of `prompt_version` anyway.
+    PROMPT_VERSION = "1"
+
     def __init__(self, llm: Any):
         self.llm = llm
         self.prompt_template = self._build_prompt()
 
+    @property
+    def prompt_version(self) -> str:
+        """PROMPT_VERSION plus a short hash of the prompt text (recorded in the DSR manifest)."""
+        text = "\n".join(str(m.prompt.template) for m in self.prompt_template.messages)
+        return f"{self.PROMPT_VERSION}-{hashlib.sha256(text.encode('utf-8')).hexdigest()[:12]}"
+
     # ------------------------------------------------------------------
     def _build_prompt(self) -> ChatPromptTemplate:
         """Builds the LangChain prompt used to infer the DSR for a future_* target."""
@@ -98,14 +109,26 @@ class FeatureDSRObserver:
                 print(f"🧩 Raw model output saved to {debug_path.resolve()}")
                 return None
 
+    # ------------------------------------------------------------------
+    def _build_messages(self, feature_yaml: Dict[str, Any]):
+        yaml_str = yaml.safe_dump(feature_yaml, sort_keys=False)
+        return self.prompt_template.format_messages(feature_yaml=yaml_str)
+
     # ------------------------------------------------------------------
     def analyze(self, feature_yaml: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Analyzes a raw YAML file and generates a DSR observation."""
-        yaml_str = yaml.safe_dump(feature_yaml, sort_keys=False)
-        messages = self.prompt_template.format_messages(feature_yaml=yaml_str)
-        response = self.llm.invoke(messages)
-        raw_output = response.content.strip()
+        response = self.llm.invoke(self._build_messages(feature_yaml))
+        return self._parse_response(response.content.strip())
+
+    # ------------------------------------------------------------------
+    async def aanalyze(self, feature_yaml: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Async version of `analyze`, relying on the model's `ainvoke`."""
+        response = await self.llm.ainvoke(self._build_messages(feature_yaml))
+        return self._parse_response(response.content.strip())
 
+    # ------------------------------------------------------------------
+    def _parse_response(self, raw_output: str) -> Optional[Dict[str, Any]]:
+        """Cleans and parses the raw model output into a DSR dict."""
         # Clean up potential code fences or artifacts
         cleaned = re.sub(r"^```[a-zA-Z]*\s*", "", raw_output)
         cleaned = re.sub(r"```$", "", cleaned).strip()
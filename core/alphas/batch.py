@@ -0,0 +1,158 @@
+# ==========================================================
+#  QUANTREO — Batch alpha evaluation (shared DAG)
+# ==========================================================
+#  All formulas are compiled into ONE plan: identical sub-expressions
+#  (e.g. `sma(rs_vol_120, 50)` used by ten alphas) become a single node and
+#  are computed once per feature-store frame.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.alphas.formula import (
+    DEFAULT_WINDOW,
+    AlphaProgram,
+    FormulaError,
+    PlanBuilder,
+    compile_alpha,
+    evaluate_plan,
+    plan_lookback,
+    step_inputs,
+)
+from core.utils.io import load_yaml
+
+
+class AlphaBatch:
+    """
+    A set of compiled alphas sharing one evaluation plan.
+
+    Parameters
+    ----------
+    default_window : int
+        Window used by zscore/rank/std/... calls written without one.
+    """
+
+    def __init__(self, default_window: int = DEFAULT_WINDOW):
+        self.plan = PlanBuilder(default_window)
+        self.programs: Dict[str, AlphaProgram] = {}
+        self.roots: Dict[str, Tuple[int, Optional[int]]] = {}
+        self.errors: Dict[str, str] = {}
+        self.skipped: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    def add(self, key: str, alpha_yaml: Dict[str, Any]) -> bool:
+        """Compile one alpha into the shared plan. Returns False (and records why) if it cannot be compiled."""
+        try:
+            program = compile_alpha(alpha_yaml, default_window=self.plan.default_window)
+        except FormulaError as e:
+            self.errors[key] = str(e)
+            return False
+
+        alpha_step = self.plan.add_expression(program.formula)
+        condition_step = None
+        if program.conditioning is not None:
+            condition_step = self.plan._as_bool(self.plan.add_expression(program.conditioning))
+
+        self.programs[key] = program
+        self.roots[key] = (alpha_step, condition_step)
+        return True
+
+    @classmethod
+    def from_dir(cls, bundle_dir: Path, default_window: int = DEFAULT_WINDOW) -> "AlphaBatch":
+        """Compile every bundle (or formula) YAML of a directory, keyed by file basename."""
+        batch = cls(default_window)
+        for p in sorted(Path(bundle_dir).glob("*.yaml")):
+            batch.add(p.stem, load_yaml(p))
+        return batch
+
+    # ------------------------------------------------------------------
+    def columns(self, keys: Optional[List[str]] = None) -> List[str]:
+        """Feature columns needed by the given alphas (all by default), e.g. for a projected store read."""
+        keys = list(self.programs) if keys is None else keys
+        return sorted({c for k in keys for c in self.programs[k].columns})
+
+    def lookback(self, keys: Optional[List[str]] = None) -> int:
+        """Warm-up rows needed by chunked evaluation of the given alphas (see `plan_lookback` for the tolerance)."""
+        keys = list(self.programs) if keys is None else keys
+        outputs = [i for k in keys for i in self.roots[k] if i is not None]
+        return plan_lookback(self.plan.steps, outputs)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of plan nodes with and without sharing across alphas."""
+        return {
+            "alphas": len(self.programs),
+            "failed": len(self.errors),
+            "nodes_shared": len(self.plan.steps),
+            "nodes_separate": sum(len(p.plan.steps) for p in self.programs.values()),
+        }
+
+    def evaluate(
+        self,
+        df: pd.DataFrame,
+        keys: Optional[List[str]] = None,
+    ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Evaluate the alphas on one feature-store frame.
+
+        Alphas whose columns are missing from `df` are skipped (and reported in
+        `self.skipped` for this call); only the plan nodes the remaining alphas
+        need are computed.
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, pd.DataFrame]
+            (alphas, conditions), one column per alpha key.
+        """
+        keys = list(self.programs) if keys is None else keys
+        available = set(df.columns)
+
+        selected, outputs = [], []
+        self.skipped = {}
+        for key in keys:
+            missing = set(self.programs[key].columns) - available
+            if missing:
+                self.skipped[key] = f"Missing required columns: {sorted(missing)}"
+                continue
+            selected.append(key)
+            outputs.extend(i for i in self.roots[key] if i is not None)
+
+        arrays = dict(zip(outputs, evaluate_plan(self.plan.steps, df, outputs)))
+
+        alphas, conditions = {}, {}
+        for key in selected:
+            alpha_step, condition_step = self.roots[key]
+            alphas[key] = arrays[alpha_step].astype(np.float64, copy=False)
+            conditions[key] = (
+                np.ones(len(df), dtype=bool) if condition_step is None
+                else arrays[condition_step].astype(bool, copy=False)
+            )
+        return (
+            pd.DataFrame(alphas, index=df.index, columns=selected),
+            pd.DataFrame(conditions, index=df.index, columns=selected),
+        )
+
+    # ------------------------------------------------------------------
+    def shared_nodes(self) -> List[Tuple[str, int]]:
+        """Rolling/transform nodes used by more than one alpha, with their usage count."""
+        users: Dict[int, set] = {}
+        for key, roots in self.roots.items():
+            stack = [i for i in roots if i is not None]
+            seen = set()
+            while stack:
+                i = stack.pop()
+                if i in seen:
+                    continue
+                seen.add(i)
+                stack.extend(step_inputs(*self.plan.steps[i]))
+            for i in seen:
+                users.setdefault(i, set()).add(key)
+
+        out = [
+            (self.plan.render(i, column="{}"), len(u))
+            for i, u in users.items()
+            if len(u) > 1 and self.plan.steps[i][0] not in ("col", "const")
+        ]
+        return sorted(out, key=lambda t: -t[1])
@@ -0,0 +1,339 @@
+# ==========================================================
+#  QUANTREO — Predictive power of generated alphas (IC, decay, turnover)
+# ==========================================================
+#  Runs the refined alpha functions (outputs/alphas/code_refined/*.py) on a
+#  feature-store frame and scores them against forward returns:
+#  - the (alpha, condition) outputs of all functions are stacked into two
+#    (alphas x bars) arrays and every statistic is computed on whole blocks
+#    of rows at once (ranks, correlations), not column by column in pandas;
+#  - each alpha and each forward return is sorted once: the ranks over the
+#    valid bars of every (alpha, horizon) pair are derived from those orders
+#    by counting, without re-sorting;
+#  - rank IC = Spearman correlation over time between the alpha and the
+#    forward return, on the bars where the alpha is finite and its condition
+#    holds, for several horizons (IC decay = IC as a function of horizon);
+#  - turnover = mean absolute bar-to-bar change of the alpha rank scaled to
+#    [-1, 1], with the lag-1 rank autocorrelation.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.benchmark.harness import load_function, required_columns
+
+DEFAULT_HORIZONS = (1, 5, 10, 20, 60)
+
+# Fewer valid bars than this give a NaN statistic
+MIN_OBSERVATIONS = 30
+
+# Alphas ranked together (bounds the memory of the (alphas x bars) temporaries)
+BLOCK_ALPHAS = 8
+
+
+# ----------------------------------------------------------
+# Loading and stacking alpha outputs
+# ----------------------------------------------------------
+def load_alphas(code_dir: Path) -> Tuple[Dict[str, Callable], Dict[str, List[str]], Dict[str, str]]:
+    """
+    Load every refined alpha of a directory, keyed by file basename.
+
+    Returns
+    -------
+    (dict, dict, dict)
+        Functions, their required columns, and the error of each file that
+        could not be loaded.
+    """
+    functions: Dict[str, Callable] = {}
+    columns: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+    for path in sorted(Path(code_dir).glob("*.py")):
+        try:
+            functions[path.stem] = load_function(path)
+            columns[path.stem] = required_columns(path)
+        except Exception as e:
+            errors[path.stem] = f"{type(e).__name__}: {e}"
+    return functions, columns, errors
+
+
+def stack_alphas(
+    functions: Dict[str, Callable],
+    df: pd.DataFrame,
+) -> Tuple[List[str], np.ndarray, np.ndarray, Dict[str, str]]:
+    """
+    Run the alpha functions on one frame and stack their outputs.
+
+    Returns
+    -------
+    (list, np.ndarray, np.ndarray, dict)
+        Names of the alphas that ran, alpha values (alphas x bars, float64),
+        conditions (alphas x bars, bool; all True for alphas returning no
+        condition), and the error of each alpha that failed.
+    """
+    n = len(df)
+    names: List[str] = []
+    alphas: List[np.ndarray] = []
+    conditions: List[np.ndarray] = []
+    errors: Dict[str, str] = {}
+    for name, func in functions.items():
+        try:
+            out = func(df)
+            alpha, condition = out if isinstance(out, tuple) else (out, None)
+            alpha = np.asarray(alpha, dtype=np.float64).reshape(-1)
+            if len(alpha) != n:
+                raise ValueError(f"Alpha has {len(alpha)} rows, expected {n}.")
+            if condition is None:
+                condition = np.ones(n, dtype=bool)
+            else:
+                condition = np.asarray(pd.Series(condition).fillna(False), dtype=bool).reshape(-1)
+                if len(condition) != n:
+                    raise ValueError(f"Condition has {len(condition)} rows, expected {n}.")
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+            continue
+        names.append(name)
+        alphas.append(alpha)
+        conditions.append(condition)
+
+    if not names:
+        return names, np.empty((0, n)), np.empty((0, n), dtype=bool), errors
+    return names, np.vstack(alphas), np.vstack(conditions), errors
+
+
+# ----------------------------------------------------------
+# Vectorized statistics
+# ----------------------------------------------------------
+def forward_returns(close: np.ndarray, horizons: Iterable[int]) -> np.ndarray:
+    """Simple forward returns close[t+h] / close[t] - 1, one row per horizon (NaN past the end)."""
+    close = np.asarray(close, dtype=np.float64)
+    horizons = list(horizons)
+    out = np.full((len(horizons), len(close)), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for j, h in enumerate(horizons):
+            if 0 < h < len(close):
+                out[j, :-h] = close[h:] / close[:-h] - 1.0
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def _sorted_runs(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Sort order of each row, and for each sorted position the first and last
+    # position of its run of equal values
+    n = x.shape[1]
+    order = np.argsort(x, axis=1, kind="stable")            # NaNs sorted last
+    s = np.take_along_axis(x, order, axis=1)
+    order = order.astype(np.int32)
+    first = np.ones(s.shape, dtype=bool)
+    first[:, 1:] = s[:, 1:] != s[:, :-1]
+    last = np.ones(s.shape, dtype=bool)
+    last[:, :-1] = first[:, 1:]
+    idx = np.arange(n, dtype=np.int32)
+    start = np.maximum.accumulate(np.where(first, idx, 0), axis=1)
+    end = np.minimum.accumulate(np.where(last, idx, n)[:, ::-1], axis=1)[:, ::-1]
+    return order, start, end
+
+
+def _masked_ranks(runs: Tuple[np.ndarray, np.ndarray, np.ndarray], mask: np.ndarray) -> np.ndarray:
+    # Average ranks among the masked positions only (NaN elsewhere), from the
+    # runs of `_sorted_runs`: rank = valid values before the run + mid-rank in the run
+    order, start, end = (np.broadcast_to(a, mask.shape) for a in runs)
+    m = np.take_along_axis(mask, order, axis=1)
+    count = np.cumsum(m, axis=1, dtype=np.int32)
+    before = np.take_along_axis(count, start, axis=1) - np.take_along_axis(m, start, axis=1)
+    upto = np.take_along_axis(count, end, axis=1)
+    ranks = before + (upto - before + 1) / 2.0
+    ranks[~m] = np.nan
+    out = np.empty(ranks.shape)
+    np.put_along_axis(out, order, ranks, axis=1)
+    return out
+
+
+def rank_rows(x: np.ndarray) -> np.ndarray:
+    """
+    Average ranks (1-based) along each row of a 2-D array; NaNs are left out
+    of the ranking and stay NaN. Ties share the mean of their ranks.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    return _masked_ranks(_sorted_runs(x), ~np.isnan(x))
+
+
+def _row_corr(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Pearson correlation per row of two arrays, on the positions finite in both
+    valid = ~(np.isnan(a) | np.isnan(b))
+    count = valid.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        da = np.where(valid, a, 0.0)
+        db = np.where(valid, b, 0.0)
+        da = np.where(valid, da - (da.sum(axis=1) / count)[:, None], 0.0)
+        db = np.where(valid, db - (db.sum(axis=1) / count)[:, None], 0.0)
+        corr = np.einsum("ij,ij->i", da, db) / np.sqrt(np.einsum("ij,ij->i", da, da) * np.einsum("ij,ij->i", db, db))
+    corr[count < MIN_OBSERVATIONS] = np.nan
+    return corr, count
+
+
+def _rank_corr(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Pearson correlation per row of two rank arrays with the same NaN pattern:
+    # average ranks of m values always have the mean (m + 1) / 2
+    valid = ~np.isnan(a)
+    count = valid.sum(axis=1)
+    mid = ((count + 1) / 2.0)[:, None]
+    da = np.nan_to_num(a - mid)
+    db = np.nan_to_num(b - mid)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = np.einsum("ij,ij->i", da, db) / np.sqrt(np.einsum("ij,ij->i", da, da) * np.einsum("ij,ij->i", db, db))
+    corr[count < MIN_OBSERVATIONS] = np.nan
+    return corr, count
+
+
+def _drop_ranks(ranks: np.ndarray, values: np.ndarray, removed: np.ndarray) -> np.ndarray:
+    # Ranks after removing a few positions from each row: every removed value
+    # below x lowers the rank of x by 1, every removed tie by 1/2
+    out = ranks.copy()
+    for i in range(len(ranks)):
+        gone = np.sort(values[i, removed[i]])
+        if len(gone):
+            left = np.searchsorted(gone, values[i], side="left")
+            right = np.searchsorted(gone, values[i], side="right")
+            out[i] -= left + (right - left) / 2.0
+    return out
+
+
+def rank_ic(
+    alphas: np.ndarray,
+    conditions: np.ndarray,
+    fwd: np.ndarray,
+    block: int = BLOCK_ALPHAS,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank IC of each alpha (rows of `alphas`) at each horizon (rows of `fwd`).
+
+    Each (alpha, horizon) pair is ranked on its own valid bars: alpha finite,
+    condition True and forward return known. Each alpha and each forward
+    return is sorted once:
+    - the alpha ranks of a horizon are its ranks over the usable bars, minus
+      the few bars without a forward return (the last h bars, missing prices);
+    - the forward-return ranks are counted along the sorted forward returns,
+      over the usable bars of each alpha, and correlated in that order.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        IC and number of bars used, both (alphas x horizons).
+    """
+    k, n_h = alphas.shape[0], fwd.shape[0]
+    ic = np.full((k, n_h), np.nan)
+    count = np.zeros((k, n_h), dtype=np.int64)
+    known = ~np.isnan(fwd)
+    fwd_runs = [tuple(r[0] for r in _sorted_runs(fwd[j:j + 1])) for j in range(n_h)]
+    for lo in range(0, k, block):
+        a = alphas[lo:lo + block]
+        usable = np.isfinite(a) & conditions[lo:lo + block]
+        base = rank_rows(np.where(usable, a, np.nan))
+        for j in range(n_h):
+            valid = usable & known[j]
+            order, start, end = fwd_runs[j]
+            m = valid[:, order]
+            seen = np.cumsum(m, axis=1, dtype=np.int32)
+            before = seen[:, start] - m[:, start]
+            fwd_ranks = before + (seen[:, end] - before + 1) / 2.0
+            fwd_ranks[~m] = np.nan
+            alpha_ranks = _drop_ranks(base, a, usable & ~known[j])[:, order]
+            alpha_ranks[~m] = np.nan
+            ic[lo:lo + block, j], count[lo:lo + block, j] = _rank_corr(alpha_ranks, fwd_ranks)
+    return ic, count
+
+
+def signal_turnover(alphas: np.ndarray, block: int = BLOCK_ALPHAS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turnover and lag-1 rank autocorrelation of each alpha.
+
+    The alpha is mapped to its rank scaled to [-1, 1]; turnover is the mean
+    absolute change of that score between consecutive bars (0: static
+    signal, ~0.67: independent draws).
+    """
+    k = alphas.shape[0]
+    turnover = np.full(k, np.nan)
+    autocorr = np.full(k, np.nan)
+    for lo in range(0, k, block):
+        a = alphas[lo:lo + block]
+        ranks = rank_rows(np.where(np.isfinite(a), a, np.nan))
+        valid = (~np.isnan(ranks)).sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            score = 2.0 * (ranks - 1.0) / (valid - 1.0)[:, None] - 1.0
+            step = np.abs(np.diff(score, axis=1))
+            moves = np.nansum(step, axis=1) / (~np.isnan(step)).sum(axis=1)
+        corr, pairs = _row_corr(ranks[:, 1:], ranks[:, :-1])
+        turnover[lo:lo + block] = np.where(pairs < MIN_OBSERVATIONS, np.nan, moves)
+        autocorr[lo:lo + block] = corr
+    return turnover, autocorr
+
+
+def ic_half_life(ic: np.ndarray, horizons: Iterable[int]) -> np.ndarray:
+    """First horizon where |IC| falls below half of |IC| at the shortest horizon (NaN if it never does)."""
+    horizons = np.asarray(list(horizons), dtype=np.float64)
+    base = np.abs(ic[:, :1])
+    below = np.abs(ic) < base / 2.0
+    below[np.isnan(ic)] = False
+    first = np.argmax(below, axis=1)
+    return np.where(below.any(axis=1) & np.isfinite(base[:, 0]), horizons[first], np.nan)
+
+
+def evaluate_alphas(
+    names: List[str],
+    alphas: np.ndarray,
+    conditions: np.ndarray,
+    close: np.ndarray,
+    horizons: Iterable[int] = DEFAULT_HORIZONS,
+) -> pd.DataFrame:
+    """
+    Score stacked alphas against the forward returns of `close`.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per alpha: coverage (share of bars with a finite alpha and a
+        true condition), turnover, autocorr, ic_<h> and n_<h> per horizon,
+        ic_half_life.
+    """
+    horizons = [int(h) for h in horizons]
+    fwd = forward_returns(close, horizons)
+    ic, count = rank_ic(alphas, conditions, fwd)
+    turnover, autocorr = signal_turnover(alphas)
+
+    out = pd.DataFrame(index=pd.Index(names, name="alpha"))
+    n = max(len(close), 1)
+    out["coverage"] = (np.isfinite(alphas) & conditions).sum(axis=1) / n
+    out["turnover"] = turnover
+    out["autocorr"] = autocorr
+    for j, h in enumerate(horizons):
+        out[f"ic_{h}"] = ic[:, j]
+    for j, h in enumerate(horizons):
+        out[f"n_{h}"] = count[:, j]
+    out["ic_half_life"] = ic_half_life(ic, horizons)
+    return out
+
+
+def evaluate_frame(
+    functions: Dict[str, Callable],
+    df: pd.DataFrame,
+    price_col: str = "close",
+    horizons: Iterable[int] = DEFAULT_HORIZONS,
+) -> Tuple[pd.DataFrame, Dict[str, str]]:
+    """Run and score the alpha functions on one asset frame. Returns (scores, errors)."""
+    if price_col not in df.columns:
+        raise KeyError(f"Price column '{price_col}' not in the frame.")
+    names, alphas, conditions, errors = stack_alphas(functions, df)
+    close = df[price_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    return evaluate_alphas(names, alphas, conditions, close, horizons), errors
+
+
+def evaluation_record(scores: Dict[str, pd.DataFrame], alpha: str) -> Dict[str, Any]:
+    """Per-asset statistics of one alpha, as plain floats (for the JSON sidecar of its bundle)."""
+    out: Dict[str, Any] = {}
+    for asset, frame in scores.items():
+        if alpha in frame.index:
+            row = frame.loc[[alpha]].to_dict("records")[0]
+            out[asset] = {k: (None if pd.isna(v) else v.item() if hasattr(v, "item") else v) for k, v in row.items()}
+    return out
@@ -0,0 +1,494 @@
+# ==========================================================
+#  QUANTREO — Alpha formula compiler (no LLM, no eval)
+# ==========================================================
+#  Parses `alpha_formula.formula` / `alpha_formula.conditioning` (the closed
+#  vocabulary enforced by AlphaFormulatorAgent) into a deduplicated
+#  evaluation plan, evaluated with the causal kernels of core.alphas.transforms.
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+import ast
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.alphas import transforms
+
+
+class FormulaError(ValueError):
+    """Raised when a formula uses syntax or names outside the alpha vocabulary."""
+
+
+# name -> (kernel, needs_window). Windowed functions accept an optional
+# integer literal window; when omitted the program's default window is used.
+FUNCTIONS = {
+    "ema": (transforms.ema, True),
+    "sma": (transforms.sma, True),
+    "std": (transforms.std, True),
+    "zscore": (transforms.zscore, True),
+    "rank": (transforms.rank, True),
+    "lag": (transforms.lag, True),
+    "abs": (np.abs, False),
+    "clip": (transforms.clip, False),
+}
+
+DEFAULT_WINDOW = 50
+
+_BINOPS = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div", ast.Pow: "pow"}
+_CMPOPS = {ast.Lt: "lt", ast.LtE: "le", ast.Gt: "gt", ast.GtE: "ge", ast.Eq: "eq", ast.NotEq: "ne"}
+_BOOL_OPS = {"lt", "le", "gt", "ge", "eq", "ne", "and", "or", "not"}
+
+_SYMBOLS = {
+    "add": "+", "sub": "-", "mul": "*", "div": "/", "pow": "**",
+    "lt": "<", "le": "<=", "gt": ">", "ge": ">=", "eq": "==", "ne": "!=",
+    "and": "&", "or": "|",
+}
+
+
+def _strip_future(expr: str) -> str:
+    return re.sub(r"\bfuture_", "", expr)
+
+
+# ----------------------------------------------------------
+# Plan builder (hash-consing => common sub-expressions are shared)
+# ----------------------------------------------------------
+class PlanBuilder:
+    """
+    Turns formula strings into a list of steps `(op, args)`.
+
+    A step argument is either the index of an earlier step or a Python
+    constant. Identical sub-expressions map to the same step, so a term used
+    twice (or by several formulas compiled with the same builder) is computed once.
+    """
+
+    def __init__(self, default_window: int = DEFAULT_WINDOW):
+        self.default_window = default_window
+        self.steps: List[Tuple[str, tuple]] = []
+        self._index: Dict[Tuple[str, tuple], int] = {}
+
+    # ------------------------------------------------------------------
+    def _add(self, op: str, args: tuple) -> int:
+        key = (op, args)
+        if key not in self._index:
+            self._index[key] = len(self.steps)
+            self.steps.append(key)
+        return self._index[key]
+
+    def is_bool(self, idx: int) -> bool:
+        return self.steps[idx][0] in _BOOL_OPS
+
+    def _as_bool(self, idx: int) -> int:
+        return idx if self.is_bool(idx) else self._add("ne", (idx, self._const(0.0)))
+
+    def _const(self, value: float) -> int:
+        return self._add("const", (float(value),))
+
+    # ------------------------------------------------------------------
+    def add_expression(self, expr: Any) -> int:
+        """Parse one expression and return the index of its root step."""
+        text = _strip_future(str(expr)).strip()
+        if not text:
+            raise FormulaError("Empty expression.")
+        try:
+            tree = ast.parse(text, mode="eval")
+        except SyntaxError as e:
+            raise FormulaError(f"Invalid syntax in {text!r}: {e.msg}") from e
+        return self._visit(tree.body, text)
+
+    def _int_literal(self, node: ast.AST, text: str, func: str) -> int:
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+            raise FormulaError(f"{func}() window must be positive in {text!r}.")
+        if not isinstance(node, ast.Constant) or isinstance(node.value, bool) \
+                or not isinstance(node.value, (int, float)) or int(node.value) != node.value:
+            raise FormulaError(f"{func}() window must be an integer literal in {text!r}.")
+        return int(node.value)
+
+    def _number(self, node: ast.AST, text: str, func: str) -> float:
+        sign = 1.0
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            sign = -1.0 if isinstance(node.op, ast.USub) else 1.0
+            node = node.operand
+        if not isinstance(node, ast.Constant) or not isinstance(node.value, (int, float)):
+            raise FormulaError(f"{func}() bounds must be numeric literals in {text!r}.")
+        return sign * float(node.value)
+
+    def _visit(self, node: ast.AST, text: str) -> int:
+        if isinstance(node, ast.Name):
+            if node.id in FUNCTIONS:
+                raise FormulaError(f"Function '{node.id}' used without arguments in {text!r}.")
+            return self._add("col", (node.id,))
+
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+                raise FormulaError(f"Unsupported constant {node.value!r} in {text!r}.")
+            return self._const(node.value)
+
+        if isinstance(node, ast.UnaryOp):
+            operand = self._visit(node.operand, text)
+            if isinstance(node.op, ast.USub):
+                step = self.steps[operand]
+                if step[0] == "const":
+                    return self._const(-step[1][0])
+                return self._add("neg", (operand,))
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if isinstance(node.op, (ast.Not, ast.Invert)):
+                return self._add("not", (self._as_bool(operand),))
+
+        if isinstance(node, ast.BinOp):
+            if isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+                op = "and" if isinstance(node.op, ast.BitAnd) else "or"
+                left, right = self._visit(node.left, text), self._visit(node.right, text)
+                return self._add(op, (self._as_bool(left), self._as_bool(right)))
+            if type(node.op) in _BINOPS:
+                left, right = self._visit(node.left, text), self._visit(node.right, text)
+                return self._add(_BINOPS[type(node.op)], (left, right))
+
+        if isinstance(node, ast.BoolOp):
+            op = "and" if isinstance(node.op, ast.And) else "or"
+            values = [self._as_bool(self._visit(v, text)) for v in node.values]
+            out = values[0]
+            for v in values[1:]:
+                out = self._add(op, (out, v))
+            return out
+
+        if isinstance(node, ast.Compare):
+            # a < b < c  ==>  (a < b) & (b < c)
+            operands = [self._visit(node.left, text)] + [self._visit(c, text) for c in node.comparators]
+            out = None
+            for i, cmp in enumerate(node.ops):
+                if type(cmp) not in _CMPOPS:
+                    raise FormulaError(f"Unsupported comparison in {text!r}.")
+                step = self._add(_CMPOPS[type(cmp)], (operands[i], operands[i + 1]))
+                out = step if out is None else self._add("and", (out, step))
+            return out
+
+        if isinstance(node, ast.Call):
+            return self._visit_call(node, text)
+
+        raise FormulaError(f"Unsupported syntax '{type(node).__name__}' in {text!r}.")
+
+    def _visit_call(self, node: ast.Call, text: str) -> int:
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            name = getattr(node.func, "id", ast.unparse(node.func))
+            raise FormulaError(f"Unknown function '{name}' in {text!r}. Allowed: {sorted(FUNCTIONS)}.")
+        if node.keywords:
+            raise FormulaError(f"Keyword arguments are not supported in {text!r}.")
+
+        func, args = node.func.id, node.args
+        if func == "abs":
+            if len(args) != 1:
+                raise FormulaError(f"abs() takes exactly one argument in {text!r}.")
+            return self._add("abs", (self._visit(args[0], text),))
+
+        if func == "clip":
+            if len(args) != 3:
+                raise FormulaError(f"clip() takes (x, lo, hi) in {text!r}.")
+            x = self._visit(args[0], text)
+            return self._add("clip", (x, self._number(args[1], text, func), self._number(args[2], text, func)))
+
+        if len(args) not in (1, 2):
+            raise FormulaError(f"{func}() takes (x) or (x, n) in {text!r}.")
+        x = self._visit(args[0], text)
+        if len(args) == 2:
+            n = self._int_literal(args[1], text, func)
+        else:
+            n = 1 if func == "lag" else self.default_window
+        if n < (0 if func == "lag" else 1):
+            raise FormulaError(f"{func}() window must be positive in {text!r}.")
+        return self._add(func, (x, n))
+
+    # ------------------------------------------------------------------
+    def columns(self) -> List[str]:
+        return sorted({args[0] for op, args in self.steps if op == "col"})
+
+    def render(self, idx: int, column: str = "df[{!r}]") -> str:
+        """Render a step back to a pandas expression (used for code generation)."""
+        op, args = self.steps[idx]
+        if op == "col":
+            return column.format(args[0])
+        if op == "const":
+            return repr(args[0])
+        if op == "neg":
+            return f"-({self.render(args[0], column)})"
+        if op == "not":
+            return f"~({self.render(args[0], column)})"
+        if op == "abs":
+            return f"abs({self.render(args[0], column)})"
+        if op == "clip":
+            return f"clip({self.render(args[0], column)}, {args[1]!r}, {args[2]!r})"
+        if op in FUNCTIONS:
+            return f"{op}({self.render(args[0], column)}, {args[1]})"
+        return f"({self.render(args[0], column)} {_SYMBOLS[op]} {self.render(args[1], column)})"
+
+
+# ----------------------------------------------------------
+# Plan evaluation
+# ----------------------------------------------------------
+def _evaluate_step(op: str, args: tuple, values: List[Any]) -> Any:
+    if op == "const":
+        return args[0]
+    if op == "abs":
+        return np.abs(values[args[0]])
+    if op == "neg":
+        return -values[args[0]]
+    if op == "not":
+        return ~values[args[0]]
+    if op == "clip":
+        return transforms.clip(values[args[0]], args[1], args[2])
+    if op in FUNCTIONS:
+        return FUNCTIONS[op][0](values[args[0]], args[1])
+
+    a, b = values[args[0]], values[args[1]]
+    if op == "add":
+        return a + b
+    if op == "sub":
+        return a - b
+    if op == "mul":
+        return a * b
+    if op == "div":
+        return a / b
+    if op == "pow":
+        return a ** b
+    if op == "lt":
+        return a < b
+    if op == "le":
+        return a <= b
+    if op == "gt":
+        return a > b
+    if op == "ge":
+        return a >= b
+    if op == "eq":
+        return a == b
+    if op == "ne":
+        return a != b
+    if op == "and":
+        return a & b
+    if op == "or":
+        return a | b
+    raise FormulaError(f"Unknown plan op '{op}'.")
+
+
+def step_inputs(op: str, args: tuple) -> tuple:
+    """Indices of the steps a step reads from (literals excluded)."""
+    if op in ("col", "const"):
+        return ()
+    if op in FUNCTIONS or op == "clip":
+        return args[:1]
+    return args
+
+
+def plan_lookback(steps: List[Tuple[str, tuple]], outputs: List[int], ema_spans: int = 20) -> int:
+    """
+    Warm-up rows after which the outputs no longer depend on earlier bars:
+    windows add up along nested calls; an EMA is counted as `ema_spans`
+    spans (the weight of the bars beyond, (1 - 2/(n+1))**(20n) < 5e-18, is
+    below float64 resolution).
+    Used to evaluate a plan chunk by chunk with overlapping warm-up rows.
+    Chunked results are not bitwise identical to a full-frame evaluation:
+    the running sums of the rolling windows start from a different bar, so
+    values differ by floating-point rounding, amplified where a zscore
+    divides by a small rolling std (up to ~1e-8 on zscore(ema(x, 20), 50)),
+    which can flip a comparison or rank tie exactly at a boundary.
+    """
+    history: Dict[int, int] = {}
+    for i in sorted(_reachable(steps, outputs)):
+        op, args = steps[i]
+        inner = max((history[a] for a in step_inputs(op, args)), default=0)
+        if op == "ema":
+            inner += ema_spans * args[1]
+        elif op == "lag":
+            inner += args[1]
+        elif op in FUNCTIONS and FUNCTIONS[op][1]:
+            inner += args[1] - 1
+        history[i] = inner
+    return max((history[i] for i in outputs), default=0)
+
+
+def _reachable(steps: List[Tuple[str, tuple]], outputs: List[int]) -> set:
+    needed = set(outputs)
+    for i in range(len(steps) - 1, -1, -1):
+        if i in needed:
+            needed.update(step_inputs(*steps[i]))
+    return needed
+
+
+def structural_keys(steps: List[Tuple[str, tuple]], outputs: List[int]) -> Dict[int, tuple]:
+    """Plan-independent key (the expression tree it computes) of the outputs and the steps they read."""
+    keys: Dict[int, tuple] = {}
+    for i in sorted(_reachable(steps, outputs)):
+        op, args = steps[i]
+        n_inputs = len(step_inputs(op, args))
+        keys[i] = (op,) + tuple(keys[a] for a in args[:n_inputs]) + args[n_inputs:]
+    return keys
+
+
+def evaluate_plan(
+    steps: List[Tuple[str, tuple]],
+    df: pd.DataFrame,
+    outputs: List[int],
+    cache: Optional[Dict[tuple, np.ndarray]] = None,
+) -> List[np.ndarray]:
+    """
+    Evaluate a plan on the columns of `df` and return the arrays of `outputs`.
+
+    Only the steps the outputs depend on are computed, and intermediate arrays
+    are released as soon as no later step needs them. `cache` (one dict per
+    frame) keeps the windowed transforms by structural key, so other plans
+    evaluated on the same frame reuse them instead of recomputing.
+    """
+    needed = _reachable(steps, outputs)
+    keys = structural_keys(steps, outputs) if cache is not None else {}
+
+    last_use: Dict[int, int] = {}
+    for i in sorted(needed):
+        for a in step_inputs(*steps[i]):
+            last_use[a] = i
+    keep = set(outputs)
+
+    n = len(df)
+    values: List[Any] = [None] * len(steps)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for i in sorted(needed):
+            op, args = steps[i]
+            if op == "col":
+                values[i] = df[args[0]].to_numpy(dtype=np.float64, na_value=np.nan)
+            elif cache is not None and op in FUNCTIONS and FUNCTIONS[op][1]:
+                if keys[i] not in cache:
+                    cache[keys[i]] = _evaluate_step(op, args, values)
+                values[i] = cache[keys[i]]
+            else:
+                values[i] = _evaluate_step(op, args, values)
+            for a in step_inputs(op, args):
+                if last_use.get(a) == i and a not in keep:
+                    values[a] = None
+
+    out = []
+    for idx in outputs:
+        v = values[idx]
+        out.append(np.broadcast_to(np.asarray(v), (n,)).copy() if np.ndim(v) == 0 else v)
+    return out
+
+
+# ----------------------------------------------------------
+# Compiled alpha
+# ----------------------------------------------------------
+class AlphaProgram:
+    """
+    Compiled form of one alpha_formula block.
+
+    Calling the program on a feature-store DataFrame returns the same
+    `(alpha, condition)` tuple as the generated `code_refined/*.py` functions.
+    """
+
+    def __init__(self, name: str, formula: str, conditioning: Optional[str], default_window: int = DEFAULT_WINDOW):
+        self.name = name
+        self.formula = _strip_future(str(formula))
+        self.conditioning = _strip_future(str(conditioning)) if conditioning not in (None, "", "null") else None
+
+        self.plan = PlanBuilder(default_window)
+        self.alpha_step = self.plan.add_expression(self.formula)
+        self.condition_step = (
+            self.plan._as_bool(self.plan.add_expression(self.conditioning))
+            if self.conditioning is not None else None
+        )
+        self.columns = self.plan.columns()
+
+    # ------------------------------------------------------------------
+    def check_columns(self, df: pd.DataFrame) -> None:
+        missing = set(self.columns) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+    def evaluate(self, df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        self.check_columns(df)
+        outputs = [self.alpha_step] + ([self.condition_step] if self.condition_step is not None else [])
+        arrays = evaluate_plan(self.plan.steps, df, outputs)
+
+        alpha = pd.Series(arrays[0].astype(np.float64), index=df.index, name=self.name)
+        if self.condition_step is None:
+            condition = pd.Series(True, index=df.index)
+        else:
+            condition = pd.Series(arrays[1].astype(bool), index=df.index)
+        return alpha, condition
+
+    __call__ = evaluate
+
+    # ------------------------------------------------------------------
+    def _render_root(self, idx: int) -> str:
+        op, args = self.plan.steps[idx]
+        if op == "const":
+            return f"pd.Series({args[0]!r}, index=df.index)"
+        expr = self.plan.render(idx)
+        return f"({expr})" if op in ("neg", "not") else expr
+
+    def to_source(self, func_name: Optional[str] = None) -> str:
+        """Emit a standalone Python function following the alpha code conventions."""
+        func_name = func_name or re.sub(r"[^a-zA-Z0-9_]+", "_", self.name).strip("_").lower() or "alpha"
+        if func_name[0].isdigit():
+            func_name = f"alpha_{func_name}"
+
+        used = sorted({op for op, _ in self.plan.steps if op in FUNCTIONS and op != "abs"})
+        alpha_expr = self._render_root(self.alpha_step)
+        if self.condition_step is None:
+            cond_expr = "pd.Series(True, index=df.index)"
+        else:
+            cond_expr = self._render_root(self.condition_step)
+
+        lines = ["import pandas as pd", "from typing import Tuple"]
+        if used:
+            lines.append(f"from core.alphas.transforms import {', '.join(used)}")
+        lines += [
+            "",
+            "",
+            f"def {func_name}(df: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:",
+            '    """',
+            f"    {self.name}.",
+            "",
+            "    Uses precomputed feature columns from df (feature store) and does not",
+            "    recompute them. Generated deterministically from the alpha formula.",
+            "",
+            "    Parameters",
+            "    ----------",
+            "    df : pd.DataFrame",
+            f"        Feature store containing: {', '.join(self.columns)}.",
+            "",
+            "    Returns",
+            "    -------",
+            "    Tuple[pd.Series, pd.Series]",
+            "        (alpha, condition).",
+            "",
+            "    Notes",
+            "    -----",
+            f"    formula:      {self.formula}",
+            f"    conditioning: {self.conditioning}",
+            '    """',
+            "    required = {" + ", ".join(map(repr, self.columns)) + "}" if self.columns else "    required = set()",
+            "    missing = required - set(df.columns)",
+            "    if missing:",
+            '        raise ValueError(f"Missing required columns: {sorted(missing)}")',
+            "",
+            f"    alpha = {alpha_expr}.astype(float)",
+            f"    condition = {cond_expr}" if self.condition_step is None
+            else f"    condition = pd.Series({cond_expr}, index=df.index).astype(bool)",
+            "    return alpha, condition",
+            "",
+        ]
+        return "\n".join(lines)
+
+
+def compile_alpha(alpha_yaml: Dict[str, Any], default_window: int = DEFAULT_WINDOW) -> AlphaProgram:
+    """
+    Compile an alpha YAML (formula file or bundle) into an `AlphaProgram`.
+
+    Raises
+    ------
+    FormulaError
+        If the formula is missing or uses anything outside the vocabulary.
+    """
+    af = (alpha_yaml or {}).get("alpha_formula") or {}
+    if not af.get("formula"):
+        raise FormulaError("Missing 'alpha_formula.formula'.")
+    name = af.get("name") or (alpha_yaml.get("meta") or {}).get("concept_name") or "alpha"
+    return AlphaProgram(name, af["formula"], af.get("conditioning"), default_window=default_window)
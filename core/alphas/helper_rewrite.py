@@ -0,0 +1,255 @@
+# ==========================================================
+#  QUANTREO — Replace per-file alpha helpers by core.alphas.transforms
+# ==========================================================
+#  Generated alpha code tends to redefine its helpers (ema, sma, zscore, rank, ...).
+#  A helper is swapped for the shared kernel ONLY when its body is one of the
+#  known equivalent implementations; anything else (different ties, epsilon
+#  clipping, full-sample rank, ...) is left untouched.
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Set, Tuple
+import ast
+
+TRANSFORMS_MODULE = "core.alphas.transforms"
+
+# helper name -> normalized bodies equivalent to core.alphas.transforms.<name>.
+# Function arguments are renamed _0, _1, ... and lambda arguments _l0, _l1, ...
+EQUIVALENT_BODIES: Dict[str, Set[str]] = {
+    "sma": {
+        "return _0.rolling(window=_1).mean()",
+        "return _0.rolling(_1).mean()",
+    },
+    "ema": {
+        "return _0.ewm(span=_1, adjust=False).mean()",
+    },
+    "std": {
+        "return _0.rolling(window=_1).std()",
+        "return _0.rolling(_1).std()",
+    },
+    "zscore": {
+        "return (_0 - _0.rolling(window=_1).mean()) / _0.rolling(window=_1).std()",
+        "return (_0 - _0.rolling(_1).mean()) / _0.rolling(_1).std()",
+        "return (_0 - sma(_0, _1)) / _0.rolling(window=_1).std()",
+        "return (_0 - sma(_0, _1)) / std(_0, _1)",
+        "mean = _0.rolling(window=_1).mean(); std = _0.rolling(window=_1).std(); return (_0 - mean) / std",
+    },
+    "rank": {
+        "return _0.rolling(window=_1).apply(lambda _l0: pd.Series(_l0).rank().iloc[-1])",
+        "return _0.rolling(_1).apply(lambda _l0: pd.Series(_l0).rank().iloc[-1])",
+        "return _0.rolling(window=_1).apply(lambda _l0: pd.Series(_l0).rank().iloc[-1], raw=True)",
+        "return _0.rolling(window=_1).apply(lambda _l0: pd.Series(_l0).rank().iloc[-1], raw=False)",
+        "return _0.rolling(window=_1).apply(lambda _l0: _l0.rank().iloc[-1])",
+        "return _0.rolling(window=_1).apply(lambda _l0: _l0.rank().iloc[-1], raw=False)",
+        "return _0.rolling(window=_1).rank()",
+        "return _0.rolling(_1).rank()",
+    },
+    "lag": {
+        "return _0.shift(_1)",
+    },
+    "clip": {
+        "return _0.clip(_1, _2)",
+        "return _0.clip(lower=_1, upper=_2)",
+    },
+}
+
+# Number of positional parameters of each shared transform
+ARITY = {"clip": 3}
+
+# Inline `<x>.rolling(<n>).apply(<lambda>)` calls rewritten as `<helper>(<x>, <n>)`
+INLINE_APPLY_LAMBDAS: Dict[str, Set[str]] = {
+    "rank": {
+        "lambda _l0: pd.Series(_l0).rank().iloc[-1]",
+        "lambda _l0: _l0.rank().iloc[-1]",
+    },
+}
+
+
+class _Normalizer(ast.NodeTransformer):
+    def __init__(self, args: List[str]):
+        self.names = {a: f"_{i}" for i, a in enumerate(args)}
+        self.n_lambdas = 0
+
+    def visit_Lambda(self, node: ast.Lambda) -> ast.AST:
+        outer = dict(self.names)
+        for a in node.args.args:
+            self.names[a.arg] = f"_l{self.n_lambdas}"
+            a.arg = self.names[a.arg]
+            self.n_lambdas += 1
+        self.generic_visit(node)
+        self.names = outer
+        return node
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        node.id = self.names.get(node.id, node.id)
+        return node
+
+
+def _normalized_body(func: ast.FunctionDef) -> str:
+    body = [
+        b for b in func.body
+        if not (isinstance(b, ast.Expr) and isinstance(b.value, ast.Constant) and isinstance(b.value.value, str))
+    ]
+    module = ast.Module(body=body, type_ignores=[])
+    module = _Normalizer([a.arg for a in func.args.args]).visit(module)
+    return "; ".join(ast.unparse(b) for b in module.body)
+
+
+def _is_equivalent(func: ast.FunctionDef) -> bool:
+    bodies = EQUIVALENT_BODIES.get(func.name)
+    if not bodies or len(func.args.args) != ARITY.get(func.name, 2) or func.decorator_list:
+        return False
+    # Defaults (zscore(x, n=20) called as zscore(x)), keyword-only or variadic
+    # parameters change the call sites the shared kernel would have to accept
+    a = func.args
+    if a.defaults or a.posonlyargs or a.kwonlyargs or a.vararg or a.kwarg:
+        return False
+    return _normalized_body(func) in bodies
+
+
+def _called_helpers(func: ast.FunctionDef) -> Set[str]:
+    return {
+        n.func.id for n in ast.walk(func)
+        if isinstance(n, ast.Call) and isinstance(n.func, ast.Name) and n.func.id in EQUIVALENT_BODIES
+    } - {func.name}
+
+
+def _inline_apply(node: ast.AST) -> Optional[Tuple[str, ast.AST, ast.AST]]:
+    """Match `x.rolling(n).apply(lambda ...)` (or window=n) and return (helper, x, n)."""
+    if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "apply"):
+        return None
+    if len(node.args) != 1 or not isinstance(node.args[0], ast.Lambda):
+        return None
+    if any(k.arg != "raw" or not isinstance(k.value, ast.Constant) or k.value.value is not False for k in node.keywords):
+        return None
+    roll = node.func.value
+    if not (isinstance(roll, ast.Call) and isinstance(roll.func, ast.Attribute) and roll.func.attr == "rolling"):
+        return None
+    if roll.args and len(roll.args) == 1 and not roll.keywords:
+        window = roll.args[0]
+    elif not roll.args and len(roll.keywords) == 1 and roll.keywords[0].arg == "window":
+        window = roll.keywords[0].value
+    else:
+        return None
+
+    lam = _Normalizer([]).visit(ast.parse(ast.unparse(node.args[0]), mode="eval")).body
+    for helper, lambdas in INLINE_APPLY_LAMBDAS.items():
+        if ast.unparse(lam) in lambdas:
+            return helper, roll.func.value, window
+    return None
+
+
+def _offset(lines: List[str], lineno: int, col_offset: int) -> int:
+    """Character offset in the source of an ast (lineno, utf-8 byte col_offset) position."""
+    head = lines[lineno - 1].encode("utf-8")[:col_offset].decode("utf-8")
+    return sum(len(line) for line in lines[:lineno - 1]) + len(head)
+
+
+def use_shared_transforms(code: str) -> Tuple[str, List[str]]:
+    """
+    Remove helper definitions equivalent to a shared transform and import the
+    shared kernel instead.
+
+    Returns
+    -------
+    Tuple[str, List[str]]
+        (new source, sorted names now imported from core.alphas.transforms).
+        Code that does not parse is returned unchanged.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return code, []
+
+    # Every definition of a name must be replaceable, otherwise keep them all
+    defs: Dict[str, List[ast.FunctionDef]] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name in EQUIVALENT_BODIES:
+            defs.setdefault(node.name, []).append(node)
+    candidates = {name for name, nodes in defs.items() if all(_is_equivalent(n) for n in nodes)}
+    # A helper calling other helpers (zscore -> sma, std) is only equivalent if those are replaced too
+    changed = True
+    while changed:
+        changed = False
+        for name in sorted(candidates):
+            if any(dep in defs and dep not in candidates for n in defs[name] for dep in _called_helpers(n)):
+                candidates.discard(name)
+                changed = True
+    replace = sorted(candidates)
+
+    # Inline Rolling.apply calls (outside the helper definitions themselves),
+    # unless the name is bound to a different local helper
+    helper_lines = {i for nodes in defs.values() for n in nodes for i in range(n.lineno, n.end_lineno + 1)}
+    inline = []
+    for node in ast.walk(tree):
+        match = _inline_apply(node)
+        if match and node.lineno not in helper_lines and (match[0] not in defs or match[0] in replace):
+            inline.append((node, match))
+
+    used = sorted(set(replace) | {m[0] for _, m in inline})
+    if not used:
+        return code, []
+
+    lines = code.splitlines(keepends=True)
+    if inline:
+        # outermost matches only, applied right to left
+        spans = []
+        for node, (helper, x, n) in inline:
+            a = _offset(lines, node.lineno, node.col_offset)
+            b = _offset(lines, node.end_lineno, node.end_col_offset)
+            text = f"{helper}({ast.get_source_segment(code, x)}, {ast.get_source_segment(code, n)})"
+            spans.append((a, b, text))
+        spans = [s for s in spans if not any(o[0] <= s[0] and s[1] <= o[1] and o != s for o in spans)]
+        for a, b, text in sorted(spans, reverse=True):
+            code = code[:a] + text + code[b:]
+        tree = ast.parse(code)
+        lines = code.splitlines(keepends=True)
+        defs = {
+            name: [n for n in ast.walk(tree) if isinstance(n, ast.FunctionDef) and n.name == name]
+            for name in replace
+        }
+
+    drop = set()
+    for name in replace:
+        for node in defs[name]:
+            start, end = node.lineno - 1, node.end_lineno
+            # take one surrounding blank line with the definition
+            if end < len(lines) and not lines[end].strip() and (start == 0 or not lines[start - 1].strip()):
+                end += 1
+            drop.update(range(start, end))
+
+    # Merge into an existing `from core.alphas.transforms import ...` (simple names only)
+    # or add the import after the last top-level import
+    imported, existing, last_import = set(), None, 0
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            last_import = node.end_lineno
+            if isinstance(node, ast.ImportFrom) and node.module == TRANSFORMS_MODULE:
+                imported.update(a.asname or a.name for a in node.names)
+                if existing is None and all(a.asname is None for a in node.names):
+                    existing = node
+    new_names = [n for n in used if n not in imported]
+
+    insert_at, line_text = last_import, None
+    if new_names:
+        if existing is not None:
+            names = sorted({a.name for a in existing.names} | set(new_names))
+            drop.update(range(existing.lineno - 1, existing.end_lineno))
+            insert_at = existing.lineno - 1
+        else:
+            names = new_names
+        line_text = f"from {TRANSFORMS_MODULE} import {', '.join(names)}\n"
+
+    out = []
+    for i, line in enumerate(lines):
+        if i == insert_at and line_text:
+            out.append(line_text)
+        if i not in drop:
+            out.append(line)
+    if insert_at >= len(lines) and line_text:
+        out.append(line_text)
+
+    # Collapse the blank lines left by removed definitions
+    new_code = "".join(out)
+    while "\n\n\n\n" in new_code:
+        new_code = new_code.replace("\n\n\n\n", "\n\n\n")
+    return new_code, used
@@ -0,0 +1,176 @@
+# ==========================================================
+#  QUANTREO — Alpha transforms (causal, vectorized)
+# ==========================================================
+#  Shared helper library of the alpha code: compiled formulas and the
+#  Coder/Refiner output import from here instead of redefining helpers.
+#  Every function accepts a pd.Series or a 1-D NumPy array and returns the
+#  same kind of object (a Series keeps its index). All transforms are causal:
+#  the value at t only uses observations <= t. A window containing a NaN
+#  yields NaN, as `x.rolling(window=n)` does.
+from __future__ import annotations
+
+from typing import Any, Tuple
+import numpy as np
+import pandas as pd
+
+# Rows per block in the rolling kernels (bounds the cumsum rounding error)
+_BLOCK = 4096
+# Windows up to this size are computed exactly on a strided window view
+_SMALL_WINDOW = 16
+# Rolling rank: direct comparison counts up to this window, skiplist beyond
+_RANK_DIRECT_WINDOW = 128
+
+
+# ----------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------
+def _values(x: Any) -> np.ndarray:
+    if isinstance(x, pd.Series):
+        return x.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.asarray(x, dtype=np.float64)
+
+
+def _like(values: np.ndarray, x: Any) -> Any:
+    if isinstance(x, pd.Series):
+        return pd.Series(values, index=x.index, name=x.name)
+    return values
+
+
+def _check_window(n: int) -> int:
+    if int(n) != n or n < 1:
+        raise ValueError(f"Window must be a positive integer, got {n!r}.")
+    return int(n)
+
+
+def _rolling_moments(a: np.ndarray, n: int, ddof: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rolling mean and variance in a single pass of cumulative sums.
+
+    The series is processed in blocks, each re-centred on its own mean, so the
+    cancellation error of the cumsum difference does not grow with history length.
+    """
+    size = a.shape[0]
+    mean = np.full(size, np.nan)
+    var = np.full(size, np.nan)
+    if size < n:
+        return mean, var
+
+    if n <= _SMALL_WINDOW:
+        view = np.lib.stride_tricks.sliding_window_view(a, n)
+        mean[n - 1:] = view.mean(axis=1)
+        var[n - 1:] = view.var(axis=1, ddof=ddof) if n > ddof else np.nan
+        return mean, var
+
+    block = max(_BLOCK, 16 * n)
+    for start in range(n - 1, size, block):
+        end = min(start + block, size)
+        seg = a[start - n + 1:end]
+        nan = np.isnan(seg)
+        center = np.nanmean(seg) if not nan.all() else 0.0
+        d = np.where(nan, 0.0, seg - center)
+
+        c1 = np.concatenate(([0.0], np.cumsum(d)))
+        c2 = np.concatenate(([0.0], np.cumsum(d * d)))
+        cn = np.concatenate(([0], np.cumsum(nan)))
+        s1 = c1[n:] - c1[:-n]
+        s2 = c2[n:] - c2[:-n]
+        bad = (cn[n:] - cn[:-n]) > 0
+
+        m = s1 / n
+        v = np.maximum(s2 - s1 * m, 0.0) / (n - ddof) if n > ddof else np.full(m.shape, np.nan)
+        m = m + center
+        m[bad] = np.nan
+        v[bad] = np.nan
+        mean[start:end] = m
+        var[start:end] = v
+    return mean, var
+
+
+# ----------------------------------------------------------
+# Vocabulary
+# ----------------------------------------------------------
+def sma(x: Any, n: int) -> Any:
+    """Simple moving average over the last `n` observations."""
+    n = _check_window(n)
+    mean, _ = _rolling_moments(_values(x), n)
+    return _like(mean, x)
+
+
+def ema(x: Any, n: int) -> Any:
+    """Exponential moving average, x.ewm(span=n, adjust=False).mean()."""
+    n = _check_window(n)
+    out = pd.Series(_values(x)).ewm(span=n, adjust=False).mean().to_numpy()
+    return _like(out, x)
+
+
+def std(x: Any, n: int) -> Any:
+    """Rolling sample standard deviation (ddof=1)."""
+    n = _check_window(n)
+    _, var = _rolling_moments(_values(x), n)
+    return _like(np.sqrt(var), x)
+
+
+def zscore(x: Any, n: int) -> Any:
+    """(x - rolling mean) / rolling std. A flat window yields NaN."""
+    n = _check_window(n)
+    a = _values(x)
+    mean, var = _rolling_moments(a, n)
+    sd = np.sqrt(var)
+    sd[sd == 0.0] = np.nan
+    return _like((a - mean) / sd, x)
+
+
+def _rolling_rank_direct(a: np.ndarray, n: int) -> np.ndarray:
+    """Average rank of a[t] in a[t-n+1:t+1] by counting smaller/equal values, chunked to bound memory."""
+    out = np.full(a.shape[0], np.nan)
+    if a.shape[0] < n:
+        return out
+    view = np.lib.stride_tricks.sliding_window_view(a, n)
+    nan = np.concatenate(([0], np.cumsum(np.isnan(a))))
+    bad = (nan[n:] - nan[:-n]) > 0
+
+    chunk = max(1, (1 << 22) // n)
+    for start in range(0, view.shape[0], chunk):
+        w = view[start:start + chunk]
+        cur = w[:, -1:]
+        less = (w < cur).sum(axis=1)
+        equal = (w == cur).sum(axis=1)
+        out[n - 1 + start:n - 1 + start + w.shape[0]] = less + (equal + 1) / 2.0
+    out[n - 1:][bad] = np.nan
+    return out
+
+
+def rank(x: Any, n: int) -> Any:
+    """
+    Rank (1..n, ties averaged) of the current value within its last `n` observations.
+
+    Same values as `x.rolling(n).apply(lambda w: pd.Series(w).rank().iloc[-1])`.
+    Small windows count smaller/equal values on a strided view (vectorized
+    O(n*w)); larger ones use pandas' skiplist rolling rank (O(n log w)).
+    """
+    n = _check_window(n)
+    a = _values(x)
+    if n <= _RANK_DIRECT_WINDOW:
+        out = _rolling_rank_direct(a, n)
+    else:
+        out = pd.Series(a).rolling(window=n).rank().to_numpy()
+    return _like(out, x)
+
+
+def lag(x: Any, n: int = 1) -> Any:
+    """Value observed `n` periods ago (n >= 0, no look-ahead)."""
+    if int(n) != n or n < 0:
+        raise ValueError(f"lag must be a non-negative integer, got {n!r}.")
+    n = int(n)
+    a = _values(x)
+    out = np.full(a.shape, np.nan)
+    if n == 0:
+        out[:] = a
+    elif n < a.shape[0]:
+        out[n:] = a[:-n]
+    return _like(out, x)
+
+
+def clip(x: Any, lo: float, hi: float) -> Any:
+    """Bound the values of x to [lo, hi], NaNs are kept."""
+    return _like(np.clip(_values(x), lo, hi), x)
@@ -0,0 +1,387 @@
+# ==========================================================
+#  QUANTREO — Vectorized strategy backtester
+# ==========================================================
+#  Executes the StrategyBuilder YAMLs (outputs/strategies/Strategy_*/*.yaml)
+#  compiled by core.backtest.expressions: entry and sizing expressions are
+#  evaluated vectorized over the feature store frame; only the path-dependent
+#  exit (max_duration, stop_loss, take_profit, optional signal) is resolved
+#  per trade, from precomputed (entry x holding bar) windows of the price path. Work is proportional to
+#  the number of trades, not of bars.
+#
+#  Conventions (close-to-close, one position per asset):
+#  - signals are known at the close of bar t; a trade enters at close[t]
+#  - `days_since_entry` counts bars, `pnl_since_entry` is side * (close / entry - 1)
+#  - the exit is checked at each close after the entry and taken at that close;
+#    a new entry can happen from the next bar on
+#  - the size is the position_sizing value at the entry bar, clipped to
+#    [0, max_per_asset], and held until the exit
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+import math
+
+import numpy as np
+import pandas as pd
+
+from core.backtest.expressions import CompiledStrategy
+
+# Exit reasons (codes of the `reason` column of the trades)
+EXIT_REASONS = {0: "end", 1: "time", 2: "stop_loss", 3: "take_profit", 4: "signal"}
+
+# Holding windows up to this length are resolved for every entry candidate at once
+VECTOR_MAX_HOLD = 128
+# Elements per (entries x holding bars) block
+_BLOCK_ELEMENTS = 4_000_000
+
+
+# ----------------------------------------------------------
+# Path-dependent exit
+# ----------------------------------------------------------
+def _exit_block(
+    close: np.ndarray,
+    entries: np.ndarray,
+    sides: np.ndarray,
+    hold: int,
+    stop_loss: Optional[float],
+    take_profit: Optional[float],
+    exit_signal: Optional[np.ndarray],
+    time_exit: bool,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    First exit within `hold` bars after each entry: (exit index, reason code).
+    Entries with no exit in the window get index -1 (unless `time_exit`).
+    """
+    n = len(close)
+    rows = np.arange(len(entries))
+    idx = entries[:, None] + np.arange(1, hold + 1)[None, :]
+    np.minimum(idx, n - 1, out=idx)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pnl = close[idx]
+        pnl /= close[entries][:, None]
+        pnl -= 1.0
+        pnl *= sides[:, None]
+    hit = np.zeros(idx.shape, dtype=bool)
+    if time_exit:
+        hit[:, -1] = True
+    if exit_signal is not None:
+        hit |= exit_signal[idx]
+    if take_profit is not None:
+        hit |= pnl >= take_profit
+    if stop_loss is not None:
+        hit |= pnl <= -stop_loss
+    tail = entries + hold >= n
+    if tail.any():
+        # bars past the end of the data never trigger
+        hit[tail] &= (entries[tail][:, None] + np.arange(1, hold + 1)[None, :]) < n
+
+    first = hit.argmax(axis=1)
+    found = hit[rows, first]
+    exit_idx = np.where(found, entries + 1 + first, -1)
+
+    # reason of the first hit, highest priority first: stop, take profit, signal, time
+    p = pnl[rows, first]
+    exit_reason = np.zeros(len(entries), dtype=np.int8)
+    if time_exit:
+        exit_reason[first == hold - 1] = 1
+    if exit_signal is not None:
+        exit_reason[exit_signal[np.minimum(entries + 1 + first, n - 1)]] = 4
+    if take_profit is not None:
+        exit_reason[p >= take_profit] = 3
+    if stop_loss is not None:
+        exit_reason[p <= -stop_loss] = 2
+    exit_reason[~found] = 0
+
+    # window running past the data: close the trade on the last bar
+    end = ~found & (entries + hold >= n - 1)
+    exit_idx[end] = n - 1
+    return exit_idx, exit_reason
+
+
+def _scan_exit(
+    close: np.ndarray,
+    t: int,
+    side: int,
+    max_duration: Optional[int],
+    stop_loss: Optional[float],
+    take_profit: Optional[float],
+    exit_signal: Optional[np.ndarray],
+) -> Tuple[int, int]:
+    """Exit of one trade, scanning blocks of doubling length (long or unbounded holds)."""
+    n = len(close)
+    last = n - 1 if max_duration is None else min(t + max_duration, n - 1)
+    start, block = t, 64
+    while start < last:
+        stop = min(start + block, last)
+        window = slice(start + 1, stop + 1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pnl = side * (close[window] / close[t] - 1.0)
+        reason = np.zeros(stop - start, dtype=np.int8)
+        if exit_signal is not None:
+            reason[exit_signal[window]] = 4
+        if take_profit is not None:
+            reason[pnl >= take_profit] = 3
+        if stop_loss is not None:
+            reason[pnl <= -stop_loss] = 2
+        hits = np.flatnonzero(reason)
+        if len(hits):
+            return start + 1 + int(hits[0]), int(reason[hits[0]])
+        start, block = stop, block * 2
+    if max_duration is not None and t + max_duration <= n - 1:
+        return t + max_duration, 1
+    return n - 1, 0
+
+
+def simulate(
+    close: np.ndarray,
+    side: np.ndarray,
+    size: np.ndarray,
+    max_duration: Optional[int] = None,
+    stop_loss: Optional[float] = None,
+    take_profit: Optional[float] = None,
+    exit_signal: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    Resolve the trades of one asset.
+
+    Parameters
+    ----------
+    close : np.ndarray
+        Execution prices.
+    side : np.ndarray
+        Entry signal per bar: +1 long, -1 short, 0 none.
+    size : np.ndarray
+        Position size per bar (fraction of capital), read at the entry bar.
+    max_duration, stop_loss, take_profit : optional
+        Exit rules (bars, and fractions of the entry price).
+    exit_signal : np.ndarray, optional
+        Extra boolean exit condition, checked at every close while in a trade.
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        Trade arrays `entry`, `exit`, `side`, `size`, `reason` (codes of `EXIT_REASONS`).
+    """
+    close = np.asarray(close, dtype=np.float64)
+    n = len(close)
+    active = (side != 0) & (size > 0) & np.isfinite(close)
+    active[-1:] = False                         # no bar left to hold a position
+    candidates = np.flatnonzero(active)
+
+    m = len(candidates)
+    if max_duration is not None and max_duration <= VECTOR_MAX_HOLD:
+        # exits of every candidate at once, then a walk over candidate positions:
+        # the next trade starts at the first candidate after the exit bar
+        exits = np.empty(m, dtype=np.int64)
+        reasons = np.empty(m, dtype=np.int8)
+        rows = max(_BLOCK_ELEMENTS // max_duration, 1)
+        for i in range(0, m, rows):
+            block = candidates[i:i + rows]
+            exits[i:i + rows], reasons[i:i + rows] = _exit_block(
+                close, block, side[block].astype(np.float64), max_duration,
+                stop_loss, take_profit, exit_signal, time_exit=True,
+            )
+        jump = np.searchsorted(candidates, exits + 1).tolist()
+        chosen, i = [], 0
+        while i < m:
+            chosen.append(i)
+            i = jump[i]
+        chosen = np.asarray(chosen, dtype=np.int64)
+        entry, exit_, reason = candidates[chosen], exits[chosen], reasons[chosen]
+    else:
+        entries, exit_list, reason_list = [], [], []
+        i = 0
+        while i < m:
+            t = int(candidates[i])
+            e, r = _scan_exit(close, t, int(side[t]), max_duration, stop_loss, take_profit, exit_signal)
+            entries.append(t)
+            exit_list.append(e)
+            reason_list.append(r)
+            i = int(np.searchsorted(candidates, e + 1))
+        entry = np.asarray(entries, dtype=np.int64)
+        exit_ = np.asarray(exit_list, dtype=np.int64)
+        reason = np.asarray(reason_list, dtype=np.int8)
+
+    return {
+        "entry": entry,
+        "exit": exit_,
+        "side": np.asarray(side[entry]).astype(np.int8),
+        "size": np.asarray(size[entry], dtype=np.float64),
+        "reason": reason,
+    }
+
+
+def positions_from_trades(trades: Dict[str, np.ndarray], n: int) -> np.ndarray:
+    """Signed position held after each close (entry bar included, exit bar excluded)."""
+    delta = np.zeros(n + 1)
+    weight = trades["side"] * trades["size"]
+    np.add.at(delta, trades["entry"], weight)
+    np.add.at(delta, trades["exit"], -weight)
+    return np.cumsum(delta[:n])
+
+
+# ----------------------------------------------------------
+# Backtest
+# ----------------------------------------------------------
+def backtest(
+    strategy: CompiledStrategy,
+    df: pd.DataFrame,
+    price_col: str = "close",
+    cost_bps: float = 0.0,
+    signals: Optional[Dict[str, np.ndarray]] = None,
+    cache: Optional[Dict[tuple, np.ndarray]] = None,
+) -> Dict[str, Any]:
+    """
+    Backtest a compiled strategy on one asset.
+
+    Parameters
+    ----------
+    strategy : CompiledStrategy
+        Output of `core.backtest.expressions.compile_strategy`.
+    df : pd.DataFrame
+        Feature-store frame with the strategy columns and `price_col`.
+    price_col : str
+        Execution price column.
+    cost_bps : float
+        Cost per unit of turnover, in basis points.
+    signals : dict, optional
+        Precomputed `strategy.evaluate(df)` (reused across parameter sets).
+    cache : dict, optional
+        Rolling-transform cache of this frame, shared with other strategies.
+
+    Returns
+    -------
+    Dict[str, Any]
+        `series`: DataFrame (position, pnl, turnover, exposure, equity) on the
+        index of df; `trades`: one row per trade.
+    """
+    if price_col not in df.columns:
+        raise KeyError(f"Price column '{price_col}' not in the frame.")
+    signals = signals if signals is not None else strategy.evaluate(df, cache=cache)
+    close = df[price_col].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    trades = simulate(
+        close, signals["side"], signals["size"],
+        max_duration=strategy.max_duration,
+        stop_loss=strategy.stop_loss,
+        take_profit=strategy.take_profit,
+        exit_signal=signals["exit_signal"],
+    )
+    return {
+        "series": _series(close, trades, df.index, cost_bps),
+        "trades": _trades_frame(close, trades, df.index),
+    }
+
+
+def bar_returns(close: np.ndarray) -> np.ndarray:
+    """Close-to-close return of each bar (0 on the first bar and around missing prices)."""
+    ret = np.zeros(len(close))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret[1:] = close[1:] / close[:-1] - 1.0
+    ret[~np.isfinite(ret)] = 0.0
+    return ret
+
+
+def pnl_arrays(
+    close: np.ndarray,
+    trades: Dict[str, np.ndarray],
+    cost_bps: float = 0.0,
+    ret: Optional[np.ndarray] = None,
+) -> Dict[str, np.ndarray]:
+    """Position, pnl and turnover per bar of the trades of one asset (`ret`: precomputed `bar_returns`)."""
+    position = positions_from_trades(trades, len(close))
+    ret = bar_returns(close) if ret is None else ret
+
+    held = np.concatenate([[0.0], position[:-1]])
+    turnover = np.abs(position - held)
+    pnl = held * ret - turnover * cost_bps * 1e-4
+    return {"position": position, "pnl": pnl, "turnover": turnover}
+
+
+def _series(close: np.ndarray, trades: Dict[str, np.ndarray], index: pd.Index, cost_bps: float) -> pd.DataFrame:
+    arrays = pnl_arrays(close, trades, cost_bps)
+    return pd.DataFrame(
+        {
+            "position": arrays["position"],
+            "pnl": arrays["pnl"],
+            "turnover": arrays["turnover"],
+            "exposure": np.abs(arrays["position"]),
+            "equity": np.cumsum(arrays["pnl"]),
+        },
+        index=index,
+    )
+
+
+def _trades_frame(close: np.ndarray, trades: Dict[str, np.ndarray], index: pd.Index) -> pd.DataFrame:
+    entry, exit_ = trades["entry"], trades["exit"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ret = trades["side"] * (close[exit_] / close[entry] - 1.0)
+    return pd.DataFrame({
+        "entry_time": index[entry],
+        "exit_time": index[exit_],
+        "side": trades["side"],
+        "size": trades["size"],
+        "bars": exit_ - entry,
+        "return": ret,
+        "pnl": ret * trades["size"],
+        "reason": [EXIT_REASONS[r] for r in trades["reason"]],
+    })
+
+
+def periods_per_year(index: pd.Index) -> float:
+    """Bars per year implied by the median bar spacing (252 when the index has no time)."""
+    if not isinstance(index, pd.DatetimeIndex) or len(index) < 2:
+        return 252.0
+    step = (index[1:] - index[:-1]).median().total_seconds()
+    return 365.25 * 24 * 3600 / step if step > 0 else 252.0
+
+
+def performance_stats(series: pd.DataFrame, trades: pd.DataFrame, annualization: Optional[float] = None) -> Dict[str, float]:
+    """
+    Summary statistics of one backtest (additive pnl in fractions of capital):
+    the `pnl_stats` metrics plus exposure, hit rate and average holding bars.
+    """
+    ann = annualization or periods_per_year(series.index)
+    stats = pnl_stats(series["pnl"].to_numpy(), float(series["turnover"].sum()), len(trades), ann)
+    return {
+        "total_return": stats["total_return"],
+        "sharpe": stats["sharpe"],
+        "max_drawdown": stats["max_drawdown"],
+        "turnover": stats["turnover"],
+        "exposure": float(series["exposure"].mean()) if len(series) else 0.0,
+        "n_trades": stats["n_trades"],
+        "hit_rate": float((trades["return"] > 0).mean()) if len(trades) else np.nan,
+        "avg_bars": float(trades["bars"].mean()) if len(trades) else np.nan,
+    }
+
+
+def pnl_stats(pnl: np.ndarray, turnover: float, n_trades: int, ann: float) -> Dict[str, float]:
+    """
+    Statistics of a pnl array (sharpe, total_return, max_drawdown, turnover per
+    year, n_trades) plus the per-bar Sharpe ratio, skewness and kurtosis used by
+    the probabilistic Sharpe ratio.
+    """
+    n = len(pnl)
+    mean = pnl.mean() if n else 0.0
+    std = pnl.std(ddof=1) if n > 1 else 0.0
+    sr = mean / std if std > 0 else 0.0
+    if std > 0:
+        d = pnl - mean
+        d2 = d * d
+        m2 = d2.mean()
+        skew, kurt = float((d2 * d).mean() / m2 ** 1.5), float((d2 * d2).mean() / (m2 * m2))
+    else:
+        skew, kurt = 0.0, 3.0
+    equity = np.cumsum(pnl)
+    drawdown = equity - np.maximum.accumulate(np.concatenate([[0.0], equity]))[1:]
+    years = n / ann if ann else float("nan")
+    return {
+        "sharpe": float(sr * math.sqrt(ann)),
+        "total_return": float(equity[-1]) if n else 0.0,
+        "max_drawdown": float(drawdown.min()) if n else 0.0,
+        "turnover": float(turnover / years) if years else float("nan"),
+        "n_trades": int(n_trades),
+        "sr_bar": float(sr),
+        "skew": skew,
+        "kurtosis": kurt,
+    }
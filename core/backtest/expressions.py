@@ -0,0 +1,304 @@
+# ==========================================================
+#  QUANTREO — Strategy expression compiler (no eval)
+# ==========================================================
+#  Compiles the `expression` fields of a StrategyBuilder YAML
+#  (long_entry, short_entry, exit, position_sizing) into ONE evaluation plan
+#  of core.alphas.formula: `and`/`or`/`not` become elementwise boolean ops,
+#  zscore/sma/ema/... the causal kernels of core.alphas.transforms, and the
+#  parameters are substituted as constants. Every expression is checked
+#  against a whitelist of syntax nodes and its block's `identifiers_used`
+#  before anything is evaluated. Compile once per strategy, then evaluate
+#  the plan on the frame of every asset.
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional
+import ast
+
+import numpy as np
+import pandas as pd
+
+from core.alphas.formula import (
+    DEFAULT_WINDOW,
+    FUNCTIONS,
+    FormulaError,
+    PlanBuilder,
+    evaluate_plan,
+    structural_keys,
+)
+
+# Trade state available to the exit expression only (resolved by the backtester)
+STATE_VARIABLES = ("days_since_entry", "pnl_since_entry")
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call,
+    ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.BitAnd, ast.BitOr,
+    ast.USub, ast.UAdd, ast.Not, ast.Invert,
+    ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq,
+)
+
+
+class StrategyError(ValueError):
+    """Raised when a strategy YAML cannot be compiled or executed by the backtester."""
+
+
+# ----------------------------------------------------------
+# Expression parsing and validation
+# ----------------------------------------------------------
+class _Substitute(ast.NodeTransformer):
+    def __init__(self, params: Dict[str, float]):
+        self.params = params
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        if node.id in self.params:
+            return ast.copy_location(ast.Constant(float(self.params[node.id])), node)
+        return node
+
+
+def compile_expression(
+    expr: Any,
+    identifiers: Optional[Iterable[str]] = None,
+    params: Optional[Dict[str, float]] = None,
+    allow_state: bool = False,
+) -> ast.AST:
+    """
+    Parse and validate one expression; parameters are replaced by their value.
+
+    Parameters
+    ----------
+    expr : str
+        Strategy expression, e.g. "(returns_100 > 0) and zscore(rs_vol_50) < 2".
+    identifiers : Iterable[str], optional
+        The block's `identifiers_used`: the only feature columns the
+        expression may read. None disables the check.
+    params : dict, optional
+        The block's `parameters` (name -> number).
+    allow_state : bool
+        Whether `days_since_entry` / `pnl_since_entry` may appear (exit block).
+
+    Raises
+    ------
+    StrategyError
+        On a syntax error, a node outside the whitelist (attributes,
+        subscripts, lambdas, ...), an unknown function or an undeclared name.
+    """
+    text = str(expr).strip()
+    if not text:
+        raise StrategyError("Empty expression.")
+    try:
+        tree = ast.parse(text, mode="eval")
+    except SyntaxError as e:
+        raise StrategyError(f"Invalid syntax in {text!r}: {e.msg}") from e
+
+    params = params or {}
+    allowed = None if identifiers is None else set(identifiers)
+    functions = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise StrategyError(f"Unsupported syntax '{type(node).__name__}' in {text!r}.")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                name = getattr(node.func, "id", type(node.func).__name__)
+                raise StrategyError(f"Unknown function '{name}' in {text!r}. Allowed: {sorted(FUNCTIONS)}.")
+            if node.keywords:
+                raise StrategyError(f"Keyword arguments are not supported in {text!r}.")
+            functions.add(id(node.func))
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Name) or id(node) in functions or node.id in params:
+            continue
+        if node.id in STATE_VARIABLES:
+            if not allow_state:
+                raise StrategyError(f"'{node.id}' is only available in the exit expression ({text!r}).")
+            continue
+        if allowed is not None and node.id not in allowed:
+            raise StrategyError(f"'{node.id}' is not listed in identifiers_used of {text!r}.")
+
+    return _Substitute(params).visit(tree.body)
+
+
+def _names(node: ast.AST) -> set:
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _number(node: ast.AST, text: str) -> float:
+    sign = 1.0
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        sign, node = -1.0, node.operand
+    if not isinstance(node, ast.Constant) or not isinstance(node.value, (int, float)):
+        raise StrategyError(f"Exit thresholds must be parameters or numbers in {text!r}.")
+    return sign * float(node.value)
+
+
+def _exit_rule(term: ast.AST, text: str, rules: Dict[str, float]) -> bool:
+    """Record a `days_since_entry >= n` / `pnl_since_entry <= -sl` / `pnl_since_entry >= tp` term."""
+    if not (isinstance(term, ast.Compare) and len(term.ops) == 1 and isinstance(term.left, ast.Name)):
+        return False
+    var, op, value = term.left.id, type(term.ops[0]), term.comparators[0]
+    if var == "days_since_entry" and op in (ast.GtE, ast.Gt):
+        rules["max_duration"] = _number(value, text) + (1 if op is ast.Gt else 0)
+    elif var == "pnl_since_entry" and op in (ast.LtE, ast.Lt):
+        rules["stop_loss"] = -_number(value, text)
+    elif var == "pnl_since_entry" and op in (ast.GtE, ast.Gt):
+        rules["take_profit"] = _number(value, text)
+    else:
+        return False
+    return True
+
+
+def _parameters(block: Dict[str, Any]) -> Dict[str, float]:
+    params = block.get("parameters") or {}
+    try:
+        return {k: float(v) for k, v in params.items()}
+    except (TypeError, ValueError) as e:
+        raise StrategyError(f"Non-numeric parameter in {params!r}.") from e
+
+
+# ----------------------------------------------------------
+# Compiled strategy
+# ----------------------------------------------------------
+class CompiledStrategy:
+    """
+    A strategy YAML compiled into one evaluation plan.
+
+    Parameters
+    ----------
+    strategy_yaml : dict
+        Parsed StrategyBuilder document (root key `strategy`).
+    default_window : int
+        Window of zscore/rank/sma/... calls written without one.
+    strict : bool
+        Check every expression against its block's `identifiers_used`
+        (blocks without the key are not checked).
+    """
+
+    def __init__(self, strategy_yaml: Dict[str, Any], default_window: int = DEFAULT_WINDOW, strict: bool = True):
+        spec = (strategy_yaml or {}).get("strategy") or {}
+        if not spec:
+            raise StrategyError("Missing root key 'strategy'.")
+        self.name = spec.get("name") or "strategy"
+        self.strict = strict
+        self.plan = PlanBuilder(default_window)
+
+        self.long_step = self._bool_step(spec.get("long_entry") or {})
+        self.short_step = self._bool_step(spec.get("short_entry") or {})
+        if self.long_step is None and self.short_step is None:
+            raise StrategyError("The strategy has neither long_entry nor short_entry expression.")
+
+        sizing = spec.get("position_sizing") or {}
+        params = _parameters(sizing)
+        self.max_per_asset = params.pop("max_per_asset", 1.0)
+        self.size_step = (
+            self._add(sizing, params=params) if sizing.get("expression") not in (None, "")
+            else self.plan._add("const", (self.max_per_asset,))
+        )
+
+        self.max_duration: Optional[int] = None
+        self.stop_loss: Optional[float] = None
+        self.take_profit: Optional[float] = None
+        self.exit_step: Optional[int] = None
+        self._compile_exit(spec.get("exit") or {})
+        self.columns = self.plan.columns()
+
+    # ------------------------------------------------------------------
+    def _identifiers(self, block: Dict[str, Any]) -> Optional[List[str]]:
+        if not self.strict or "identifiers_used" not in block:
+            return None
+        return list(block.get("identifiers_used") or [])
+
+    def _plan_add(self, tree: ast.AST) -> int:
+        try:
+            return self.plan.add_expression(ast.unparse(tree))
+        except FormulaError as e:
+            raise StrategyError(str(e)) from e
+
+    def _add(self, block: Dict[str, Any], params: Optional[Dict[str, float]] = None) -> int:
+        tree = compile_expression(block["expression"], self._identifiers(block), params)
+        return self._plan_add(tree)
+
+    def _bool_step(self, block: Dict[str, Any]) -> Optional[int]:
+        if block.get("expression") in (None, ""):
+            return None
+        return self.plan._as_bool(self._add(block))
+
+    def _compile_exit(self, block: Dict[str, Any]) -> None:
+        params = _parameters(block)
+        rules: Dict[str, float] = {}
+        signals = []
+        if block.get("expression") not in (None, ""):
+            text = str(block["expression"])
+            tree = compile_expression(text, self._identifiers(block), params, allow_state=True)
+            terms = tree.values if isinstance(tree, ast.BoolOp) and isinstance(tree.op, ast.Or) else [tree]
+            for term in terms:
+                if _exit_rule(term, text, rules):
+                    continue
+                if _names(term) & set(STATE_VARIABLES):
+                    raise StrategyError(f"Unsupported use of the trade state in exit term {ast.unparse(term)!r}.")
+                signals.append(term)
+        else:
+            # No expression: fall back on the declared parameters
+            rules = {k: params[k] for k in ("max_duration", "stop_loss", "take_profit") if k in params}
+
+        if "max_duration" in rules:
+            self.max_duration = max(int(np.ceil(rules["max_duration"])), 1)
+        self.stop_loss = rules.get("stop_loss")
+        self.take_profit = rules.get("take_profit")
+        if signals:
+            tree = signals[0] if len(signals) == 1 else ast.BoolOp(op=ast.Or(), values=signals)
+            self.exit_step = self.plan._as_bool(self._plan_add(tree))
+
+    # ------------------------------------------------------------------
+    def evaluate(self, df: pd.DataFrame, cache: Optional[Dict[tuple, np.ndarray]] = None) -> Dict[str, np.ndarray]:
+        """
+        Entry side (+1/-1/0), size and exit-signal arrays over the rows of `df`.
+
+        `cache` (one dict per frame) shares the rolling transforms, e.g.
+        zscore(rs_vol_50, 50), and the entry/sizing/exit outputs between
+        strategies or parameter sets evaluated on the same frame: an
+        expression already computed there is not evaluated again.
+        """
+        missing = set(self.columns) - set(df.columns)
+        if missing:
+            raise KeyError(f"Missing required columns: {sorted(missing)}")
+        steps = [s for s in (self.long_step, self.short_step, self.size_step, self.exit_step) if s is not None]
+
+        values: Dict[int, np.ndarray] = {}
+        keys: Dict[int, tuple] = {}
+        if cache is not None:
+            keys = {s: ("output",) + k for s, k in structural_keys(self.plan.steps, steps).items() if s in steps}
+            values = {s: cache[keys[s]] for s in steps if keys[s] in cache}
+        todo = [s for s in steps if s not in values]
+        if todo:
+            for s, array in zip(todo, evaluate_plan(self.plan.steps, df, todo, cache=cache)):
+                values[s] = array
+                if cache is not None:
+                    cache[keys[s]] = array
+
+        n = len(df)
+        long_ = values[self.long_step].astype(bool) if self.long_step is not None else np.zeros(n, dtype=bool)
+        short = values[self.short_step].astype(bool) if self.short_step is not None else np.zeros(n, dtype=bool)
+        # simultaneous long and short signals cancel out
+        side = long_.astype(np.int8) - short.astype(np.int8)
+
+        with np.errstate(invalid="ignore"):
+            size = np.clip(np.asarray(values[self.size_step], dtype=np.float64), 0.0, self.max_per_asset)
+        size = np.where(np.isfinite(size), size, 0.0)
+        exit_signal = values[self.exit_step].astype(bool) if self.exit_step is not None else None
+        return {"side": side, "size": size, "exit_signal": exit_signal}
+
+
+def compile_strategy(
+    strategy_yaml: Dict[str, Any],
+    default_window: int = DEFAULT_WINDOW,
+    strict: bool = True,
+) -> CompiledStrategy:
+    """
+    Compile a StrategyBuilder YAML into a `CompiledStrategy`.
+
+    Raises
+    ------
+    StrategyError
+        If an expression is missing, invalid, reads an identifier outside its
+        `identifiers_used`, or uses the trade state outside the supported exit rules.
+    """
+    return CompiledStrategy(strategy_yaml, default_window=default_window, strict=strict)
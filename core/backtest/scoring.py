@@ -0,0 +1,158 @@
+# ==========================================================
+#  QUANTREO — Batch scoring of generated strategies
+# ==========================================================
+#  Backtests every StrategyBuilder YAML of outputs/strategies in one pass:
+#  - the feature store is read once per asset, with the union of the columns
+#    of all strategies;
+#  - strategies are evaluated against one cache per asset, so a rolling
+#    transform (or a whole entry rule) used by several strategies is computed
+#    once; strategies are visited grouped by columns to keep the cache warm;
+#  - the result is a leaderboard with one row per strategy, ranked by Sharpe
+#    ratio, with the deflated Sharpe ratio of the whole batch.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import time
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from core.backtest.engine import periods_per_year, pnl_arrays, pnl_stats, simulate
+from core.backtest.expressions import CompiledStrategy, compile_strategy
+from core.backtest.sweep import add_multiple_testing
+from core.utils.io import load_yaml
+
+STRATEGY_GLOB = "Strategy_*/*.yaml"
+
+# Cached arrays kept per asset before the cache is emptied
+DEFAULT_CACHE_BYTES = 2 * 1024 ** 3
+
+
+def discover_strategies(root: Path) -> List[Path]:
+    """Every strategy YAML under `root` (outputs/strategies/Strategy_*/<name>.yaml)."""
+    return sorted(Path(root).glob(STRATEGY_GLOB))
+
+
+def compile_all(
+    paths: List[Path],
+    strict: bool = True,
+) -> Tuple[Dict[str, CompiledStrategy], Dict[str, str]]:
+    """
+    Compile strategy YAMLs, keyed by '<Strategy_dir>/<file>'.
+
+    Returns
+    -------
+    (dict, dict)
+        Compiled strategies, and the error message of each YAML that failed.
+    """
+    compiled: Dict[str, CompiledStrategy] = {}
+    errors: Dict[str, str] = {}
+    for path in paths:
+        key = f"{path.parent.name}/{path.name}"
+        try:
+            compiled[key] = compile_strategy(load_yaml(path), strict=strict)
+        except (ValueError, SyntaxError, KeyError, TypeError, yaml.YAMLError) as e:
+            errors[key] = f"{type(e).__name__}: {e}"
+    return compiled, errors
+
+
+def _cache_bytes(cache: Dict[tuple, np.ndarray]) -> int:
+    return sum(getattr(v, "nbytes", 0) for v in cache.values())
+
+
+def score_strategies(
+    strategies: Dict[str, CompiledStrategy],
+    frames: Dict[str, pd.DataFrame],
+    price_col: str = "close",
+    cost_bps: float = 0.0,
+    errors: Optional[Dict[str, str]] = None,
+    max_cache_bytes: int = DEFAULT_CACHE_BYTES,
+) -> pd.DataFrame:
+    """
+    Backtest many strategies on the same frames and rank them.
+
+    The pnl of the assets is summed on the union of their timestamps, so each
+    strategy gets one portfolio pnl and one row of the leaderboard.
+
+    Parameters
+    ----------
+    strategies : Dict[str, CompiledStrategy]
+        {source: compiled strategy} (see `compile_all`).
+    frames : Dict[str, pd.DataFrame]
+        {asset: feature-store frame with the union of the strategy columns and `price_col`}.
+    errors : dict, optional
+        {source: message} of strategies that did not compile, listed at the bottom.
+    max_cache_bytes : int
+        Memory budget of the signal cache of each asset.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per strategy: rank, source, strategy, sharpe, total_return,
+        max_drawdown, turnover, n_trades, psr, dsr, runtime_s, error.
+    """
+    union = None
+    for df in frames.values():
+        union = df.index if union is None else union.union(df.index)
+    if union is None:
+        raise ValueError("No frame to backtest on.")
+    ann = periods_per_year(union)
+
+    prepared = {}
+    for asset, df in frames.items():
+        if price_col not in df.columns:
+            raise KeyError(f"Price column '{price_col}' not in the frame of '{asset}'.")
+        prepared[asset] = (
+            union.get_indexer(df.index),
+            df[price_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        )
+    caches: Dict[str, Dict[tuple, np.ndarray]] = {asset: {} for asset in frames}
+
+    rows = []
+    for source in sorted(strategies, key=lambda s: (strategies[s].columns, s)):
+        strategy = strategies[source]
+        row: Dict[str, Any] = {"source": source, "strategy": strategy.name}
+        start = time.perf_counter()
+        try:
+            pnl = np.zeros(len(union))
+            turnover, n_trades = 0.0, 0
+            for asset, df in frames.items():
+                positions, close = prepared[asset]
+                signals = strategy.evaluate(df, cache=caches[asset])
+                trades = simulate(
+                    close, signals["side"], signals["size"],
+                    max_duration=strategy.max_duration,
+                    stop_loss=strategy.stop_loss,
+                    take_profit=strategy.take_profit,
+                    exit_signal=signals["exit_signal"],
+                )
+                arrays = pnl_arrays(close, trades, cost_bps)
+                pnl[positions] += arrays["pnl"]
+                turnover += float(arrays["turnover"].sum())
+                n_trades += len(trades["entry"])
+                if _cache_bytes(caches[asset]) > max_cache_bytes:
+                    caches[asset].clear()
+            row.update(pnl_stats(pnl, turnover, n_trades, ann))
+        except (KeyError, ValueError, ZeroDivisionError, FloatingPointError) as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        row["runtime_s"] = round(time.perf_counter() - start, 4)
+        rows.append(row)
+
+    for source, message in (errors or {}).items():
+        rows.append({"source": source, "error": message})
+
+    board = pd.DataFrame(rows)
+    for col in ("sharpe", "total_return", "max_drawdown", "turnover", "n_trades", "sr_bar", "skew", "kurtosis", "error"):
+        if col not in board.columns:
+            board[col] = np.nan
+    scored = board["error"].isna()
+    if scored.any():
+        tested, _ = add_multiple_testing(board[scored], len(union))
+        board.loc[scored, ["psr", "dsr"]] = tested[["psr", "dsr"]]
+    board = board.sort_values(["sharpe", "source"], ascending=[False, True], na_position="last").reset_index(drop=True)
+    board.insert(0, "rank", np.arange(1, len(board) + 1))
+    columns = ["rank", "source", "strategy", "sharpe", "total_return", "max_drawdown", "turnover",
+               "n_trades", "psr", "dsr", "runtime_s", "error"]
+    return board.reindex(columns=columns)
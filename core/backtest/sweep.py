@@ -0,0 +1,346 @@
+# ==========================================================
+#  QUANTREO — Parameter sweeps of strategy exit and sizing
+# ==========================================================
+#  Evaluates one strategy over many values of its `exit.parameters`
+#  (max_duration, stop_loss, take_profit) and `position_sizing.parameters`
+#  (max_per_asset, base_risk_fraction, ...):
+#  - entry signals, sizes and exit signals are computed once per distinct
+#    expression and asset (a grid of 1,000 exit combinations shares ONE
+#    entry evaluation), and copied once into shared memory;
+#  - the path-dependent exit simulation of the combinations is spread over
+#    a process pool; combinations that differ by their sizing parameters only
+#    reuse the same trades, and workers return one row of statistics each;
+#  - every row carries the probabilistic Sharpe ratio and the deflated
+#    Sharpe ratio (Bailey & Lopez de Prado), which discounts the best Sharpe
+#    ratio of the sweep by the number of combinations tried.
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import copy
+import itertools
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.alphas.formula import structural_keys
+from core.backtest.engine import bar_returns, periods_per_year, pnl_arrays, pnl_stats, simulate
+from core.backtest.expressions import CompiledStrategy, StrategyError, compile_strategy
+from core.features_info.parallel import SharedMatrix
+
+PARAMETER_BLOCKS = ("exit", "position_sizing")
+
+# Default grid: the LLM-chosen value times these factors
+DEFAULT_MULTIPLIERS = (0.5, 0.75, 1.0, 1.5, 2.0)
+
+# Parameters taking integer values
+INTEGER_PARAMETERS = ("max_duration",)
+
+_NORMAL = NormalDist()
+
+
+# ----------------------------------------------------------
+# Parameter spaces
+# ----------------------------------------------------------
+def strategy_parameters(strategy_yaml: Dict[str, Any]) -> Dict[str, float]:
+    """Declared exit and sizing parameters of a strategy (name -> value)."""
+    spec = (strategy_yaml or {}).get("strategy") or {}
+    params: Dict[str, float] = {}
+    for block in PARAMETER_BLOCKS:
+        for name, value in ((spec.get(block) or {}).get("parameters") or {}).items():
+            params[name] = float(value)
+    return params
+
+
+def _cast(name: str, values: Iterable[float]) -> List[float]:
+    if name in INTEGER_PARAMETERS:
+        return sorted({max(int(round(v)), 1) for v in values})
+    return sorted({float(v) for v in values})
+
+
+def default_space(params: Dict[str, float], multipliers: Iterable[float] = DEFAULT_MULTIPLIERS) -> Dict[str, List[float]]:
+    """Grid around the declared values: each parameter times `multipliers`."""
+    return {name: _cast(name, (value * m for m in multipliers)) for name, value in params.items()}
+
+
+def parameter_grid(space: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """Every combination of the values of `space`."""
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_combinations(space: Dict[str, List[float]], n: int, seed: Optional[int] = None) -> List[Dict[str, float]]:
+    """`n` combinations drawn uniformly between the smallest and largest value of each parameter."""
+    rng = np.random.default_rng(seed)
+    draws = {}
+    for name, values in space.items():
+        lo, hi = min(values), max(values)
+        if name in INTEGER_PARAMETERS:
+            draws[name] = rng.integers(int(lo), int(hi) + 1, size=n)
+        else:
+            draws[name] = rng.uniform(lo, hi, size=n)
+    return [{name: draws[name][i].item() for name in space} for i in range(n)]
+
+
+def with_parameters(strategy_yaml: Dict[str, Any], combo: Dict[str, float]) -> Dict[str, Any]:
+    """Copy of the strategy with `combo` written into the blocks declaring each parameter."""
+    out = copy.deepcopy(strategy_yaml)
+    spec = out["strategy"]
+    for name, value in combo.items():
+        found = False
+        for block in PARAMETER_BLOCKS:
+            params = (spec.get(block) or {}).get("parameters")
+            if isinstance(params, dict) and name in params:
+                params[name] = value
+                found = True
+        if not found:
+            raise StrategyError(f"Parameter '{name}' is not declared in the exit or position_sizing block.")
+    return out
+
+
+# ----------------------------------------------------------
+# Multiple-testing statistics
+# ----------------------------------------------------------
+def probabilistic_sharpe(sr: float, sr_ref: float, n_obs: int, skew: float, kurtosis: float) -> float:
+    """
+    P(true Sharpe > sr_ref) given the per-bar Sharpe ratio `sr` estimated on
+    `n_obs` bars with the given skewness and (non-excess) kurtosis.
+    """
+    if n_obs < 2 or not np.isfinite(sr):
+        return float("nan")
+    denom = 1.0 - skew * sr + (kurtosis - 1.0) / 4.0 * sr * sr
+    if denom <= 0:
+        return float("nan")
+    return _NORMAL.cdf((sr - sr_ref) * math.sqrt(n_obs - 1) / math.sqrt(denom))
+
+
+def expected_max_sharpe(sr_variance: float, n_trials: int) -> float:
+    """Expected maximum per-bar Sharpe ratio of `n_trials` unskilled trials."""
+    if n_trials < 2 or sr_variance <= 0:
+        return 0.0
+    gamma = 0.5772156649015329
+    return math.sqrt(sr_variance) * (
+        (1 - gamma) * _NORMAL.inv_cdf(1 - 1.0 / n_trials)
+        + gamma * _NORMAL.inv_cdf(1 - 1.0 / (n_trials * math.e))
+    )
+
+
+def add_multiple_testing(results: pd.DataFrame, n_obs: int) -> Tuple[pd.DataFrame, float]:
+    """
+    Add `psr` (vs a zero Sharpe) and `dsr` (vs the expected maximum Sharpe of
+    the sweep) to a results frame with columns sr_bar, skew and kurtosis.
+    Returns the frame and the per-bar Sharpe threshold used by `dsr`.
+    """
+    srs = results["sr_bar"].to_numpy(dtype=np.float64)
+    finite = srs[np.isfinite(srs)]
+    threshold = expected_max_sharpe(float(finite.var(ddof=1)) if len(finite) > 1 else 0.0, len(results))
+    rows = zip(srs, results["skew"], results["kurtosis"])
+    results = results.copy()
+    stats = [(probabilistic_sharpe(sr, 0.0, n_obs, s, k), probabilistic_sharpe(sr, threshold, n_obs, s, k))
+             for sr, s, k in rows]
+    results["psr"] = [p for p, _ in stats]
+    results["dsr"] = [d for _, d in stats]
+    return results, threshold
+
+
+# ----------------------------------------------------------
+# Sweep execution
+# ----------------------------------------------------------
+def _sweep_task(
+    matrices: Dict[str, Tuple[str, Tuple[int, int]]],
+    n_union: int,
+    rows: List[Dict[str, Any]],
+    cost_bps: float,
+    ann: float,
+) -> List[Dict[str, float]]:
+    # Layout of each asset matrix: [union position | close | variant columns ...]
+    attached = {asset: SharedMatrix.attach(name, shape) for asset, (name, shape) in matrices.items()}
+    try:
+        returns = {asset: bar_returns(m.array[:, 1]) for asset, m in attached.items()}
+        resolved: Dict[tuple, Dict[str, np.ndarray]] = {}
+        out = []
+        for row in rows:
+            pnl = np.zeros(n_union)
+            turnover, n_trades = 0.0, 0
+            exit_rule = (row["max_duration"], row["stop_loss"], row["take_profit"])
+            for asset, (side_col, size_col, exit_col, mask_id) in row["columns"].items():
+                data = attached[asset].array
+                # Sizes only scale the trades: combinations that differ by their sizing
+                # parameters alone share the simulated trades
+                key = (asset, side_col, exit_col, mask_id) + exit_rule
+                if key not in resolved:
+                    resolved[key] = simulate(
+                        data[:, 1],
+                        data[:, side_col],
+                        data[:, size_col],
+                        max_duration=row["max_duration"],
+                        stop_loss=row["stop_loss"],
+                        take_profit=row["take_profit"],
+                        exit_signal=data[:, exit_col] != 0 if exit_col >= 0 else None,
+                    )
+                trades = dict(resolved[key], size=data[resolved[key]["entry"], size_col])
+                arrays = pnl_arrays(data[:, 1], trades, cost_bps, ret=returns[asset])
+                pnl[data[:, 0].astype(np.int64)] += arrays["pnl"]
+                turnover += float(arrays["turnover"].sum())
+                n_trades += len(trades["entry"])
+            out.append(pnl_stats(pnl, turnover, n_trades, ann))
+        return out
+    finally:
+        for matrix in attached.values():
+            matrix.close()
+
+
+def _chunks(rows: List[Dict[str, Any]], chunk_size: int) -> List[List[int]]:
+    # Rows sharing their trades (same signals and exit rule) go to the same task
+    groups: Dict[tuple, List[int]] = {}
+    for i, row in enumerate(rows):
+        key = (row["max_duration"], row["stop_loss"], row["take_profit"]) + tuple(
+            (side, exit_, mask) for side, _, exit_, mask in row["columns"].values()
+        )
+        groups.setdefault(key, []).append(i)
+    chunks, current = [], []
+    for members in groups.values():
+        current.extend(members)
+        if len(current) >= chunk_size:
+            chunks.append(current)
+            current = []
+    return chunks + [current] if current else chunks
+
+
+def _variant_keys(strategy: CompiledStrategy) -> Tuple[tuple, tuple, Optional[tuple]]:
+    roots = [s for s in (strategy.long_step, strategy.short_step, strategy.size_step, strategy.exit_step) if s is not None]
+    keys = structural_keys(strategy.plan.steps, roots)
+    side = (keys.get(strategy.long_step), keys.get(strategy.short_step))
+    size = (keys[strategy.size_step], strategy.max_per_asset)
+    exit_ = keys[strategy.exit_step] if strategy.exit_step is not None else None
+    return side, size, exit_
+
+
+def run_sweep(
+    strategy_yaml: Dict[str, Any],
+    frames: Dict[str, pd.DataFrame],
+    combos: List[Dict[str, float]],
+    price_col: str = "close",
+    cost_bps: float = 0.0,
+    workers: Optional[int] = None,
+    strict: bool = True,
+    chunk_size: int = 16,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Backtest a strategy for every parameter combination, on all assets.
+
+    The pnl of the assets is summed on the union of their timestamps, so
+    each combination gets one portfolio pnl and one row of statistics.
+
+    Parameters
+    ----------
+    strategy_yaml : dict
+        Parsed strategy YAML.
+    frames : Dict[str, pd.DataFrame]
+        {asset: feature-store frame with the strategy columns and `price_col`}.
+    combos : List[dict]
+        Parameter combinations (see `parameter_grid` / `random_combinations`).
+    workers : int, optional
+        Worker processes (default: one per CPU). 1 runs in-process.
+    chunk_size : int
+        Combinations per pool task (combinations sharing their trades are kept together).
+
+    Returns
+    -------
+    (pd.DataFrame, dict)
+        One row per combination (parameters, sharpe, total_return,
+        max_drawdown, turnover, n_trades, sr_bar, skew, kurtosis, psr, dsr)
+        and a summary (trials, bars, Sharpe threshold, best row).
+    """
+    if not combos:
+        raise ValueError("No parameter combination to evaluate.")
+    union = None
+    for df in frames.values():
+        union = df.index if union is None else union.union(df.index)
+    ann = periods_per_year(union)
+
+    # Distinct signal arrays per asset: a column is added the first time its expression is met
+    columns: Dict[str, List[np.ndarray]] = {}
+    col_index: Dict[str, Dict[tuple, int]] = {}
+    masks: Dict[str, Dict[int, int]] = {}      # size column -> id of its (size > 0) mask
+    signatures: Dict[str, Dict[bytes, int]] = {}
+    caches: Dict[str, Dict[tuple, np.ndarray]] = {asset: {} for asset in frames}
+    for asset, df in frames.items():
+        if price_col not in df.columns:
+            raise KeyError(f"Price column '{price_col}' not in the frame of '{asset}'.")
+        columns[asset] = [
+            union.get_indexer(df.index).astype(np.float64),
+            df[price_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        ]
+        col_index[asset] = {}
+        masks[asset], signatures[asset] = {}, {}
+
+    rows = []
+    for combo in combos:
+        strategy = compile_strategy(with_parameters(strategy_yaml, combo), strict=strict)
+        keys = dict(zip(("side", "size", "exit"), _variant_keys(strategy)))
+        row = {
+            "max_duration": strategy.max_duration,
+            "stop_loss": strategy.stop_loss,
+            "take_profit": strategy.take_profit,
+            "columns": {},
+        }
+        for asset, df in frames.items():
+            index = col_index[asset]
+            if any(k is not None and (kind, k) not in index for kind, k in keys.items()):
+                signals = strategy.evaluate(df, cache=caches[asset])
+                for kind, k in keys.items():
+                    if k is not None and (kind, k) not in index:
+                        index[(kind, k)] = len(columns[asset])
+                        columns[asset].append(signals["exit_signal" if kind == "exit" else kind].astype(np.float64))
+            cols = tuple(index[(kind, keys[kind])] if keys[kind] is not None else -1 for kind in ("side", "size", "exit"))
+            if cols[1] not in masks[asset]:
+                signature = np.packbits(columns[asset][cols[1]] > 0).tobytes()
+                masks[asset][cols[1]] = signatures[asset].setdefault(signature, len(signatures[asset]))
+            row["columns"][asset] = cols + (masks[asset][cols[1]],)
+        rows.append(row)
+    del caches
+
+    shared: Dict[str, SharedMatrix] = {}
+    try:
+        for asset, cols in columns.items():
+            shared[asset] = SharedMatrix.create(np.column_stack(cols))
+        columns.clear()
+        matrices = {asset: (m.name, m.shape) for asset, m in shared.items()}
+
+        order = _chunks(rows, chunk_size)
+        chunks = [[rows[i] for i in chunk] for chunk in order]
+        workers = min(workers or os.cpu_count() or 1, len(chunks))
+        if workers <= 1:
+            parts = [_sweep_task(matrices, len(union), chunk, cost_bps, ann) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(
+                    _sweep_task,
+                    itertools.repeat(matrices), itertools.repeat(len(union)), chunks,
+                    itertools.repeat(cost_bps), itertools.repeat(ann),
+                ))
+        stats: List[Dict[str, float]] = [{}] * len(rows)
+        for chunk, part in zip(order, parts):
+            for i, row_stats in zip(chunk, part):
+                stats[i] = row_stats
+    finally:
+        for matrix in shared.values():
+            matrix.close()
+
+    results = pd.concat([pd.DataFrame(combos), pd.DataFrame(stats)], axis=1)
+    results, threshold = add_multiple_testing(results, len(union))
+    best = results.loc[results["dsr"].fillna(-1).idxmax()]
+    summary = {
+        "strategy": (strategy_yaml.get("strategy") or {}).get("name"),
+        "assets": list(frames),
+        "bars": int(len(union)),
+        "trials": int(len(results)),
+        "sharpe_threshold": float(threshold * math.sqrt(ann)),
+        "significant_share": float((results["dsr"] > 0.95).mean()),
+        "best": {k: (v.item() if hasattr(v, "item") else v) for k, v in best.items()},
+    }
+    return results, summary
@@ -0,0 +1,220 @@
+# ==========================================================
+#  QUANTREO — Benchmark harness for generated feature/alpha code
+# ==========================================================
+#  Loads each generated `.py` file, runs its function on synthetic frames of
+#  growing size and records wall time, peak memory and NaN ratio.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List
+import ast
+import gc
+import inspect
+import time
+import tracemalloc
+import types
+
+import numpy as np
+import pandas as pd
+
+from core.benchmark.synthetic import synthetic_feature_store, synthetic_ohlcv
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+
+# ----------------------------------------------------------
+# Loading generated code
+# ----------------------------------------------------------
+def load_function_from_source(code: str, name: str = "generated") -> Callable:
+    """
+    Execute generated source in a fresh module and return its entry point:
+    the last function defined in it whose first parameter is `df`.
+    """
+    module = types.ModuleType(f"_bench_{name}".replace("-", "_"))
+    exec(compile(code, f"<{name}>", "exec"), module.__dict__)
+
+    candidates = [
+        obj for obj in vars(module).values()
+        if inspect.isfunction(obj)
+        and obj.__module__ == module.__name__
+        and list(inspect.signature(obj).parameters)[:1] == ["df"]
+    ]
+    if not candidates:
+        raise ValueError(f"No function taking `df` found in {name}")
+    return max(candidates, key=lambda f: f.__code__.co_firstlineno)
+
+
+def load_function(path: Path) -> Callable:
+    """Load the entry point of a generated `.py` file."""
+    path = Path(path)
+    return load_function_from_source(path.read_text(encoding="utf-8"), path.stem)
+
+
+def required_columns(path: Path) -> List[str]:
+    """
+    Columns read by a generated function: the `required = {...}` set when
+    present, otherwise every `df['<name>']` literal subscript.
+    """
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "required" for t in node.targets)
+            and isinstance(node.value, ast.Set)
+        ):
+            return sorted(e.value for e in node.value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str))
+
+    cols = set()
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Subscript)
+            and isinstance(node.value, ast.Name) and node.value.id == "df"
+            and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)
+        ):
+            cols.add(node.slice.value)
+    return sorted(cols)
+
+
+# ----------------------------------------------------------
+# Measurements
+# ----------------------------------------------------------
+def _main_output(out: Any) -> Any:
+    # alpha functions return (alpha, condition): the alpha is what we score
+    return out[0] if isinstance(out, tuple) and out else out
+
+
+def nan_ratio(out: Any) -> float:
+    values = _main_output(out)
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        values = values.to_numpy()
+    values = np.asarray(values, dtype=np.float64)
+    return float(np.isnan(values).mean()) if values.size else 1.0
+
+
+def run_once(func: Callable, df: pd.DataFrame, memory: bool = True) -> Dict[str, Any]:
+    """
+    Time one call of `func(df)`; with memory=True, a second traced call
+    measures the peak memory allocated by the function.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    out = func(df)
+    wall = time.perf_counter() - start
+
+    peak_mb = None
+    if memory:
+        del out
+        gc.collect()
+        tracemalloc.start()
+        try:
+            out = func(df)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+
+    main = _main_output(out)
+    return {
+        "wall_s": wall,
+        "rows_per_s": len(df) / wall if wall > 0 else float("inf"),
+        "peak_mb": peak_mb,
+        "nan_ratio": nan_ratio(out),
+        "length_ok": hasattr(main, "__len__") and len(main) == len(df),
+    }
+
+
+def benchmark_function(
+    func: Callable,
+    frames: Dict[int, pd.DataFrame],
+    max_seconds: float = 60.0,
+    memory: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Run `func` on each frame (increasing size). A size is skipped when the
+    linear extrapolation of the previous run exceeds `max_seconds`.
+    """
+    rows, last = [], None
+    for n in sorted(frames):
+        if last is not None and last["wall_s"] * n / last["n_rows"] > max_seconds:
+            rows.append({"n_rows": n, "status": "skipped",
+                         "error": f"estimated {last['wall_s'] * n / last['n_rows']:.0f}s > {max_seconds:.0f}s"})
+            continue
+        try:
+            res = run_once(func, frames[n], memory=memory)
+            res.update({"n_rows": n, "status": "ok", "error": None})
+        except Exception as e:
+            res = {"n_rows": n, "status": "error", "error": f"{type(e).__name__}: {e}"}
+        rows.append(res)
+        if res["status"] != "ok":
+            break
+        last = res
+    return rows
+
+
+# ----------------------------------------------------------
+# Suites
+# ----------------------------------------------------------
+def feature_files(features_dir: Path) -> List[Path]:
+    return sorted(Path(features_dir).glob("*/feat_*_refined.py"))
+
+
+def alpha_files(code_dir: Path) -> List[Path]:
+    return sorted(Path(code_dir).glob("*.py"))
+
+
+def benchmark_files(
+    files: Iterable[Path],
+    kind: str,
+    sizes: Iterable[int] = DEFAULT_SIZES,
+    max_seconds: float = 60.0,
+    memory: bool = True,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Benchmark generated files of one kind ("feature": raw OHLCV input,
+    "alpha": synthetic feature store with every required column).
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (file, size): wall_s, rows_per_s, peak_mb, nan_ratio,
+        length_ok, status, error.
+    """
+    files = list(files)
+    sizes = sorted(set(int(n) for n in sizes))
+
+    if kind == "alpha":
+        columns = sorted({c for p in files for c in required_columns(p)})
+        frames = {n: synthetic_feature_store(columns, n, seed=seed) for n in sizes}
+    elif kind == "feature":
+        frames = {n: synthetic_ohlcv(n, seed=seed) for n in sizes}
+    else:
+        raise ValueError(f"Unknown kind '{kind}', expected 'feature' or 'alpha'.")
+
+    records = []
+    for path in files:
+        base = {"kind": kind, "file": str(path), "function": None}
+        try:
+            func = load_function(path)
+            base["function"] = func.__name__
+            rows = benchmark_function(func, frames, max_seconds=max_seconds, memory=memory)
+        except Exception as e:
+            rows = [{"n_rows": None, "status": "error", "error": f"{type(e).__name__}: {e}"}]
+        records.extend({**base, **row} for row in rows)
+
+    columns = ["kind", "file", "function", "n_rows", "status", "wall_s", "rows_per_s",
+               "peak_mb", "nan_ratio", "length_ok", "error"]
+    return pd.DataFrame.from_records(records).reindex(columns=columns)
+
+
+def slowest(report: pd.DataFrame, min_rows_per_s: float) -> pd.DataFrame:
+    """
+    Rows that disqualify a function: any error, skipped size or output of the
+    wrong length, and the throughput at the largest completed size when it is
+    below `min_rows_per_s` (small sizes are dominated by fixed overhead).
+    """
+    ok = report[report["status"] == "ok"]
+    largest = ok.loc[ok.groupby("file")["n_rows"].idxmax()] if not ok.empty else ok
+    too_slow = largest[largest["rows_per_s"] < min_rows_per_s]
+    broken = report[(report["status"] != "ok") | (report["length_ok"] == False)]  # noqa: E712
+    out = pd.concat([broken, too_slow])
+    return out[~out.index.duplicated()].sort_values(["kind", "file", "n_rows"])
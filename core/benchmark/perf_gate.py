@@ -0,0 +1,191 @@
+# ==========================================================
+#  QUANTREO — Performance gate for generated code
+# ==========================================================
+#  Static detection of row-wise constructs plus a runtime throughput check
+#  on a synthetic reference frame. Used by the feature chain to reject (or
+#  send back to the refiner) code that would be too slow in the feature store.
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+import ast
+
+import numpy as np
+import pandas as pd
+
+from core.benchmark.harness import load_function_from_source, run_once
+from core.benchmark.synthetic import synthetic_ohlcv
+
+# Reference frame size and minimum throughput of the runtime check
+REFERENCE_ROWS = 100_000
+MIN_ROWS_PER_S = 500_000.0
+
+_ROW_WISE_METHODS = {"iterrows", "itertuples", "applymap", "iteritems"}
+
+
+_FRAME_TYPES = ("DataFrame", "Series", "ndarray", "Index")
+# Attributes of a frame that are still one value per row
+_ROW_ATTRS = {"index", "values", "array", "iloc", "loc", "iat", "at", "T"}
+# Methods of a frame that iterate over its columns
+_COLUMN_METHODS = {"keys", "iteritems"}
+
+
+def _frame_params(func: ast.FunctionDef) -> Set[str]:
+    """Parameters annotated as a frame/Series/array, plus an unannotated first parameter (df, x)."""
+    args = func.args.posonlyargs + func.args.args + func.args.kwonlyargs
+    names = {a.arg for a in args if a.annotation is not None and any(t in ast.unparse(a.annotation) for t in _FRAME_TYPES)}
+    positional = func.args.posonlyargs + func.args.args
+    if positional and positional[0].annotation is None and positional[0].arg not in ("self", "cls"):
+        names.add(positional[0].arg)
+    return names
+
+
+def _is_rows(node: ast.AST, frames: Set[str], lengths: Set[str]) -> bool:
+    """True when iterating over `node` visits one element per row."""
+    if isinstance(node, ast.Name):
+        return node.id in frames
+    if isinstance(node, ast.Subscript):
+        return _is_rows(node.value, frames, lengths)
+    if isinstance(node, ast.Attribute):
+        return node.attr in _ROW_ATTRS and _is_rows(node.value, frames, lengths)
+    if isinstance(node, ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id in ("zip", "enumerate", "reversed", "sorted", "list", "tuple"):
+            return any(_is_rows(a, frames, lengths) for a in node.args)
+        if (isinstance(func, ast.Name) and func.id == "range") or (isinstance(func, ast.Attribute) and func.attr == "arange"):
+            return any(_is_length(n, frames, lengths) for a in node.args for n in ast.walk(a))
+        if isinstance(func, ast.Attribute):
+            if func.attr in _COLUMN_METHODS:
+                return False
+            if isinstance(func.value, ast.Name) and func.value.id in ("np", "numpy", "pd", "pandas"):
+                return any(_is_rows(a, frames, lengths) for a in node.args)
+            return _is_rows(func.value, frames, lengths)
+    return False
+
+
+def _is_length(node: ast.AST, frames: Set[str], lengths: Set[str]) -> bool:
+    """True for `len(<rows>)`, `<rows>.shape[...]`, `<rows>.size` or a name bound to one."""
+    if isinstance(node, ast.Name):
+        return node.id in lengths
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "len":
+        return bool(node.args) and _is_rows(node.args[0], frames, lengths)
+    if isinstance(node, ast.Attribute) and node.attr in ("shape", "size"):
+        return _is_rows(node.value, frames, lengths)
+    return False
+
+
+def _row_names(tree: ast.AST) -> Tuple[Set[str], Set[str]]:
+    """Names bound to a frame/Series/array, and names bound to its length."""
+    frames: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            frames |= _frame_params(node)
+    assigns = [
+        (t.id, node.value) for node in ast.walk(tree)
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None
+        for t in (node.targets if isinstance(node, ast.Assign) else [node.target])
+        if isinstance(t, ast.Name)
+    ]
+    lengths: Set[str] = set()
+    changed = True
+    while changed:
+        changed = False
+        for name, value in assigns:
+            if name not in frames and _is_rows(value, frames, lengths):
+                frames.add(name)
+                changed = True
+            if name not in lengths and any(_is_length(n, frames, lengths) for n in ast.walk(value)):
+                lengths.add(name)
+                changed = True
+    return frames, lengths
+
+
+def find_slow_constructs(code: str) -> List[str]:
+    """
+    List the row-wise constructs of a piece of code: `.apply(...)` with a
+    lambda or on a rolling/expanding/groupby object, `iterrows`/`itertuples`,
+    `.map(lambda ...)`, and Python loops or comprehensions over rows.
+
+    A loop or comprehension is only reported when it iterates over a frame,
+    Series, array or index (or `range(len(...))` of one), or when a `while`
+    condition depends on one. Loops over a list of columns or parameters are
+    cheap and left alone.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return [f"syntax error: {e.msg} (line {e.lineno})"]
+
+    frames, lengths = _row_names(tree)
+    issues = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            if _is_rows(node.iter, frames, lengths):
+                issues.append(f"Python for loop over rows (line {node.lineno})")
+        elif isinstance(node, ast.While):
+            if any(_is_rows(n, frames, lengths) or _is_length(n, frames, lengths) for n in ast.walk(node.test)):
+                issues.append(f"Python while loop over rows (line {node.lineno})")
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            if any(_is_rows(g.iter, frames, lengths) for g in node.generators):
+                issues.append(f"Python comprehension over rows (line {node.lineno})")
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            attr = node.func.attr
+            receiver = node.func.value
+            on_window = (
+                isinstance(receiver, ast.Call) and isinstance(receiver.func, ast.Attribute)
+                and receiver.func.attr in ("rolling", "expanding", "groupby", "resample", "ewm")
+            )
+            has_lambda = any(isinstance(a, ast.Lambda) for a in node.args)
+            if attr in _ROW_WISE_METHODS:
+                issues.append(f".{attr}() (line {node.lineno})")
+            elif attr == "apply" and (has_lambda or on_window):
+                what = f".{receiver.func.attr}(...)" if on_window else ""
+                issues.append(f"{what}.apply({'lambda' if has_lambda else '...'}) (line {node.lineno})")
+            elif attr == "map" and has_lambda:
+                issues.append(f".map(lambda) (line {node.lineno})")
+    return issues
+
+
+def same_output(reference: Any, candidate: Any, rtol: float = 1e-6) -> bool:
+    """True when two feature outputs have the same shape, values (rtol) and NaN positions."""
+    a = np.asarray(reference.to_numpy() if isinstance(reference, (pd.Series, pd.DataFrame)) else reference, dtype=np.float64)
+    b = np.asarray(candidate.to_numpy() if isinstance(candidate, (pd.Series, pd.DataFrame)) else candidate, dtype=np.float64)
+    return a.shape == b.shape and bool(np.allclose(a, b, rtol=rtol, atol=1e-12, equal_nan=True))
+
+
+def check_performance(
+    code: str,
+    n_rows: int = REFERENCE_ROWS,
+    min_rows_per_s: float = MIN_ROWS_PER_S,
+    df: Optional[pd.DataFrame] = None,
+) -> Dict[str, Any]:
+    """
+    Static + runtime check of a feature function.
+
+    Returns
+    -------
+    Dict[str, Any]
+        passed, static_issues, rows_per_s, wall_s, n_rows, error.
+        A function that fails to run is reported (error) but not rejected
+        here: correctness is not this gate's concern.
+    """
+    report: Dict[str, Any] = {
+        "passed": True,
+        "static_issues": find_slow_constructs(code),
+        "n_rows": n_rows,
+        "min_rows_per_s": min_rows_per_s,
+        "wall_s": None,
+        "rows_per_s": None,
+        "error": None,
+    }
+
+    df = synthetic_ohlcv(n_rows) if df is None else df
+    try:
+        func: Callable = load_function_from_source(code)
+        res = run_once(func, df, memory=False)
+        report.update({"wall_s": round(res["wall_s"], 4), "rows_per_s": round(res["rows_per_s"])})
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+
+    too_slow = report["rows_per_s"] is not None and report["rows_per_s"] < min_rows_per_s
+    report["passed"] = not report["static_issues"] and not too_slow
+    return report
@@ -0,0 +1,63 @@
+# ==========================================================
+#  QUANTREO — Synthetic market data for benchmarks
+# ==========================================================
+#  Same generator as notebooks/create_yaml_info.ipynb (geometric random
+#  walk with OHLC derived from the close), plus a synthetic feature store for
+#  alpha functions that read precomputed feature columns.
+from __future__ import annotations
+
+from typing import Iterable
+import numpy as np
+import pandas as pd
+
+# Feature columns whose real values are non-negative (volatilities, abs moves, ...)
+_POSITIVE_HINTS = ("vol", "abs_", "entropy", "tail_", "range", "volume")
+
+
+def synthetic_ohlcv(n: int, seed: int = 42, freq: str = "min") -> pd.DataFrame:
+    """
+    Synthetic OHLCV bars.
+
+    Parameters
+    ----------
+    n : int
+        Number of bars.
+    seed : int
+        Seed of the random generator.
+    freq : str
+        Bar frequency of the DatetimeIndex.
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns open, high, low, close, volume (no NaN).
+    """
+    rng = np.random.default_rng(seed)
+    close = np.cumprod(1 + rng.normal(0, 0.001, n + 1))
+    open_ = close[:-1]
+    close = close[1:]
+    high = np.maximum(open_, close) * (1 + rng.random(n) * 0.002)
+    low = np.minimum(open_, close) * (1 - rng.random(n) * 0.002)
+    volume = rng.lognormal(mean=8.0, sigma=0.5, size=n).round()
+
+    index = pd.date_range("2020-01-01", periods=n, freq=freq)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=index,
+    )
+
+
+def synthetic_feature_store(columns: Iterable[str], n: int, seed: int = 42, freq: str = "min") -> pd.DataFrame:
+    """
+    Synthetic feature store: one persistent AR(1) series per requested column
+    (made positive for volatility-like names), plus the OHLCV columns.
+    """
+    df = synthetic_ohlcv(n, seed=seed, freq=freq)
+    rng = np.random.default_rng(seed + 1)
+    for col in sorted(set(columns) - set(df.columns)):
+        shocks = rng.normal(0, 1, n)
+        x = pd.Series(shocks).ewm(alpha=0.02, adjust=False).mean().to_numpy()
+        if any(h in col for h in _POSITIVE_HINTS):
+            x = 0.01 * np.exp(x)
+        df[col] = x
+    return df
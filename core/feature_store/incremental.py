@@ -0,0 +1,245 @@
+# ==========================================================
+#  QUANTREO — Incremental feature materialization
+# ==========================================================
+#  Drives the generated feature functions (outputs/features/*/feat_*_refined.py)
+#  over new bars only: each feature keeps a warm-up state (its trailing
+#  `lookback` input rows) next to the store, the function is run on
+#  warm-up + new bars and only the rows of the new bars are appended.
+#  A refresh costs O(lookback + new bars), not O(history).
+#
+#  Layout:
+#      <store>/_state/asset=<ASSET>/<feature>.parquet   (trailing input rows)
+#      <store>/_state/asset=<ASSET>/<feature>.yaml      (lookback, last bar, ...)
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from core.benchmark.harness import load_function, required_columns
+from core.benchmark.perf_gate import same_output
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir, load_yaml, save_yaml
+
+# Integer parameters read as rolling window lengths when inferring the lookback
+_WINDOW_HINTS = ("window", "period", "lookback", "span", "length", "horizon", "lag")
+
+# Rows compared between a full and a warm-up run when validating a lookback
+CHECK_ROWS = 50
+
+
+# ----------------------------------------------------------
+# Feature specs
+# ----------------------------------------------------------
+def infer_lookback(func: Callable, params: Optional[Dict[str, Any]] = None, pad: int = 1) -> int:
+    """
+    Warm-up rows a feature needs: the largest window-like integer among the
+    function defaults and the idea parameters, plus `pad` (diff/shift).
+    """
+    values = {
+        name: p.default for name, p in inspect.signature(func).parameters.items()
+        if p.default is not inspect.Parameter.empty
+    }
+    values.update(params or {})
+    windows = [
+        int(v) for k, v in values.items()
+        if isinstance(v, int) and not isinstance(v, bool) and v > 0
+        and any(h in k.lower() for h in _WINDOW_HINTS)
+    ]
+    return max(windows, default=0) + pad
+
+
+def load_feature(feature_dir: Path) -> Dict[str, Any]:
+    """
+    Load a generated feature folder as a spec: name (output column), func,
+    inputs (columns read), lookback and source file.
+    """
+    feature_dir = Path(feature_dir)
+    code_path = next(iter(sorted(feature_dir.glob("feat_*_refined.py"))), None)
+    if code_path is None:
+        raise FileNotFoundError(f"No feat_*_refined.py in {feature_dir}")
+
+    func = load_function(code_path)
+    idea_path = code_path.with_name(code_path.name.replace("_refined.py", ".yml"))
+    idea = load_yaml(idea_path) if idea_path.exists() else {}
+    name = ((idea or {}).get("output") or {}).get("name") or func.__name__
+
+    # Columns come from the df[...] literals, or the string defaults of *_col parameters
+    inputs = required_columns(code_path)
+    if not inputs:
+        inputs = sorted({
+            p.default for k, p in inspect.signature(func).parameters.items()
+            if k.endswith("_col") and isinstance(p.default, str)
+        })
+
+    return {
+        "name": name,
+        "func": func,
+        "inputs": inputs,
+        "lookback": infer_lookback(func, (idea or {}).get("parameters")),
+        "source": str(code_path),
+    }
+
+
+def feature_dirs(features_dir: Path) -> List[Path]:
+    return sorted(p.parent for p in Path(features_dir).glob("*/feat_*_refined.py"))
+
+
+# ----------------------------------------------------------
+# Evaluation helpers
+# ----------------------------------------------------------
+def _as_series(out: Any, index: pd.Index, name: str) -> pd.Series:
+    if isinstance(out, pd.DataFrame):
+        if out.shape[1] != 1:
+            raise ValueError(f"{name}: expected one output column, got {out.shape[1]}")
+        out = out.iloc[:, 0]
+    values = out.to_numpy() if isinstance(out, pd.Series) else np.asarray(out)
+    if values.ndim != 1 or len(values) != len(index):
+        raise ValueError(f"{name}: output length {len(values)} differs from the input ({len(index)} rows)")
+    return pd.Series(values.astype(np.float64, copy=False), index=index, name=name)
+
+
+def compute(spec: Dict[str, Any], bars: pd.DataFrame) -> pd.Series:
+    """Run a feature on `bars`, as a float Series aligned on the bar index."""
+    missing = set(spec["inputs"]) - set(bars.columns)
+    if missing:
+        raise KeyError(f"{spec['name']}: missing input columns {sorted(missing)}")
+    return _as_series(spec["func"](bars), bars.index, spec["name"])
+
+
+def validate_lookback(
+    spec: Dict[str, Any],
+    bars: pd.DataFrame,
+    full: Optional[pd.Series] = None,
+    n_check: int = CHECK_ROWS,
+    max_doublings: int = 4,
+) -> Optional[int]:
+    """
+    Smallest lookback (starting from the inferred one, doubled on failure)
+    whose warm-up run reproduces the full-history values of the last
+    `n_check` bars. None when no tried lookback does: the feature depends on
+    the whole history (e.g. global quantiles) and cannot be updated incrementally.
+    """
+    full = compute(spec, bars) if full is None else full
+    lookback = max(spec["lookback"], 1)
+    for _ in range(max_doublings + 1):
+        if lookback + n_check > len(bars):
+            return None
+        tail = bars.iloc[-(lookback + n_check):]
+        if same_output(full.iloc[-n_check:], compute(spec, tail).iloc[-n_check:]):
+            return lookback
+        lookback *= 2
+    return None
+
+
+# ----------------------------------------------------------
+# Materializer
+# ----------------------------------------------------------
+class IncrementalMaterializer:
+    """
+    Keep the feature columns of a `FeatureStore` up to date bar by bar.
+
+    Parameters
+    ----------
+    store : FeatureStore
+        Destination store; warm-up states live in `<store>/_state`.
+    specs : List[Dict[str, Any]]
+        Feature specs from `load_feature`.
+    """
+
+    def __init__(self, store: FeatureStore, specs: List[Dict[str, Any]]):
+        self.store = store
+        self.specs = specs
+
+    # ------------------------------------------------------------------
+    def _state_paths(self, asset: str, name: str):
+        base = self.store.root / "_state" / f"asset={asset}"
+        return base / f"{name}.parquet", base / f"{name}.yaml"
+
+    def load_state(self, asset: str, name: str):
+        tail_path, meta_path = self._state_paths(asset, name)
+        if not meta_path.exists():
+            return None, None
+        tail = pd.read_parquet(tail_path) if tail_path.exists() else None
+        return load_yaml(meta_path), tail
+
+    def save_state(self, asset: str, name: str, meta: Dict[str, Any], tail: Optional[pd.DataFrame]) -> None:
+        tail_path, meta_path = self._state_paths(asset, name)
+        ensure_dir(tail_path.parent)
+        if tail is not None:
+            tail.to_parquet(tail_path)
+        save_yaml(meta, meta_path)
+
+    # ------------------------------------------------------------------
+    def _full(self, asset: str, spec: Dict[str, Any], bars: pd.DataFrame) -> Dict[str, Any]:
+        values = compute(spec, bars)
+        self.store.write(asset, values.to_frame(), mode="append")
+
+        lookback = validate_lookback(spec, bars, full=values)
+        meta = {
+            "source": spec["source"],
+            "inputs": spec["inputs"],
+            "incremental": lookback is not None,
+            "lookback": lookback,
+            "last_bar": str(bars.index[-1]),
+            "rows": len(bars),
+        }
+        tail = bars[spec["inputs"]].iloc[-lookback:] if lookback else None
+        self.save_state(asset, spec["name"], meta, tail)
+        return {"mode": "full", "computed_rows": len(bars), "new_rows": len(bars), **meta}
+
+    def update_feature(self, asset: str, spec: Dict[str, Any], bars: pd.DataFrame, full: bool = False) -> Dict[str, Any]:
+        """
+        Materialize one feature for new bars.
+
+        Without a state (or with full=True) `bars` is taken as the whole
+        history. Otherwise only the bars after the last materialized one are
+        computed, on top of the stored warm-up rows. Features that depend on
+        the whole history are left untouched ("stale") until a full run.
+        """
+        meta, tail = self.load_state(asset, spec["name"])
+        if full or meta is None:
+            return self._full(asset, spec, bars)
+        if not meta["incremental"]:
+            return {"mode": "stale", "computed_rows": 0, "new_rows": 0, **meta}
+
+        new = bars[bars.index > pd.Timestamp(meta["last_bar"])]
+        if new.empty:
+            return {"mode": "incremental", "computed_rows": 0, "new_rows": 0, **meta}
+
+        window = pd.concat([tail, new[spec["inputs"]]])
+        values = compute(spec, window).iloc[len(tail):]
+        self.store.write(asset, values.to_frame(), mode="append")
+
+        meta.update({"last_bar": str(new.index[-1]), "rows": meta["rows"] + len(new)})
+        self.save_state(asset, spec["name"], meta, window.iloc[-meta["lookback"]:])
+        return {"mode": "incremental", "computed_rows": len(window), "new_rows": len(new), **meta}
+
+    def update(self, asset: str, bars: pd.DataFrame, full: bool = False) -> pd.DataFrame:
+        """
+        Materialize every feature of the materializer for one asset.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per feature: mode, new_rows, computed_rows, lookback,
+            incremental, last_bar, error.
+        """
+        if not isinstance(bars.index, pd.DatetimeIndex):
+            raise TypeError("Bars must be indexed by a DatetimeIndex.")
+        bars = bars.sort_index()
+
+        records = []
+        for spec in self.specs:
+            try:
+                res = self.update_feature(asset, spec, bars, full=full)
+                res["error"] = None
+            except Exception as e:
+                res = {"mode": "error", "error": f"{type(e).__name__}: {e}"}
+            records.append({"feature": spec["name"], **res})
+
+        columns = ["feature", "mode", "new_rows", "computed_rows", "lookback", "incremental", "last_bar", "error"]
+        return pd.DataFrame.from_records(records).reindex(columns=columns)
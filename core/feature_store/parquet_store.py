@@ -0,0 +1,260 @@
+# ==========================================================
+#  QUANTREO — Columnar feature store (Parquet, partitioned)
+# ==========================================================
+#  Layout (hive partitioning):
+#      <root>/_store.yaml
+#      <root>/asset=<ASSET>/_schema.arrow          (union of the partition schemas)
+#      <root>/asset=<ASSET>/date=<PERIOD>/part-0.parquet
+#  One row per bar, one column per feature, the bar time in `timestamp`.
+#  Reads only open the partitions overlapping [start, end] and only decode
+#  the requested columns.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from core.utils.io import ensure_dir, load_yaml, save_yaml
+
+TIME_COLUMN = "timestamp"
+
+# partition granularity -> strftime format of the `date` partition value
+PARTITION_FORMATS = {"D": "%Y-%m-%d", "M": "%Y-%m", "Y": "%Y"}
+
+TimeLike = Union[str, pd.Timestamp, None]
+
+
+def _align_tz(ts: pd.Timestamp, tz: Optional[str]) -> pd.Timestamp:
+    """Express a time bound in the time zone of the stored timestamps (None: naive)."""
+    if tz is None:
+        return ts if ts.tzinfo is None else ts.tz_convert("UTC").tz_localize(None)
+    return ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+
+
+class FeatureStore:
+    """
+    Persisted feature store partitioned by asset and date.
+
+    Parameters
+    ----------
+    root : Path
+        Store directory (created if needed).
+    partition : str
+        Date partition granularity: "D" (day), "M" (month) or "Y" (year).
+        Fixed at creation time; an existing store keeps its own setting.
+    """
+
+    def __init__(self, root: Path, partition: str = "D"):
+        self.root = Path(root)
+        meta_path = self.root / "_store.yaml"
+        if meta_path.exists():
+            partition = load_yaml(meta_path).get("partition", partition)
+        if partition not in PARTITION_FORMATS:
+            raise ValueError(f"partition must be one of {sorted(PARTITION_FORMATS)}, got {partition!r}.")
+        self.partition = partition
+        self.date_format = PARTITION_FORMATS[partition]
+        if not meta_path.exists():
+            ensure_dir(self.root)
+            save_yaml({"partition": partition, "time_column": TIME_COLUMN}, meta_path)
+
+    # ------------------------------------------------------------------
+    # Layout
+    # ------------------------------------------------------------------
+    def asset_dir(self, asset: str) -> Path:
+        return self.root / f"asset={asset}"
+
+    def partition_dir(self, asset: str, period: str) -> Path:
+        return self.asset_dir(asset) / f"date={period}"
+
+    def assets(self) -> List[str]:
+        return sorted(p.name.split("=", 1)[1] for p in self.root.glob("asset=*") if p.is_dir())
+
+    def partitions(self, asset: str) -> List[str]:
+        return sorted(p.name.split("=", 1)[1] for p in self.asset_dir(asset).glob("date=*") if p.is_dir())
+
+    def schema(self, asset: str) -> Optional[pa.Schema]:
+        """Schema of an asset across all partitions (columns added later included)."""
+        path = self.asset_dir(asset) / "_schema.arrow"
+        if not path.exists():
+            return None
+        return pa.ipc.read_schema(pa.py_buffer(path.read_bytes()))
+
+    def _update_schema(self, asset: str, table_schema: pa.Schema) -> None:
+        current = self.schema(asset)
+        merged = table_schema if current is None else pa.unify_schemas([current, table_schema])
+        if current is None or not merged.equals(current):
+            path = self.asset_dir(asset) / "_schema.arrow"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_bytes(merged.remove_metadata().serialize().to_pybytes())
+            tmp.replace(path)
+
+    def columns(self, asset: str) -> List[str]:
+        """Feature columns of an asset."""
+        schema = self.schema(asset)
+        return [] if schema is None else [c for c in schema.names if c != TIME_COLUMN]
+
+    # ------------------------------------------------------------------
+    # Write
+    # ------------------------------------------------------------------
+    def _period_keys(self, index: pd.DatetimeIndex) -> pd.Index:
+        return pd.Index(index.strftime(self.date_format))
+
+    def _write_partition(self, frame: pd.DataFrame, asset: str, period: str) -> None:
+        out_dir = self.partition_dir(asset, period)
+        ensure_dir(out_dir)
+        table = pa.Table.from_pandas(frame.rename_axis(TIME_COLUMN).reset_index(), preserve_index=False)
+        tmp = out_dir / "part-0.parquet.tmp"
+        pq.write_table(table, tmp)
+        tmp.replace(out_dir / "part-0.parquet")
+        self._update_schema(asset, table.schema)
+
+    def _read_partition(self, asset: str, period: str) -> Optional[pd.DataFrame]:
+        path = self.partition_dir(asset, period) / "part-0.parquet"
+        if not path.exists():
+            return None
+        return pq.read_table(path).to_pandas().set_index(TIME_COLUMN)
+
+    def write(self, asset: str, df: pd.DataFrame, mode: str = "append") -> List[str]:
+        """
+        Write feature rows of one asset.
+
+        mode="append" merges with the existing partitions: on rows/columns
+        already stored the new values win, NaN included (a recomputation can
+        clear a stale value); new rows and new columns are added, and stored
+        columns absent from `df` keep their values.
+        mode="overwrite" replaces the touched partitions. Returns the written partitions.
+        """
+        if mode not in ("append", "overwrite"):
+            raise ValueError(f"mode must be 'append' or 'overwrite', got {mode!r}.")
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise TypeError("Feature frames must be indexed by a DatetimeIndex.")
+        if df.empty:
+            return []
+
+        df = df.sort_index()
+        written = []
+        for period, frame in df.groupby(self._period_keys(df.index), sort=True):
+            if mode == "append":
+                old = self._read_partition(asset, period)
+                if old is not None:
+                    order = list(old.columns) + [c for c in frame.columns if c not in old.columns]
+                    # Rows of `frame` replace the stored ones on its columns (NaN included)
+                    other = [c for c in old.columns if c not in frame.columns]
+                    updated = pd.concat([old.reindex(index=frame.index, columns=other), frame], axis=1)
+                    frame = pd.concat([old.drop(index=frame.index, errors="ignore"), updated]).sort_index()[order]
+            self._write_partition(frame, asset, period)
+            written.append(period)
+        return written
+
+    def delete(self, asset: str) -> None:
+        for part in self.partitions(asset):
+            d = self.partition_dir(asset, part)
+            for f in d.iterdir():
+                f.unlink()
+            d.rmdir()
+        schema_path = self.asset_dir(asset) / "_schema.arrow"
+        if schema_path.exists():
+            schema_path.unlink()
+        if self.asset_dir(asset).exists():
+            self.asset_dir(asset).rmdir()
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    def _dataset(self, asset: str) -> ds.Dataset:
+        # Partitions written before a column existed read it as nulls
+        return ds.dataset(
+            self.asset_dir(asset),
+            schema=self.schema(asset).append(pa.field("date", pa.string())),
+            format="parquet",
+            partitioning=ds.partitioning(pa.schema([("date", pa.string())]), flavor="hive"),
+        )
+
+    def read(
+        self,
+        asset: str,
+        columns: Optional[Iterable[str]] = None,
+        start: TimeLike = None,
+        end: TimeLike = None,
+    ) -> pd.DataFrame:
+        """
+        Read the features of one asset, indexed by timestamp.
+
+        Parameters
+        ----------
+        asset : str
+            Asset name (e.g. "6E").
+        columns : Iterable[str], optional
+            Columns to load (projection). None loads every column.
+        start, end : str or pd.Timestamp, optional
+            Inclusive time bounds. Partitions outside the range are not opened.
+            Naive bounds are read in the time zone of the stored timestamps,
+            aware bounds are converted to it.
+        """
+        if not self.asset_dir(asset).exists():
+            raise KeyError(f"Asset '{asset}' not found in feature store {self.root}")
+
+        dataset = self._dataset(asset)
+        if columns is not None:
+            columns = list(dict.fromkeys(columns))
+            missing = set(columns) - set(dataset.schema.names)
+            if missing:
+                raise KeyError(f"Columns not in feature store for '{asset}': {sorted(missing)}")
+
+        # Bounds follow the time zone of the stored timestamps (naive vs aware
+        # comparisons are rejected by Arrow), so the partition dates match too
+        tz = getattr(dataset.schema.field(TIME_COLUMN).type, "tz", None)
+        filt = None
+        if start is not None:
+            start = _align_tz(pd.Timestamp(start), tz)
+            filt = (ds.field("date") >= start.strftime(self.date_format)) & (ds.field(TIME_COLUMN) >= start)
+        if end is not None:
+            end = _align_tz(pd.Timestamp(end), tz)
+            cond = (ds.field("date") <= end.strftime(self.date_format)) & (ds.field(TIME_COLUMN) <= end)
+            filt = cond if filt is None else filt & cond
+
+        load = None if columns is None else [TIME_COLUMN] + columns
+        table = dataset.to_table(columns=load, filter=filt)
+        df = table.to_pandas().set_index(TIME_COLUMN).sort_index()
+        return df.drop(columns=["date"], errors="ignore")
+
+    def read_partition(self, asset: str, period: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """One date partition, with `columns` (NaN where the partition predates them)."""
+        path = self.partition_dir(asset, period) / "part-0.parquet"
+        if not path.exists():
+            raise KeyError(f"Partition '{period}' of '{asset}' not found in feature store {self.root}")
+        if columns is None:
+            return pq.read_table(path).to_pandas().set_index(TIME_COLUMN)
+        columns = list(columns)
+        stored = set(pq.read_schema(path).names)
+        table = pq.read_table(path, columns=[TIME_COLUMN] + [c for c in columns if c in stored])
+        return table.to_pandas().set_index(TIME_COLUMN).reindex(columns=columns)
+
+    def read_tail(self, asset: str, n_rows: int, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Last `n_rows` bars of an asset, opening the newest partitions only."""
+        columns = self.columns(asset) if columns is None else list(columns)
+        parts, rows = [], 0
+        for period in reversed(self.partitions(asset)):
+            if rows >= n_rows:
+                break
+            frame = self.read_partition(asset, period, columns)
+            parts.append(frame)
+            rows += len(frame)
+        if not parts:
+            raise KeyError(f"Asset '{asset}' not found in feature store {self.root}")
+        return pd.concat(parts[::-1]).sort_index().iloc[-n_rows:]
+
+    def read_many(
+        self,
+        assets: Optional[Iterable[str]] = None,
+        columns: Optional[Iterable[str]] = None,
+        start: TimeLike = None,
+        end: TimeLike = None,
+    ) -> Dict[str, pd.DataFrame]:
+        """`read` for several assets (all by default), keyed by asset."""
+        assets = self.assets() if assets is None else list(assets)
+        return {a: self.read(a, columns=columns, start=start, end=end) for a in assets}
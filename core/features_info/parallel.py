@@ -0,0 +1,139 @@
+# ==========================================================
+#  QUANTREO — Parallel relations (process pool + shared memory)
+# ==========================================================
+#  Each asset's feature/target matrix is copied once into a shared memory
+#  block; the (asset, target) tasks of a ProcessPoolExecutor attach to it
+#  by name instead of receiving pickled DataFrames, and only return the
+#  per-feature statistics. Results are merged in the input order of the
+#  assets and targets, so the YAMLs do not depend on completion order.
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+import numpy as np
+import pandas as pd
+
+from core.features_info.relations import (
+    CORR_WINDOW,
+    MI_BINS,
+    MI_STEP,
+    MI_WINDOW,
+    N_OBS,
+    assemble,
+    default_comment,
+    encode_regimes,
+    prepare_frames,
+    regime_stats,
+)
+
+
+class SharedMatrix:
+    """
+    A float64 (rows x columns) matrix in a named shared memory block.
+
+    The owner creates it from an array and unlinks it with `close()`;
+    workers re-attach with `SharedMatrix.attach(name, shape)`.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: Tuple[int, int], owner: bool):
+        self.shm = shm
+        self.shape = shape
+        self.owner = owner
+        self.array = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, values: np.ndarray) -> "SharedMatrix":
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        matrix = cls(shm, values.shape, owner=True)
+        matrix.array[:] = values
+        return matrix
+
+    @classmethod
+    def attach(cls, name: str, shape: Tuple[int, int]) -> "SharedMatrix":
+        # pool workers share the parent's resource tracker: the block is unlinked once, by its owner
+        return cls(shared_memory.SharedMemory(name=name), shape, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        del self.array
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _task(
+    name: str,
+    shape: Tuple[int, int],
+    n_features: int,
+    target_col: int,
+    regimes: Optional[List[Any]],
+    params: Dict[str, Any],
+) -> Dict[Any, Dict[str, np.ndarray]]:
+    # Layout of the shared matrix: [features | targets | regime code (optional)]
+    matrix = SharedMatrix.attach(name, shape)
+    try:
+        data = matrix.array
+        codes = data[:, -1].astype(np.int64) if regimes is not None else None
+        return regime_stats(data[:, :n_features], data[:, target_col], codes, regimes, **params)
+    finally:
+        matrix.close()
+
+
+def compute_relations_parallel(
+    frames: Dict[str, pd.DataFrame],
+    targets: List[str],
+    features: Optional[List[str]] = None,
+    regime_col: Optional[str] = None,
+    top: Optional[int] = None,
+    workers: Optional[int] = None,
+    n_obs: int = N_OBS,
+    corr_window: int = CORR_WINDOW,
+    mi_window: int = MI_WINDOW,
+    mi_step: int = MI_STEP,
+    bins: int = MI_BINS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Same result as `compute_relations`, with the (asset, target) grid
+    spread over `workers` processes (default: one per CPU, at most one per task).
+    """
+    params = dict(n_obs=n_obs, corr_window=corr_window, mi_window=mi_window, mi_step=mi_step, bins=bins)
+    frames, features = prepare_frames(frames, targets, features, regime_col)
+    n_feat = len(features)
+
+    shared: Dict[str, SharedMatrix] = {}
+    regimes: Dict[str, Optional[List[Any]]] = {}
+    try:
+        for asset, df in frames.items():
+            blocks = [df[features + targets].to_numpy(dtype=np.float64, na_value=np.nan)]
+            regimes[asset] = None
+            if regime_col:
+                codes, regimes[asset] = encode_regimes(df[regime_col])
+                blocks.append(codes.astype(np.float64)[:, None])
+            shared[asset] = SharedMatrix.create(np.hstack(blocks))
+
+        tasks = [(asset, t) for asset in frames for t in range(len(targets))]
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        args = [
+            (shared[a].name, shared[a].shape, n_feat, n_feat + t, regimes[a], params)
+            for a, t in tasks
+        ]
+
+        if workers <= 1:
+            results = [_task(*a) for a in args]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_task, *zip(*args)))
+    finally:
+        for matrix in shared.values():
+            matrix.close()
+
+    stats: Dict[str, Dict[str, Dict[Any, Dict[str, np.ndarray]]]] = {asset: {} for asset in frames}
+    for (asset, t), res in zip(tasks, results):
+        stats[asset][targets[t]] = res
+    return assemble(stats, targets, features, top=top, comment=default_comment(n_obs, corr_window, mi_window, bins))
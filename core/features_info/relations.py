@@ -0,0 +1,445 @@
+# ==========================================================
+#  QUANTREO — Feature/target relations engine (raw_info YAMLs)
+# ==========================================================
+#  Computes, for every feature x target x asset, over the last `n_obs`
+#  observations where the target is known:
+#    - rolling correlation (window `corr_window`): mean, std, zero crossings
+#    - binned mutual information on sliding windows: mean, std
+#  All features of an asset are processed at once as (rows x features)
+#  arrays, and the result is rendered in the raw_info YAML schema read by
+#  the FeatureDSRObserver.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import json
+import re
+import warnings
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from core.utils.io import save_text
+
+N_OBS = 1000
+CORR_WINDOW = 100
+MI_WINDOW = 200
+MI_STEP = 50
+MI_BINS = 8
+
+TARGET_PREFIX = "future_"
+
+
+# ----------------------------------------------------------
+# Targets
+# ----------------------------------------------------------
+def target_base(target: str) -> Tuple[str, int]:
+    """`future_<base>_<h>` -> (`<base>_<h>`, h): the column the target is read from, h bars later."""
+    base = target[len(TARGET_PREFIX):] if target.startswith(TARGET_PREFIX) else ""
+    match = re.search(r"_(\d+)$", base)
+    if match is None:
+        raise KeyError(f"Cannot build target '{target}': expected '{TARGET_PREFIX}<column>_<horizon>'.")
+    return base, int(match.group(1))
+
+
+def add_targets(df: pd.DataFrame, targets: Iterable[str]) -> pd.DataFrame:
+    """
+    Add the missing `future_<base>_<h>` targets as `<base>_<h>` shifted by -h
+    (the value known h bars later). Targets already in `df` are kept.
+    """
+    out = {}
+    for target in targets:
+        if target in df.columns:
+            continue
+        base, horizon = target_base(target)
+        if base not in df.columns:
+            raise KeyError(f"Cannot build target '{target}': column '{base}' not found.")
+        out[target] = df[base].shift(-horizon)
+    return df.assign(**out) if out else df
+
+
+def default_features(df: pd.DataFrame, targets: Iterable[str]) -> List[str]:
+    """Numeric columns that are neither targets nor future-looking."""
+    targets = set(targets)
+    return [
+        c for c in df.columns
+        if c not in targets and not str(c).startswith(TARGET_PREFIX) and pd.api.types.is_numeric_dtype(df[c])
+    ]
+
+
+# ----------------------------------------------------------
+# Batched statistics (rows x features)
+# ----------------------------------------------------------
+def rolling_corr(X: np.ndarray, y: np.ndarray, window: int) -> np.ndarray:
+    """
+    Rolling Pearson correlation of every column of X with y.
+
+    Returns an array of shape (len(y) - window + 1, n_features); a window
+    containing a NaN (or a flat series) yields NaN.
+    """
+    T = len(y)
+    if T < window:
+        return np.full((0, X.shape[1]), np.nan)
+
+    nan = np.isnan(X) | np.isnan(y)[:, None]
+    # centring keeps the cumsum differences well conditioned
+    xc = np.where(nan, 0.0, X - np.nanmean(np.where(nan, np.nan, X), axis=0))
+    yc = np.where(nan, 0.0, (y - np.nanmean(y))[:, None])
+
+    def window_sum(a: np.ndarray) -> np.ndarray:
+        c = np.concatenate((np.zeros((1, a.shape[1])), np.cumsum(a, axis=0)))
+        return c[window:] - c[:-window]
+
+    sx, sy = window_sum(xc), window_sum(yc)
+    sxx, syy, sxy = window_sum(xc * xc), window_sum(yc * yc), window_sum(xc * yc)
+    bad = window_sum(nan.astype(np.float64)) > 0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / window
+        var_x = np.maximum(sxx - sx * sx / window, 0.0)
+        var_y = np.maximum(syy - sy * sy / window, 0.0)
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[bad | ~np.isfinite(corr)] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def zero_crossings(corr: np.ndarray) -> np.ndarray:
+    """Sign changes of each column, ignoring NaN and exact zeros."""
+    signs = pd.DataFrame(np.sign(corr)).replace(0.0, np.nan).ffill()
+    prev = signs.shift(1)
+    return ((signs != prev) & signs.notna() & prev.notna()).sum(axis=0).to_numpy()
+
+
+def quantile_bins(a: np.ndarray, bins: int) -> np.ndarray:
+    """Equal-frequency bin codes per column (0..bins-1), -1 for NaN."""
+    pct = pd.DataFrame(a).rank(pct=True, method="average").to_numpy()
+    codes = np.ceil(pct * bins) - 1
+    return np.where(np.isnan(codes), -1, np.clip(codes, 0, bins - 1)).astype(np.int64)
+
+
+def _one_hot(codes: np.ndarray, bins: int) -> np.ndarray:
+    T, F = codes.shape
+    out = np.zeros((T, F * bins))
+    rows, cols = np.nonzero(codes >= 0)
+    out[rows, cols * bins + codes[rows, cols]] = 1.0
+    return out
+
+
+def _entropy(p: np.ndarray, axis) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -np.nansum(np.where(p > 0, p * np.log(p), 0.0), axis=axis)
+
+
+def binned_mutual_info(
+    X: np.ndarray,
+    y: np.ndarray,
+    window: int = MI_WINDOW,
+    step: int = MI_STEP,
+    bins: int = MI_BINS,
+) -> np.ndarray:
+    """
+    Normalized mutual information MI / sqrt(H(x) H(y)) (in [0, 1]) of every
+    column of X with y, on windows of `window` rows every `step` rows.
+    Variables are cut into `bins` equal-frequency bins; the joint histograms
+    of all features are one matrix product per window.
+
+    Returns an array of shape (n_windows, n_features).
+    """
+    T, F = X.shape
+    starts = list(range(0, T - window + 1, step))
+    if not starts:
+        return np.full((0, F), np.nan)
+
+    ox = _one_hot(quantile_bins(X, bins), bins)
+    oy = _one_hot(quantile_bins(y[:, None], bins), bins)
+
+    out = np.full((len(starts), F), np.nan)
+    for w, s in enumerate(starts):
+        joint = (ox[s:s + window].T @ oy[s:s + window]).reshape(F, bins, bins)
+        n = joint.sum(axis=(1, 2))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = joint / n[:, None, None]
+            hx = _entropy(p.sum(axis=2), axis=1)
+            hy = _entropy(p.sum(axis=1), axis=1)
+            hxy = _entropy(p.reshape(F, -1), axis=1)
+            nmi = (hx + hy - hxy) / np.sqrt(hx * hy)
+        nmi[(n < window // 2) | ~np.isfinite(nmi)] = np.nan
+        out[w] = np.clip(nmi, 0.0, 1.0)
+    return out
+
+
+def relation_stats(
+    X: np.ndarray,
+    y: np.ndarray,
+    n_obs: int = N_OBS,
+    corr_window: int = CORR_WINDOW,
+    mi_window: int = MI_WINDOW,
+    mi_step: int = MI_STEP,
+    bins: int = MI_BINS,
+) -> Dict[str, np.ndarray]:
+    """
+    Relation statistics of every column of X with y over the last `n_obs`
+    rows where y is known (the correlation windows reach `corr_window - 1`
+    rows further back).
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        corr_mean, corr_std, crossings, mi_mean, mi_std (one value per feature).
+    """
+    known = np.flatnonzero(~np.isnan(y))
+    F = X.shape[1]
+    if known.size == 0:
+        nan = np.full(F, np.nan)
+        return {"corr_mean": nan, "corr_std": nan, "crossings": np.zeros(F, int), "mi_mean": nan, "mi_std": nan}
+
+    end = known[-1] + 1
+    lo = max(0, end - n_obs - corr_window + 1)
+    corr = rolling_corr(X[lo:end], y[lo:end], corr_window)
+    mi = binned_mutual_info(X[max(0, end - n_obs):end], y[max(0, end - n_obs):end], mi_window, mi_step, bins)
+
+    with warnings.catch_warnings():
+        # all-NaN columns legitimately produce NaN statistics
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return {
+            "corr_mean": np.nanmean(corr, axis=0),
+            "corr_std": np.nanstd(corr, axis=0, ddof=1),
+            "crossings": zero_crossings(corr),
+            "mi_mean": np.nanmean(mi, axis=0),
+            "mi_std": np.nanstd(mi, axis=0, ddof=1),
+        }
+
+
+# ----------------------------------------------------------
+# Feature x target x asset grid
+# ----------------------------------------------------------
+def encode_regimes(labels: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """Integer regime codes (sorted labels, -1 for missing) and the label of each code."""
+    codes, uniques = pd.factorize(labels, sort=True)
+    return codes, list(uniques)
+
+
+def regime_stats(
+    X: np.ndarray,
+    y: np.ndarray,
+    codes: Optional[np.ndarray] = None,
+    labels: Optional[List[Any]] = None,
+    **params: Any,
+) -> Dict[Any, Dict[str, np.ndarray]]:
+    """
+    {regime: relation_stats}. Without regime codes the single key is None;
+    otherwise each regime's rows (in time order) are analysed as their own series.
+    """
+    if codes is None:
+        return {None: relation_stats(X, y, **params)}
+    return {label: relation_stats(X[codes == i], y[codes == i], **params) for i, label in enumerate(labels)}
+
+
+def asset_relations(
+    df: pd.DataFrame,
+    targets: List[str],
+    features: List[str],
+    regime_col: Optional[str] = None,
+    **params: Any,
+) -> Dict[str, Dict[Any, Dict[str, np.ndarray]]]:
+    """Statistics of one asset: {target: {regime: relation_stats}} (see `regime_stats`)."""
+    codes, labels = encode_regimes(df[regime_col]) if regime_col else (None, None)
+    X = df[features].to_numpy(dtype=np.float64, na_value=np.nan)
+    return {
+        target: regime_stats(X, df[target].to_numpy(dtype=np.float64, na_value=np.nan), codes, labels, **params)
+        for target in targets
+    }
+
+
+def prepare_frames(
+    frames: Dict[str, pd.DataFrame],
+    targets: List[str],
+    features: Optional[List[str]] = None,
+    regime_col: Optional[str] = None,
+) -> Tuple[Dict[str, pd.DataFrame], List[str]]:
+    """Add the derived targets and resolve the feature list (default: numeric, non-target columns shared by all assets)."""
+    frames = {asset: add_targets(df, targets) for asset, df in frames.items()}
+    if features is None:
+        per_asset = [default_features(df.drop(columns=[regime_col] if regime_col else []), targets)
+                     for df in frames.values()]
+        features = [c for c in per_asset[0] if all(c in f for f in per_asset[1:])]
+    return frames, features
+
+
+def build_raw_info(
+    target: str,
+    features: List[str],
+    stats: Dict[str, Dict[Any, Dict[str, np.ndarray]]],
+    comment: str,
+    top: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    raw_info document of one target from {asset: {regime: relation_stats}}.
+    With `top`, each section keeps the features with the largest cross-asset
+    mean |correlation| (resp. mean mutual information).
+    """
+    def leaves(key_fn):
+        out = {}
+        for i, feat in enumerate(features):
+            out[feat] = {}
+            for asset, regimes in stats.items():
+                values = {r: key_fn(s, i) for r, s in regimes.items()}
+                out[feat][asset] = values[None] if list(values) == [None] else values
+        return out
+
+    def score(stat: str, i: int) -> float:
+        vals = [abs(s[stat][i]) for regimes in stats.values() for s in regimes.values()]
+        vals = [v for v in vals if np.isfinite(v)]
+        return float(np.mean(vals)) if vals else -1.0
+
+    correlation = leaves(lambda s, i: {
+        "mean": s["corr_mean"][i], "std": s["corr_std"][i], "crossings": int(s["crossings"][i]),
+    })
+    mutual_info = leaves(lambda s, i: {"mean": s["mi_mean"][i], "std": s["mi_std"][i]})
+
+    if top is not None:
+        by_corr = sorted(range(len(features)), key=lambda i: -score("corr_mean", i))[:top]
+        by_mi = sorted(range(len(features)), key=lambda i: -score("mi_mean", i))[:top]
+        correlation = {features[i]: correlation[features[i]] for i in by_corr}
+        mutual_info = {features[i]: mutual_info[features[i]] for i in by_mi}
+
+    return {
+        "target": target,
+        "relations": {"correlation": correlation, "mutual_info": mutual_info},
+        "meta": {"comment": comment},
+    }
+
+
+def default_comment(
+    n_obs: int = N_OBS,
+    corr_window: int = CORR_WINDOW,
+    mi_window: int = MI_WINDOW,
+    bins: int = MI_BINS,
+) -> str:
+    return (
+        "Aggregated correlation and mutual information metrics by relation and asset.\n"
+        f"The crossing value counts how many times the rolling correlation ({corr_window} bars) "
+        f"crossed zero over the {n_obs} observation window.\n"
+        "Mean and std for both correlation and mutual information come from a rolling window "
+        f"of the last {n_obs} observations.\n"
+        f"Mutual information is normalized (MI / sqrt(H(x) H(y))), estimated with {bins} "
+        f"equal-frequency bins on {mi_window}-bar windows.\n"
+    )
+
+
+def compute_relations(
+    frames: Dict[str, pd.DataFrame],
+    targets: List[str],
+    features: Optional[List[str]] = None,
+    regime_col: Optional[str] = None,
+    top: Optional[int] = None,
+    n_obs: int = N_OBS,
+    corr_window: int = CORR_WINDOW,
+    mi_window: int = MI_WINDOW,
+    mi_step: int = MI_STEP,
+    bins: int = MI_BINS,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    raw_info documents ({target: doc}) for the feature x target x asset grid.
+
+    Parameters
+    ----------
+    frames : Dict[str, pd.DataFrame]
+        One time-ordered feature frame per asset. Missing `future_*` targets
+        are derived from their base column (see `add_targets`).
+    features : List[str], optional
+        Features to relate (default: numeric, non-target columns shared by all assets).
+    regime_col : str, optional
+        Column of regime labels; statistics are then nested per regime.
+    """
+    params = dict(n_obs=n_obs, corr_window=corr_window, mi_window=mi_window, mi_step=mi_step, bins=bins)
+    frames, features = prepare_frames(frames, targets, features, regime_col)
+
+    stats = {asset: asset_relations(df, targets, features, regime_col, **params) for asset, df in frames.items()}
+    return assemble(stats, targets, features, top=top, comment=default_comment(n_obs, corr_window, mi_window, bins))
+
+
+def assemble(
+    stats: Dict[str, Dict[str, Dict[Any, Dict[str, np.ndarray]]]],
+    targets: List[str],
+    features: List[str],
+    comment: str,
+    top: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Turn {asset: {target: {regime: stats}}} into {target: raw_info doc}."""
+    return {
+        target: build_raw_info(
+            target, features, {asset: s[target] for asset, s in stats.items()}, comment, top=top,
+        )
+        for target in targets
+    }
+
+
+# ----------------------------------------------------------
+# raw_info YAML rendering
+# ----------------------------------------------------------
+def _key(k: Any) -> str:
+    k = str(k)
+    try:
+        plain = yaml.safe_load(f"{k}: 0")
+    except yaml.YAMLError:
+        plain = None
+    return k if isinstance(plain, dict) and list(plain) == [k] else json.dumps(k)
+
+
+def _scalar(v: Any, decimals: int) -> str:
+    if isinstance(v, (bool, np.bool_)):
+        return "true" if v else "false"
+    if isinstance(v, (int, np.integer)):
+        return str(int(v))
+    if v is None or not np.isfinite(v):
+        return "null"
+    return f"{float(v):.{decimals}f}"
+
+
+def _flow(leaf: Dict[str, Any], decimals: int) -> str:
+    return "{ " + ", ".join(f"{k}: {_scalar(v, decimals)}" for k, v in leaf.items()) + " }"
+
+
+def _render_level(node: Dict[Any, Any], indent: int, decimals: int) -> List[str]:
+    # a dict whose values are all scalars is written inline: `6E: { mean: .., std: .. }`
+    pad = " " * indent
+    width = max(len(_key(k)) for k in node) + 1
+    lines = []
+    for k, v in node.items():
+        if all(not isinstance(x, dict) for x in v.values()):
+            lines.append(f"{pad}{(_key(k) + ':').ljust(width)} {_flow(v, decimals)}")
+        else:
+            lines.append(f"{pad}{_key(k)}:")
+            lines.extend(_render_level(v, indent + 2, decimals))
+    return lines
+
+
+def raw_info_yaml(doc: Dict[str, Any], decimals: int = 2) -> str:
+    """Render a raw_info document in the layout of outputs/features_info/raw_info/*.yaml."""
+    lines = [f"target: {_key(doc['target'])}", "", "relations:"]
+    for section in ("correlation", "mutual_info"):
+        entries = doc["relations"].get(section) or {}
+        lines.append(f"  {section}:")
+        for feat, per_asset in entries.items():
+            lines.append(f"    {_key(feat)}:")
+            lines.extend(_render_level(per_asset, 6, decimals))
+            lines.append("")
+        if not entries:
+            lines[-1] += " {}"
+            lines.append("")
+
+    lines.append("meta:")
+    for k, v in (doc.get("meta") or {}).items():
+        text = str(v).strip()
+        if "\n" in text or len(text) > 80:
+            lines.append(f"  {k}: >")
+            lines.extend(f"    {line}" for line in text.splitlines())
+        else:
+            lines.append(f"  {k}: {json.dumps(text)}")
+    return "\n".join(lines) + "\n"
+
+
+def save_raw_info(doc: Dict[str, Any], out_dir: Path, suffix: str = "", decimals: int = 2) -> Path:
+    return save_text(raw_info_yaml(doc, decimals), Path(out_dir) / f"{doc['target']}{suffix}.yaml")
@@ -0,0 +1,256 @@
+# ==========================================================
+#  QUANTREO — Streaming rolling correlation and zero crossings
+# ==========================================================
+#  O(1) per bar and per feature: running sums of x, y, x², y², xy over a
+#  ring buffer of the last `window` pairs give the rolling correlation;
+#  a second ring buffer of the last `n_obs` correlations keeps their mean,
+#  std and zero-crossing count, i.e. the raw_info `{mean, std, crossings}`
+#  of every feature, refreshed at each new bar instead of recomputed.
+from __future__ import annotations
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.features_info.relations import CORR_WINDOW, N_OBS, target_base
+
+
+class RollingCorrelation:
+    """
+    Online rolling correlation of `n_features` series with one target.
+
+    Parameters
+    ----------
+    n_features : int
+        Number of feature series updated together.
+    window : int
+        Rolling correlation window.
+    n_obs : int
+        Number of correlation values summarised by `stats()`.
+    lag : int
+        Bars between a feature row and its target value. A target
+        `future_<base>_<h>` is only known h bars later: with lag=h, `update`
+        takes the current feature row and the *current* base value, and pairs
+        that value with the feature row of h bars ago.
+    refresh : int, optional
+        The running sums are recomputed from the buffers every `refresh`
+        updates (default: n_obs) so rounding errors cannot accumulate.
+    """
+
+    def __init__(
+        self,
+        n_features: int,
+        window: int = CORR_WINDOW,
+        n_obs: int = N_OBS,
+        lag: int = 0,
+        refresh: Optional[int] = None,
+    ):
+        if window < 2 or n_obs < 1 or lag < 0:
+            raise ValueError("window must be >= 2, n_obs >= 1 and lag >= 0.")
+        self.n_features = n_features
+        self.window = window
+        self.n_obs = n_obs
+        self.lag = lag
+        self.refresh = refresh or n_obs
+
+        F = n_features
+        self._pending = np.full((lag, F), np.nan)    # feature rows waiting for their target
+        self._n_pending = 0
+
+        # pair ring buffer (window rows)
+        self._x = np.zeros((window, F))
+        self._y = np.zeros(window)
+        self._bad = np.ones((window, F), dtype=bool)
+        self._shift_x = np.zeros(F)
+        self._shifted = np.zeros(F, dtype=bool)
+        self._shift_y: Optional[float] = None
+        self._sums = np.zeros((5, F))                # sx, sy, sxx, syy, sxy
+        self._n_bad = np.full(F, window)             # empty slots count as bad
+        self._pos = 0
+
+        # correlation ring buffer (n_obs rows)
+        self._corr = np.full((n_obs, F), np.nan)
+        self._events = np.zeros((n_obs, F), dtype=bool)
+        self._corr_sum = np.zeros(F)
+        self._corr_sq = np.zeros(F)
+        self._corr_n = np.zeros(F, dtype=np.int64)
+        self._n_events = np.zeros(F, dtype=np.int64)
+        self._last_sign = np.zeros(F)
+        self._cpos = 0
+
+        self.corr = np.full(F, np.nan)
+        self.updates = 0
+
+    # ------------------------------------------------------------------
+    def update(self, x: np.ndarray, y: float) -> np.ndarray:
+        """
+        Add one bar and return the current rolling correlation of every
+        feature (NaN while the window is incomplete or contains a NaN).
+        """
+        x = np.asarray(x, dtype=np.float64).reshape(self.n_features)
+        if self.lag:
+            slot = self._n_pending % self.lag
+            paired, self._pending[slot] = self._pending[slot].copy(), x
+            self._n_pending += 1
+            if self._n_pending <= self.lag:
+                return self.corr
+            x = paired
+        self._push_pair(x, float(y))
+        self._push_corr()
+        self.updates += 1
+        if self.updates % self.refresh == 0:
+            self._recompute_sums()
+        return self.corr
+
+    def update_many(self, X: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """Batch mode: feed rows in time order, return the (rows x features) correlations."""
+        X = np.asarray(X, dtype=np.float64)
+        out = np.empty((len(X), self.n_features))
+        for t in range(len(X)):
+            out[t] = self.update(X[t], y[t])
+        return out
+
+    def stats(self) -> Dict[str, np.ndarray]:
+        """corr_mean, corr_std and crossings over the last `n_obs` correlations."""
+        n = self._corr_n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(n > 0, self._corr_sum / n, np.nan)
+            var = np.where(n > 1, (self._corr_sq - n * mean * mean) / (n - 1), np.nan)
+        # a crossing needs a previous sign inside the window: the oldest valid value never counts
+        oldest = self._first_valid_events()
+        return {
+            "corr_mean": mean,
+            "corr_std": np.sqrt(np.maximum(var, 0.0)),
+            "crossings": self._n_events - oldest,
+        }
+
+    # ------------------------------------------------------------------
+    def _push_pair(self, x: np.ndarray, y: float) -> None:
+        bad = np.isnan(x) | np.isnan(y)
+        # values are centred on their first valid observation to limit cancellation;
+        # until then the buffer only holds zeros for that feature, so setting it is safe
+        if self._shift_y is None and not np.isnan(y):
+            self._shift_y = y
+        first = ~bad & ~self._shifted
+        self._shift_x[first] = x[first]
+        self._shifted |= first
+        sx = self._shift_x
+        sy = self._shift_y if self._shift_y is not None else 0.0
+
+        xc = np.where(bad, 0.0, x - sx)
+        yc = np.where(bad, 0.0, y - sy)
+
+        p = self._pos
+        ox, oy = self._x[p], np.where(self._bad[p], 0.0, self._y[p])
+        self._sums[0] += xc - ox
+        self._sums[1] += yc - oy
+        self._sums[2] += xc * xc - ox * ox
+        self._sums[3] += yc * yc - oy * oy
+        self._sums[4] += xc * yc - ox * oy
+        self._n_bad += bad.astype(np.int64) - self._bad[p]
+
+        self._x[p], self._y[p], self._bad[p] = xc, (y - sy) if not np.isnan(y) else 0.0, bad
+        self._pos = (p + 1) % self.window
+
+        n = self.window
+        sx_, sy_, sxx, syy, sxy = self._sums
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx_ * sy_ / n
+            var_x = np.maximum(sxx - sx_ * sx_ / n, 0.0)
+            var_y = np.maximum(syy - sy_ * sy_ / n, 0.0)
+            corr = cov / np.sqrt(var_x * var_y)
+        corr[(self._n_bad > 0) | ~np.isfinite(corr)] = np.nan
+        self.corr = np.clip(corr, -1.0, 1.0)
+
+    def _push_corr(self) -> None:
+        c = self.corr
+        p = self._cpos
+        old = self._corr[p]
+        old_ok = ~np.isnan(old)
+        self._corr_sum -= np.where(old_ok, old, 0.0)
+        self._corr_sq -= np.where(old_ok, old * old, 0.0)
+        self._corr_n -= old_ok
+        self._n_events -= self._events[p]
+
+        ok = ~np.isnan(c)
+        sign = np.where(ok, np.sign(c), 0.0)
+        event = (sign != 0) & (self._last_sign != 0) & (sign != self._last_sign)
+        self._last_sign = np.where(sign != 0, sign, self._last_sign)
+
+        self._corr[p] = c
+        self._events[p] = event
+        self._corr_sum += np.where(ok, c, 0.0)
+        self._corr_sq += np.where(ok, c * c, 0.0)
+        self._corr_n += ok
+        self._n_events += event
+        self._cpos = (p + 1) % self.n_obs
+
+    def _first_valid_events(self) -> np.ndarray:
+        # event flag of the oldest non-zero correlation still in the window
+        oldest = self._corr[self._cpos] if self.updates >= self.n_obs else self._corr[0]
+        if not (np.isnan(oldest) | (oldest == 0)).any():
+            return self._events[self._cpos if self.updates >= self.n_obs else 0].astype(np.int64)
+        order = np.roll(np.arange(self.n_obs), -self._cpos) if self.updates >= self.n_obs else np.arange(self.n_obs)
+        ring = self._corr[order]
+        valid = ~np.isnan(ring) & (ring != 0)
+        first = valid.argmax(axis=0)
+        has = valid.any(axis=0)
+        flags = self._events[order][first, np.arange(self.n_features)]
+        return (flags & has).astype(np.int64)
+
+    def _recompute_sums(self) -> None:
+        y = np.where(self._bad, 0.0, self._y[:, None])
+        x = self._x
+        self._sums = np.stack([
+            x.sum(axis=0), y.sum(axis=0), (x * x).sum(axis=0), (y * y).sum(axis=0), (x * y).sum(axis=0),
+        ])
+        ok = ~np.isnan(self._corr)
+        c = np.where(ok, self._corr, 0.0)
+        self._corr_sum, self._corr_sq, self._corr_n = c.sum(axis=0), (c * c).sum(axis=0), ok.sum(axis=0)
+
+
+class RelationMonitor:
+    """
+    Live feature/target correlation statistics: one `RollingCorrelation` per
+    `future_<base>_<h>` target, fed with the current bar only (the target
+    value of h bars ago is the current `<base>_<h>`).
+
+    Parameters
+    ----------
+    features : List[str]
+        Feature columns.
+    targets : List[str]
+        Targets, e.g. ["future_rs_vol_120"].
+    """
+
+    def __init__(self, features: List[str], targets: List[str], window: int = CORR_WINDOW, n_obs: int = N_OBS):
+        self.features = list(features)
+        self.bases = {t: target_base(t)[0] for t in targets}
+        self.accumulators = {
+            t: RollingCorrelation(len(self.features), window, n_obs, lag=target_base(t)[1])
+            for t in targets
+        }
+
+    def update(self, bar: pd.Series) -> None:
+        """Add one bar holding the feature and base columns."""
+        x = bar[self.features].to_numpy(dtype=np.float64)
+        for target, acc in self.accumulators.items():
+            acc.update(x, bar[self.bases[target]])
+
+    def update_frame(self, df: pd.DataFrame) -> None:
+        """Batch mode: feed a history (or a block of new bars) in time order."""
+        X = df[self.features].to_numpy(dtype=np.float64, na_value=np.nan)
+        for target, acc in self.accumulators.items():
+            acc.update_many(X, df[self.bases[target]].to_numpy(dtype=np.float64, na_value=np.nan))
+
+    def stats(self) -> Dict[str, pd.DataFrame]:
+        """{target: DataFrame(index=features, columns=[mean, std, crossings])}."""
+        out = {}
+        for target, acc in self.accumulators.items():
+            s = acc.stats()
+            out[target] = pd.DataFrame(
+                {"mean": s["corr_mean"], "std": s["corr_std"], "crossings": s["crossings"]},
+                index=self.features,
+            )
+        return out
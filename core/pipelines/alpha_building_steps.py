@@ -1,53 +1,91 @@
 # ==========================================================
 #  QUANTREO — Alpha Building Steps (pure functions)
 #  Ideator -> Formulator -> Combiner -> Coder -> Refiner
+#                                    \-> Compiler (deterministic)
 # ==========================================================
 from __future__ import annotations
 
 from pathlib import Path
 from typing import Dict, List, Optional
 import random
+import threading
 import yaml
 import datetime
 
+from core.alphas.formula import FormulaError, compile_alpha
 from core.utils.io import ensure_dir, load_yaml, save_yaml
 from core.utils.io import slugify, timestamp
+from core.utils.io_dsr import DSRCatalog, sample_diverse
 from core.utils.io_alphas import (
     save_concept, save_formula, save_bundle,
     save_alpha_code, save_alpha_code_refined,
+    concept_path as _concept_path,
 )
 
+# Basenames handed out in this process (chains may run concurrently)
+_CLAIMED_BASENAMES = set()
+_BASENAME_LOCK = threading.Lock()
+
 # ----------------------------------------------------------
 # 0) Helpers
 # ----------------------------------------------------------
 def _now_iso() -> str:
     return datetime.datetime.now().isoformat(timespec="seconds")
 
-def _basename_from_concept(concept: Dict) -> str:
+def _basename_from_concept(concept: Dict, base_dir: Optional[Path] = None) -> str:
     name = (
         concept.get("alpha_concept", {}) or {}
     ).get("name") or "unnamed_alpha"
-    return f"{slugify(name)}_{timestamp()}"
+    stem = f"{slugify(name)}_{timestamp()}"
+
+    # Same concept name within the same second: add a numeric suffix
+    with _BASENAME_LOCK:
+        basename, i = stem, 1
+        while basename in _CLAIMED_BASENAMES or (
+            base_dir is not None and _concept_path(base_dir, basename).exists()
+        ):
+            i += 1
+            basename = f"{stem}_{i}"
+        _CLAIMED_BASENAMES.add(basename)
+    return basename
 
-def _load_dsr_subset(dsr_dir: Path, subset_size: int = 8, tag: Optional[str] = None, seed: Optional[int] = None) -> List[Dict]:
-    files = sorted(Path(dsr_dir).glob("*.yaml"))
-    if not files:
+def _load_dsr_subset(
+    dsr_dir: Path,
+    subset_size: int = 8,
+    tag: Optional[str] = None,
+    seed: Optional[int] = None,
+    sampling: str = "diverse",
+) -> List[Dict]:
+    """
+    sampling="diverse" weights DSRs by overall_assessment and favours new
+    related_features at each pick (see `sample_diverse`); "uniform" is the
+    plain random sample. Both are reproducible with `seed`.
+    """
+    # The catalog only stats the files; YAMLs are parsed when new/modified and for the sampled subset
+    catalog = DSRCatalog(dsr_dir)
+    catalog.refresh()
+    names = catalog.select()
+    if not names:
         raise FileNotFoundError(f"No DSR YAMLs found in {dsr_dir}")
 
-    # Optional filtering by tag in YAML content
+    # Optional filtering by tag
     if tag is not None:
-        filtered = []
-        for p in files:
-            data = load_yaml(p)
-            if data.get("tag") == tag:
-                filtered.append((p, data))
-        if not filtered:
+        names = catalog.select(tag=tag)
+        if not names:
             raise ValueError(f"No DSR YAMLs matched tag '{tag}' in {dsr_dir}")
-        files = [p for p, _ in filtered]
 
     rng = random.Random(seed)
-    subset = rng.sample(files, k=min(subset_size, len(files)))
-    return [load_yaml(p) for p in subset]
+    k = min(subset_size, len(names))
+    if sampling == "diverse":
+        subset = sample_diverse({n: catalog.entries[n] for n in names}, k, rng)
+    elif sampling == "uniform":
+        subset = rng.sample(names, k=k)
+    else:
+        raise ValueError(f"Unknown DSR sampling '{sampling}' (expected 'diverse' or 'uniform').")
+
+    covered = {f for n in subset for f in catalog.entries[n].get("related_features", [])}
+    print(f"📚 DSR subset ({sampling}): {len(subset)}/{len(names)} files, {len(covered)} distinct related features")
+    return [load_yaml(Path(dsr_dir) / name) for name in subset]
 
 # ----------------------------------------------------------
 # 1) Ideation
@@ -59,20 +97,21 @@ def generate_concept(
     focus: str,
     subset_size: int = 8,
     seed: Optional[int] = None,
+    sampling: str = "diverse",
 ) -> Dict:
     """
     Load a subset of DSR YAMLs, call Ideator to produce ONE concept,
     save it under concept_dir and return context dict for next steps.
     """
     ensure_dir(concept_dir)
-    dsr_list = _load_dsr_subset(dsr_dir, subset_size=subset_size, seed=seed)
+    dsr_list = _load_dsr_subset(dsr_dir, subset_size=subset_size, seed=seed, sampling=sampling)
 
     concepts = ideator.ideate_alpha(dsr_list)
     if not concepts:
         raise RuntimeError("Ideator returned no concept.")
 
     concept = concepts  # on force 1 concept
-    basename = _basename_from_concept(concept)
+    basename = _basename_from_concept(concept, concept_dir.parent)
     concept_path = save_concept(concept, concept_dir.parent, basename)  # parent = base focus dir
 
     return {
@@ -160,8 +199,11 @@ def generate_code(
     """
     ensure_dir(code_dir)
     alpha_yaml = load_yaml(context["formula_path"])
+    # meta carries timestamped file names: keep it out of the prompt so the
+    # coder call stays cacheable across re-runs
+    alpha_spec = {k: v for k, v in alpha_yaml.items() if k != "meta"}
 
-    code_str = coder.generate(alpha_yaml)
+    code_str = coder.generate(alpha_spec)
     if not code_str or not coder.quick_sanity_check(code_str):
         raise RuntimeError("AlphaCoder failed to generate valid code.")
 
@@ -171,6 +213,34 @@ def generate_code(
     })
     return context
 
+# ----------------------------------------------------------
+# 4b) Deterministic code generation (no LLM)
+# ----------------------------------------------------------
+def compile_code(
+    context: Dict,
+    code_dir: Path,
+    refined_dir: Path,
+) -> Dict:
+    """
+    Compile the formula YAML into vectorized code built on core.alphas.transforms.
+    The source is saved as <basename>.py in both code/ and code_refined/.
+
+    Raises FormulaError if the formula falls outside the compiler vocabulary.
+    """
+    ensure_dir(code_dir)
+    ensure_dir(refined_dir)
+    program = compile_alpha(load_yaml(context["formula_path"]))
+    source = program.to_source()
+
+    code_path = save_alpha_code(source, code_dir.parent, context["basename"])
+    refined_path = save_alpha_code_refined(source, refined_dir.parent, context["basename"])
+    context.update({
+        "code_path": code_path,
+        "refined_code_path": refined_path,
+        "codegen": "compiled",
+    })
+    return context
+
 # ----------------------------------------------------------
 # 5) Code refinement
 # ----------------------------------------------------------
@@ -193,4 +263,34 @@ def refine_code(
     context.update({
         "refined_code_path": refined_path
     })
-    return context
\ No newline at end of file
+    return context
+
+def build_code(
+    coder,                # AlphaCoderAgent
+    refiner,              # AlphaCodeRefinerAgent
+    context: Dict,
+    code_dir: Path,
+    refined_dir: Path,
+    mode: str = "auto",
+) -> Dict:
+    """
+    Produce the refined alpha code.
+
+    mode="compiled" only uses the compiler, mode="llm" only the Coder + Refiner
+    agents, and mode="auto" compiles and falls back to the agents on FormulaError.
+    """
+    if mode not in ("auto", "compiled", "llm"):
+        raise ValueError(f"Unknown codegen mode '{mode}'.")
+
+    if mode != "llm":
+        try:
+            return compile_code(context, code_dir, refined_dir)
+        except FormulaError as e:
+            if mode == "compiled":
+                raise
+            print(f"⚠️ Formula not compilable ({e}), falling back to the LLM coder.")
+
+    context = generate_code(coder, context, code_dir)
+    context = refine_code(refiner, context, refined_dir)
+    context["codegen"] = "llm"
+    return context
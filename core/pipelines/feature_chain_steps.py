@@ -1,5 +1,8 @@
 from pathlib import Path
-from core.utils.io_feature_chain import save_yaml_spec, save_code, save_explanation
+from core.benchmark.harness import load_function_from_source
+from core.benchmark.perf_gate import REFERENCE_ROWS, MIN_ROWS_PER_S, check_performance, same_output
+from core.benchmark.synthetic import synthetic_ohlcv
+from core.utils.io_feature_chain import save_yaml_spec, save_code, save_explanation, save_perf_report
 
 
 def next_feature_dir(base_dir: Path) -> Path:
@@ -29,6 +32,77 @@ def refine_code(agent, inputs):
     return save_code(refined, inputs["idea_yaml"], inputs["feature_dir"], suffix="refined")
 
 
+def _perf_issues(report):
+    issues = list(report["static_issues"])
+    if report["rows_per_s"] is not None and report["rows_per_s"] < report["min_rows_per_s"]:
+        issues.append(
+            f"throughput {report['rows_per_s']:,} rows/s on {report['n_rows']:,} rows "
+            f"(budget: {report['min_rows_per_s']:,.0f} rows/s)"
+        )
+    return issues
+
+
+def performance_gate(agent, inputs, max_retries: int = 2, n_rows: int = REFERENCE_ROWS,
+                     min_rows_per_s: float = MIN_ROWS_PER_S, check_rows: int = 5_000):
+    """
+    Reject refined code with row-wise constructs or below the throughput budget.
+    The refiner is asked for a vectorized rewrite (kept only if it returns the
+    same values on a `check_rows` frame) up to `max_retries` times, each retry
+    seeing the rejected rewrites and why they were rejected; a feature still
+    failing the gate raises RuntimeError and never reaches the feature store.
+    """
+    code = inputs["code"]
+    df = synthetic_ohlcv(n_rows)
+    df_check = df.iloc[:check_rows]
+    report = check_performance(code, n_rows, min_rows_per_s, df=df)
+
+    try:
+        reference = load_function_from_source(code)(df_check)
+    except Exception:
+        reference = None
+
+    attempts, rejected = [], []
+    for _ in range(max_retries):
+        if report["passed"]:
+            break
+        print(f"⚠️ Performance gate failed: {_perf_issues(report)}")
+        candidate = agent.optimize(code, _perf_issues(report), rejected)
+        if candidate is None:
+            attempts.append("no code returned")
+            rejected.append((None, "no code returned"))
+            continue
+        candidate_report = check_performance(candidate, n_rows, min_rows_per_s, df=df)
+        if candidate_report["error"] is not None:
+            attempts.append(f"rewrite failed to run: {candidate_report['error']}")
+            rejected.append((candidate, attempts[-1]))
+            continue
+        if reference is not None:
+            # Ran on the full frame, may still fail on the check slice
+            try:
+                output = load_function_from_source(candidate)(df_check)
+            except Exception as e:
+                attempts.append(f"rewrite failed to run: {type(e).__name__}: {e}")
+                rejected.append((candidate, attempts[-1]))
+                continue
+            if not same_output(reference, output):
+                attempts.append("rewrite changed the feature values")
+                rejected.append((candidate, "it returned different values than the original code"))
+                continue
+        status = "passes the gate" if candidate_report["passed"] else "kept, still failing"
+        attempts.append(f"rewrite {status} ({candidate_report['rows_per_s']:,} rows/s)")
+        code, report = candidate, candidate_report
+
+    report["attempts"] = attempts
+    save_perf_report(report, inputs["idea_yaml"], inputs["feature_dir"])
+    if code != inputs["code"]:
+        inputs = save_code(code, inputs["idea_yaml"], inputs["feature_dir"], suffix="refined")
+
+    if not report["passed"]:
+        raise RuntimeError(f"Feature rejected by the performance gate: {_perf_issues(report)}")
+    print("✅ Performance gate passed.")
+    return inputs
+
+
 def generate_explanation(agent, inputs):
     refined_code = inputs["code"]
     idea_yaml = inputs["idea_yaml"]
@@ -1,5 +1,6 @@
 # core/utils/alphas_io.py
 from pathlib import Path
+import json
 from core.utils.io import save_yaml, save_text, slugify, timestamp
 
 def alpha_basename(name: str, with_ts: bool = True) -> str:
@@ -15,6 +16,10 @@ def formula_path(base_dir: Path, basename: str) -> Path:
 def bundle_path(base_dir: Path, basename: str) -> Path:
     return base_dir / "bundles" / f"{basename}.yaml"
 
+def evaluation_path(base_dir: Path, basename: str) -> Path:
+    # JSON sidecar of the bundle, outside of the bundles/*.yaml glob
+    return base_dir / "bundles" / f"{basename}_evaluation.json"
+
 def code_path(base_dir: Path, basename: str) -> Path:
     return base_dir / "code" / f"{basename}.py"
 
@@ -35,3 +40,6 @@ def save_alpha_code(code: str, base_dir: Path, basename: str) -> Path:
 
 def save_alpha_code_refined(code: str, base_dir: Path, basename: str) -> Path:
     p = refined_code_path(base_dir, basename); return save_text(code, p)
+
+def save_evaluation(evaluation: dict, base_dir: Path, basename: str) -> Path:
+    p = evaluation_path(base_dir, basename); return save_text(json.dumps(evaluation, indent=2), p)
@@ -0,0 +1,260 @@
+# ==========================================================
+#  QUANTREO — DSR outputs: refresh manifest and catalog
+# ==========================================================
+#  `<dsr_dir>/_manifest.json` records, for every raw_info YAML turned into a
+#  DSR, the hash of its content, the observer prompt version and the model.
+#  A refresh only re-invokes the observer when one of them changed (or the
+#  DSR file is missing). `<dsr_dir>/_catalog.json` indexes the DSR files
+#  themselves (target, tag, related features, assessment) for subset
+#  selection. JSON keeps both out of the `*.yaml` globs.
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+import yaml
+
+MANIFEST_NAME = "_manifest.json"
+
+# Serializes the catalog refreshes (read, re-index, save) of concurrent runs in one process
+_LOCK = threading.RLock()
+
+
+def content_hash(path: Path) -> str:
+    """
+    SHA-256 of the parsed YAML (canonical JSON): reformatting or comment
+    edits do not count as a change, since the observer sees the parsed content.
+    """
+    data = yaml.safe_load(Path(path).read_text(encoding="utf-8"))
+    blob = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _write_json(data: Dict[str, Any], path: Path) -> None:
+    # Unique temp file: concurrent writers never share (and truncate) the same one
+    with tempfile.NamedTemporaryFile(
+        "w", encoding="utf-8", dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False
+    ) as f:
+        f.write(json.dumps(data, indent=2, sort_keys=True))
+    os.replace(f.name, path)
+
+
+class DSRManifest:
+    """
+    Content hashes and prompt versions of the raw_info files already analysed.
+
+    Parameters
+    ----------
+    dsr_dir : Path
+        DSR output directory; the manifest lives in `<dsr_dir>/_manifest.json`.
+    """
+
+    def __init__(self, dsr_dir: Path):
+        self.dsr_dir = Path(dsr_dir)
+        self.path = self.dsr_dir / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("entries", {})
+
+    # ------------------------------------------------------------------
+    def stale_reason(self, raw_info_path: Path, prompt_version: str, model: str) -> Optional[str]:
+        """Why a raw_info file must be (re-)analysed, or None when its DSR is up to date."""
+        entry = self.entries.get(Path(raw_info_path).name)
+        if entry is None:
+            return "new"
+        if not (self.dsr_dir / entry.get("dsr_file", "")).is_file():
+            return "missing DSR"
+        if entry.get("hash") != content_hash(raw_info_path):
+            return "content changed"
+        if entry.get("prompt_version") != prompt_version:
+            return "prompt changed"
+        if entry.get("model") != model:
+            return "model changed"
+        return None
+
+    def record(self, raw_info_path: Path, prompt_version: str, model: str, output_path: Path) -> None:
+        """Register a successful analysis and persist the manifest (atomic write)."""
+        self.entries[Path(raw_info_path).name] = {
+            "hash": content_hash(raw_info_path),
+            "prompt_version": prompt_version,
+            "model": model,
+            "dsr_file": Path(output_path).name,
+            "updated_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        self.save()
+
+    def prune(self, raw_info_names) -> int:
+        """Forget the entries whose raw_info file no longer exists. Returns how many were removed."""
+        keep = set(raw_info_names)
+        gone = [k for k in self.entries if k not in keep]
+        for k in gone:
+            del self.entries[k]
+        if gone:
+            self.save()
+        return len(gone)
+
+    def save(self) -> None:
+        self.dsr_dir.mkdir(parents=True, exist_ok=True)
+        _write_json({"entries": self.entries}, self.path)
+
+
+# ==========================================================
+#  Catalog of DSR entries (subset selection without parsing)
+# ==========================================================
+CATALOG_NAME = "_catalog.json"
+CATALOG_FIELDS = ("target", "tag", "related_features", "overall_assessment")
+
+
+def catalog_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Indexed fields of a parsed DSR YAML."""
+    obs = data.get("dsr_observation") or {}
+    return {
+        "target": data.get("target"),
+        "tag": data.get("tag"),
+        "related_features": list(data.get("related_features") or []),
+        "overall_assessment": data.get("overall_assessment", obs.get("overall_assessment")),
+    }
+
+
+class DSRCatalog:
+    """
+    Compact JSON index of the DSR YAMLs of a directory.
+
+    Each entry stores the `CATALOG_FIELDS` of one DSR file with its size and
+    mtime. `add()` updates it when a DSR is written; `refresh()` only stats
+    the files and re-parses the ones that changed on disk since they were
+    indexed (manual edits, files copied in), so selecting a subset no longer
+    parses every YAML.
+
+    Parameters
+    ----------
+    dsr_dir : Path
+        DSR directory; the catalog lives in `<dsr_dir>/_catalog.json`.
+    """
+
+    def __init__(self, dsr_dir: Path):
+        self.dsr_dir = Path(dsr_dir)
+        self.path = self.dsr_dir / CATALOG_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8")).get("entries", {})
+
+    # ------------------------------------------------------------------
+    def add(self, dsr_path: Path, data: Optional[Dict[str, Any]] = None, save: bool = True) -> None:
+        """Index (or re-index) one DSR file; `data` avoids re-reading a file just written."""
+        dsr_path = Path(dsr_path)
+        if data is None:
+            data = yaml.safe_load(dsr_path.read_text(encoding="utf-8")) or {}
+        st = dsr_path.stat()
+        self.entries[dsr_path.name] = {**catalog_entry(data), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if save:
+            self.save()
+
+    def refresh(self) -> int:
+        """
+        Bring the catalog in line with the directory: index new or modified
+        files, drop removed ones. Returns the number of changed entries.
+        Concurrent refreshes in one process (run_alpha_batch) run one at a time.
+        """
+        with _LOCK:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        changed = 0
+        on_disk = {}
+        for p in self.dsr_dir.glob("*.yaml"):
+            on_disk[p.name] = p
+        for name in [n for n in self.entries if n not in on_disk]:
+            del self.entries[name]
+            changed += 1
+        for name, p in on_disk.items():
+            st = p.stat()
+            entry = self.entries.get(name)
+            if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                continue
+            try:
+                self.add(p, save=False)
+            except yaml.YAMLError as e:
+                print(f"⚠️ Skipping unreadable DSR {name}: {e}")
+                self.entries.pop(name, None)
+            changed += 1
+        if changed:
+            self.save()
+        return changed
+
+    def select(
+        self,
+        tag: Optional[str] = None,
+        target: Optional[str] = None,
+        assessment: Optional[str] = None,
+        feature: Optional[str] = None,
+    ) -> List[str]:
+        """Sorted DSR file names matching every given filter."""
+        out = []
+        for name, e in self.entries.items():
+            if tag is not None and e.get("tag") != tag:
+                continue
+            if target is not None and e.get("target") != target:
+                continue
+            if assessment is not None and e.get("overall_assessment") != assessment:
+                continue
+            if feature is not None and feature not in e.get("related_features", []):
+                continue
+            out.append(name)
+        return sorted(out)
+
+    def save(self) -> None:
+        self.dsr_dir.mkdir(parents=True, exist_ok=True)
+        _write_json({"entries": self.entries}, self.path)
+
+
+# ==========================================================
+#  Diversity-aware subset sampling
+# ==========================================================
+ASSESSMENT_WEIGHTS = {"strong": 3.0, "moderate": 2.0, "weak": 1.0}
+
+
+def sample_diverse(entries: Dict[str, Dict[str, Any]], k: int, rng) -> List[str]:
+    """
+    Draw `k` DSR names, one at a time, with probability proportional to
+
+        assessment weight * (1 + related features not covered yet) / (1 + picks of the same target)
+
+    Strong DSRs are preferred and each pick favours the candidates that
+    bring new features, so the subset covers more of the feature space
+    than a uniform sample. The draw only depends on `rng` and on the
+    (sorted) names: a seeded `random.Random` makes it reproducible.
+    """
+    pool = sorted(entries)
+    covered: set = set()
+    targets: Dict[Any, int] = {}
+    picked: List[str] = []
+    while pool and len(picked) < k:
+        scores = []
+        for name in pool:
+            e = entries[name]
+            gain = len(set(e.get("related_features") or []) - covered)
+            weight = ASSESSMENT_WEIGHTS.get(str(e.get("overall_assessment")).lower(), 1.0)
+            scores.append(weight * (1 + gain) / (1 + targets.get(e.get("target"), 0)))
+        name = pool.pop(_weighted_index(scores, rng))
+        picked.append(name)
+        covered.update(entries[name].get("related_features") or [])
+        target = entries[name].get("target")
+        targets[target] = targets.get(target, 0) + 1
+    return picked
+
+
+def _weighted_index(scores: List[float], rng) -> int:
+    r = rng.random() * sum(scores)
+    acc = 0.0
+    for i, s in enumerate(scores):
+        acc += s
+        if r < acc:
+            return i
+    return len(scores) - 1
@@ -8,9 +8,12 @@ def save_yaml_spec(idea_yaml, feature_dir: Path):
     print(f"Saved YAML to: {path}")
     return idea_yaml
 
-def save_code(code: str, idea_yaml: dict, feature_dir: Path, suffix: str):
+def code_path(idea_yaml: dict, feature_dir: Path, suffix: str) -> Path:
     name = idea_yaml.get("idea", "unknown_feature").lower().replace(" ", "_")
-    path = feature_dir / f"feat_{name}_{suffix}.py"
+    return feature_dir / f"feat_{name}_{suffix}.py"
+
+def save_code(code: str, idea_yaml: dict, feature_dir: Path, suffix: str):
+    path = code_path(idea_yaml, feature_dir, suffix)
     with open(path, "w", encoding="utf-8") as f:
         f.write(code)
     print(f"Saved {suffix} code to: {path}")
@@ -23,3 +26,10 @@ def save_explanation(text: str, idea_yaml: dict, feature_dir: Path):
         f.write(text)
     print(f"Saved explanation to: {path}")
     return text
+
+def save_perf_report(report: dict, idea_yaml: dict, feature_dir: Path):
+    name = idea_yaml.get("idea", "unknown_feature").lower().replace(" ", "_")
+    path = feature_dir / f"feat_{name}_perf.yml"
+    save_yaml(report, path)
+    print(f"Saved performance report to: {path}")
+    return path
@@ -0,0 +1,78 @@
+# ==========================================================
+#  LLM FACTORY SHARED BY ALL RUNNERS
+# ==========================================================
+from pathlib import Path
+from typing import Optional
+import os
+
+from langchain_groq import ChatGroq
+
+from core.utils.llm_cache import CachedLLM, LLMResponseCache
+from core.utils.rate_limit import RateLimitedLLM, SharedRateLimiter
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+LLM_CACHE_DIR = ROOT_DIR / ".cache" / "llm"
+RATE_LIMIT_DIR = ROOT_DIR / ".cache" / "rate_limits"
+
+# Provider quotas, per model. Override with QUANTREO_RPM / QUANTREO_TPM.
+DEFAULT_RPM = 30.0
+DEFAULT_TPM = None
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+def build_limiter(model: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> SharedRateLimiter:
+    """Return the process-safe limiter shared by every client of `model`."""
+    return SharedRateLimiter(
+        name=model,
+        state_dir=RATE_LIMIT_DIR,
+        rpm=rpm or _env_float("QUANTREO_RPM", DEFAULT_RPM),
+        tpm=tpm or _env_float("QUANTREO_TPM", DEFAULT_TPM),
+    )
+
+
+def build_llm(
+    model: str,
+    temperature: float,
+    cache: bool = False,
+    refresh: bool = False,
+    cache_dir: Optional[Path] = None,
+    max_entries: int = 5000,
+    rpm: Optional[float] = None,
+    tpm: Optional[float] = None,
+):
+    """
+    Build a ChatGroq model behind the shared rate limiter and, on request,
+    the on-disk response cache. The cache sits outside the limiter, so cache
+    hits do not consume provider quota.
+
+    The cache replays the first answer to an identical prompt: only enable it
+    for deterministic, low-temperature steps (coding, refining, formulating),
+    never for creative ones (ideation) that are expected to vary across calls.
+
+    Parameters
+    ----------
+    model : str
+        Groq model name (e.g., "llama-3.3-70b-versatile").
+    temperature : float
+        Sampling temperature. It is part of the cache key.
+    cache : bool
+        Opt-in switch. When False the responses are neither read nor written.
+    refresh : bool
+        With cache=True, ignore the cached responses but store the new ones
+        (forced rebuilds such as `run_info_dsr.py --refresh all`).
+    cache_dir : Path, optional
+        Cache directory. Defaults to <repo>/.cache/llm.
+    max_entries : int
+        LRU bound on the number of cached responses.
+    rpm, tpm : float, optional
+        Requests / tokens per minute for this model. Default to QUANTREO_RPM /
+        QUANTREO_TPM, then to DEFAULT_RPM / DEFAULT_TPM.
+    """
+    llm = ChatGroq(model=model, temperature=temperature)
+    llm = RateLimitedLLM(llm, build_limiter(model, rpm=rpm, tpm=tpm))
+    store = LLMResponseCache(cache_dir or LLM_CACHE_DIR, max_entries=max_entries)
+    return CachedLLM(llm, store, enabled=None if cache else False, refresh=refresh)
@@ -0,0 +1,216 @@
+# ==========================================================
+#  LLM RESPONSE CACHE (content-addressed, on disk)
+# ==========================================================
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import datetime
+import hashlib
+import json
+import os
+
+from langchain_core.messages import AIMessage
+
+
+# --------------------------------------------------
+# Helpers
+# --------------------------------------------------
+def _env_enabled() -> bool:
+    return os.getenv("QUANTREO_LLM_CACHE", "1").strip().lower() not in {"0", "false", "off", "no"}
+
+
+def _model_name(llm: Any) -> str:
+    return str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__)
+
+
+def _serialize_messages(messages: Any) -> List[List[str]]:
+    if isinstance(messages, str):
+        return [["human", messages]]
+    out = []
+    for m in messages:
+        if isinstance(m, tuple):
+            out.append([str(m[0]), str(m[1])])
+        else:
+            out.append([str(getattr(m, "type", type(m).__name__)), str(getattr(m, "content", m))])
+    return out
+
+
+# --------------------------------------------------
+# Disk store
+# --------------------------------------------------
+class LLMResponseCache:
+    """
+    Size-bounded, content-addressed store of LLM responses.
+
+    Each response lives in its own JSON file named after the SHA-256 of
+    (model, temperature, messages). Reads bump the file mtime, so eviction
+    removes the least recently used entries first once `max_entries` or
+    `max_bytes` is exceeded. Writes are atomic (tmp file + os.replace),
+    which makes the cache safe to share between concurrent runners.
+
+    Parameters
+    ----------
+    cache_dir : Path
+        Directory holding the cached responses.
+    max_entries : int
+        Maximum number of cached responses.
+    max_bytes : int
+        Maximum total size of the cache directory, in bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 5000, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def make_key(model: str, temperature: Any, messages: Any, **kwargs: Any) -> str:
+        payload = {
+            "model": model,
+            "temperature": temperature,
+            "messages": _serialize_messages(messages),
+            "kwargs": kwargs,
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass
+        return data
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        self._evict()
+
+    def clear(self) -> None:
+        for p in self.cache_dir.glob("*.json"):
+            p.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    def _evict(self) -> None:
+        entries = []
+        total = 0
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+            total += st.st_size
+
+        if len(entries) <= self.max_entries and total <= self.max_bytes:
+            return
+
+        entries.sort(key=lambda e: e[0])  # oldest first
+        count = len(entries)
+        for _, size, p in entries:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            count -= 1
+            total -= size
+
+
+# --------------------------------------------------
+# LLM wrapper
+# --------------------------------------------------
+class CachedLLM:
+    """
+    Drop-in wrapper around a LangChain chat model that serves repeated
+    `invoke` / `ainvoke` calls from an `LLMResponseCache`.
+
+    Agents only read `response.content`, so cache hits are returned as a plain
+    `AIMessage`. Any other attribute is forwarded to the wrapped model.
+
+    Parameters
+    ----------
+    llm : Any
+        Any LangChain-compatible chat model (e.g., ChatGroq).
+    cache : LLMResponseCache
+        Disk store used for the responses.
+    enabled : bool, optional
+        Bypass switch. Defaults to the QUANTREO_LLM_CACHE env var (on unless "0"/"off").
+    refresh : bool
+        Never serve cached responses, but store the new ones (forced rebuilds).
+    """
+
+    def __init__(self, llm: Any, cache: LLMResponseCache, enabled: Optional[bool] = None, refresh: bool = False):
+        self.llm = llm
+        self.cache = cache
+        self.enabled = _env_enabled() if enabled is None else enabled
+        self.refresh = refresh
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+    # ------------------------------------------------------------------
+    def _key(self, messages: Any, kwargs: Dict[str, Any]) -> str:
+        return self.cache.make_key(
+            _model_name(self.llm), getattr(self.llm, "temperature", None), messages, **kwargs
+        )
+
+    @staticmethod
+    def _from_entry(entry: Dict[str, Any]) -> AIMessage:
+        return AIMessage(content=entry["content"], response_metadata={"cache_hit": True})
+
+    def _store(self, key: str, response: Any) -> None:
+        self.cache.put(key, {
+            "model": _model_name(self.llm),
+            "content": response.content,
+            "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        })
+
+    # ------------------------------------------------------------------
+    def invoke(self, messages: Any, **kwargs: Any) -> Any:
+        if not self.enabled:
+            return self.llm.invoke(messages, **kwargs)
+
+        key = self._key(messages, kwargs)
+        entry = None if self.refresh else self.cache.get(key)
+        if entry is not None:
+            return self._from_entry(entry)
+
+        response = self.llm.invoke(messages, **kwargs)
+        self._store(key, response)
+        return response
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        if not self.enabled:
+            return await self.llm.ainvoke(messages, **kwargs)
+
+        key = self._key(messages, kwargs)
+        entry = None if self.refresh else self.cache.get(key)
+        if entry is not None:
+            return self._from_entry(entry)
+
+        response = await self.llm.ainvoke(messages, **kwargs)
+        self._store(key, response)
+        return response
+
+
+def invoke_uncached(llm: Any, messages: Any, **kwargs: Any) -> Any:
+    """
+    Call `llm` without reading or writing its response cache, e.g. for retries
+    whose prompt may repeat an earlier one but must get a fresh answer.
+    """
+    if isinstance(llm, CachedLLM):
+        return llm.llm.invoke(messages, **kwargs)
+    return llm.invoke(messages, **kwargs)
@@ -0,0 +1,276 @@
+# ==========================================================
+#  RATE LIMITING
+# ==========================================================
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+import asyncio
+import json
+import threading
+import time
+
+try:  # POSIX
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class TokenBucket:
+    """
+    In-process token bucket.
+
+    `rate_per_minute` tokens are refilled continuously, up to `capacity`.
+    Each request takes `cost` tokens and waits only as long as needed, so a
+    burst runs at full speed while the long-run rate stays under the quota.
+
+    Parameters
+    ----------
+    rate_per_minute : float
+        Sustained number of tokens (usually requests) allowed per minute.
+    capacity : float, optional
+        Maximum burst size. Defaults to `rate_per_minute`.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive.")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.time()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    def _reserve(self, cost: float) -> float:
+        """Take `cost` tokens (possibly going negative) and return the wait in seconds."""
+        if cost > self.capacity:
+            raise ValueError(f"cost={cost} exceeds bucket capacity={self.capacity}.")
+        with self._lock:
+            now = time.time()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= cost
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self, cost: float = 1.0) -> None:
+        wait = self._reserve(cost)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, cost: float = 1.0) -> None:
+        wait = self._reserve(cost)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    # ------------------------------------------------------------------
+    def get_state(self) -> Dict[str, float]:
+        return {"tokens": self.tokens, "updated": self.updated}
+
+    def set_state(self, state: Dict[str, float]) -> None:
+        self.tokens = min(self.capacity, float(state.get("tokens", self.capacity)))
+        self.updated = float(state.get("updated", time.time()))
+
+
+# --------------------------------------------------
+# Cross-process file lock
+# --------------------------------------------------
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    with open(path, "a+") as fh:
+        if fcntl is not None:
+            fcntl.flock(fh, fcntl.LOCK_EX)
+        else:
+            fh.seek(0)
+            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_UN)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class SharedRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter shared by every process
+    on the machine.
+
+    Both buckets live in a small JSON state file guarded by an exclusive file
+    lock, so concurrent runners (loops, batch executors, async DSR runs) draw
+    from the same provider quota instead of sleeping pessimistically.
+
+    Parameters
+    ----------
+    name : str
+        Quota name, usually the model name (Groq limits are per model).
+    state_dir : Path
+        Directory holding the `<name>.json` state and `<name>.lock` files.
+    rpm : float
+        Requests allowed per minute.
+    tpm : float, optional
+        Tokens allowed per minute. None disables token limiting.
+    """
+
+    def __init__(self, name: str, state_dir: Path, rpm: float, tpm: Optional[float] = None):
+        slug = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        self.name = name
+        self.state_dir = Path(state_dir)
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_path = self.state_dir / f"{slug}.json"
+        self.lock_path = self.state_dir / f"{slug}.lock"
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    @classmethod
+    def from_state_file(cls, state_path: Path) -> "SharedRateLimiter":
+        """Re-open an existing limiter (e.g. for monitoring) from its state file."""
+        state_path = Path(state_path)
+        limits = json.loads(state_path.read_text(encoding="utf-8")).get("limits", {})
+        limiter = cls(state_path.stem, state_path.parent, rpm=limits.get("rpm") or 1.0, tpm=limits.get("tpm"))
+        limiter.state_path, limiter.lock_path = state_path, state_path.with_suffix(".lock")
+        return limiter
+
+    # ------------------------------------------------------------------
+    def _load(self) -> Dict[str, Any]:
+        try:
+            return json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _dump(self, state: Dict[str, Any]) -> None:
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state), encoding="utf-8")
+        tmp.replace(self.state_path)
+
+    @staticmethod
+    def _trim(events: list, now: float) -> list:
+        return [e for e in events if now - e[0] < 60.0]
+
+    def _reserve(self, n_tokens: float) -> float:
+        with _file_lock(self.lock_path):
+            state = self._load()
+            now = time.time()
+            if "requests" in state:
+                self.requests.set_state(state["requests"])
+            wait = self.requests._reserve(1.0)
+            state["requests"] = self.requests.get_state()
+
+            if self.tokens is not None:
+                if "tokens" in state:
+                    self.tokens.set_state(state["tokens"])
+                wait = max(wait, self.tokens._reserve(min(n_tokens, self.tokens.capacity)))
+                state["tokens"] = self.tokens.get_state()
+
+            state["limits"] = {"rpm": self.requests.rate * 60.0,
+                               "tpm": self.tokens.rate * 60.0 if self.tokens is not None else None}
+            totals = state.setdefault("totals", {"requests": 0, "tokens": 0, "wait_s": 0.0})
+            totals["requests"] += 1
+            totals["tokens"] += int(n_tokens)
+            totals["wait_s"] += wait
+            state["events"] = self._trim(state.get("events", []), now) + [[now + wait, int(n_tokens)]]
+            self._dump(state)
+            return wait
+
+    # ------------------------------------------------------------------
+    def acquire(self, n_tokens: float = 0.0) -> None:
+        wait = self._reserve(n_tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, n_tokens: float = 0.0) -> None:
+        wait = self._reserve(n_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: float, actual: float) -> None:
+        """Correct the token bucket once the real usage of a call is known."""
+        delta = actual - estimated
+        if self.tokens is None or delta == 0:
+            return
+        with _file_lock(self.lock_path):
+            state = self._load()
+            if "tokens" in state:
+                self.tokens.set_state(state["tokens"])
+            self.tokens.tokens -= delta
+            state["tokens"] = self.tokens.get_state()
+            totals = state.setdefault("totals", {"requests": 0, "tokens": 0, "wait_s": 0.0})
+            totals["tokens"] += int(delta)
+            if state.get("events"):
+                state["events"][-1][1] += int(delta)
+            self._dump(state)
+
+    # ------------------------------------------------------------------
+    def utilization(self) -> Dict[str, Any]:
+        """Current usage over the last 60 seconds, plus lifetime totals."""
+        with _file_lock(self.lock_path):
+            state = self._load()
+        now = time.time()
+        events = [e for e in self._trim(state.get("events", []), now) if e[0] <= now]
+        req_last = len(events)
+        tok_last = sum(e[1] for e in events)
+        rpm = self.requests.rate * 60.0
+        tpm = self.tokens.rate * 60.0 if self.tokens is not None else None
+        return {
+            "name": self.name,
+            "requests_last_minute": req_last,
+            "tokens_last_minute": tok_last,
+            "rpm_limit": rpm,
+            "tpm_limit": tpm,
+            "request_utilization": req_last / rpm,
+            "token_utilization": tok_last / tpm if tpm else None,
+            "totals": state.get("totals", {"requests": 0, "tokens": 0, "wait_s": 0.0}),
+        }
+
+
+# --------------------------------------------------
+# LLM wrapper
+# --------------------------------------------------
+def _estimate_tokens(messages: Any) -> int:
+    if isinstance(messages, str):
+        text = messages
+    else:
+        text = "".join(str(getattr(m, "content", m)) for m in messages)
+    # ~4 characters per token for the prompt, plus a typical completion budget
+    return len(text) // 4 + 1000
+
+
+def _used_tokens(response: Any) -> Optional[int]:
+    usage = getattr(response, "usage_metadata", None) or {}
+    return usage.get("total_tokens")
+
+
+class RateLimitedLLM:
+    """
+    Wrapper that makes every `invoke` / `ainvoke` of a chat model go through
+    a `SharedRateLimiter`. Any other attribute is forwarded to the wrapped model.
+    """
+
+    def __init__(self, llm: Any, limiter: SharedRateLimiter):
+        self.llm = llm
+        self.limiter = limiter
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.llm, name)
+
+    def invoke(self, messages: Any, **kwargs: Any) -> Any:
+        estimated = _estimate_tokens(messages)
+        self.limiter.acquire(estimated)
+        response = self.llm.invoke(messages, **kwargs)
+        actual = _used_tokens(response)
+        if actual is not None:
+            self.limiter.settle(estimated, actual)
+        return response
+
+    async def ainvoke(self, messages: Any, **kwargs: Any) -> Any:
+        estimated = _estimate_tokens(messages)
+        await self.limiter.aacquire(estimated)
+        response = await self.llm.ainvoke(messages, **kwargs)
+        actual = _used_tokens(response)
+        if actual is not None:
+            self.limiter.settle(estimated, actual)
+        return response
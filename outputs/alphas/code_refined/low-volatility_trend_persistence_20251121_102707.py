@@ -1,9 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x: pd.Series, n: int) -> pd.Series:
-    """Exponential Moving Average"""
-    return x.ewm(span=n, adjust=False).mean()
+from core.alphas.transforms import ema
 
 def compute_alpha(df: pd.DataFrame, window_ema: int = 20, window_sma: int = 50) -> Tuple[pd.Series, pd.Series]:
     """
@@ -1,21 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x: pd.Series, n: int) -> pd.Series:
-    """Exponential Moving Average"""
-    return x.ewm(span=n, adjust=False).mean()
-
-def sma(x: pd.Series, n: int) -> pd.Series:
-    """Simple Moving Average"""
-    return x.rolling(window=n).mean()
-
-def zscore(x: pd.Series, n: int) -> pd.Series:
-    """Z-score"""
-    return (x - x.rolling(window=n).mean()) / x.rolling(window=n).std()
-
-def rank(x: pd.Series, n: int) -> pd.Series:
-    """Rank"""
-    return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
+from core.alphas.transforms import ema, rank, sma, zscore
 
 def compute_alpha(df: pd.DataFrame, window_ema: int = 20, window_sma: int = 50, eps: float = 1e-12) -> Tuple[pd.Series, pd.Series]:
     """
@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Tuple
+from core.alphas.transforms import rank, sma
 
 def compute_alpha(df: pd.DataFrame, sma_window: int = 20, rank_window: int = 50, zscore_window: int = 50) -> Tuple[pd.Series, pd.Series]:
     """
@@ -33,14 +34,6 @@ def compute_alpha(df: pd.DataFrame, sma_window: int = 20, rank_window: int = 50,
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
 
-    def sma(x: pd.Series, n: int) -> pd.Series:
-        """Simple moving average."""
-        return x.rolling(window=n).mean()
-
-    def rank(x: pd.Series, n: int) -> pd.Series:
-        """Ranking."""
-        return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
-
     def zscore(x: pd.Series, n: int) -> pd.Series:
         """Z-score."""
         mean = x.rolling(window=n).mean()
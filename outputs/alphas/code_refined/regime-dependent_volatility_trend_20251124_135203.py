@@ -1,17 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x: pd.Series, n: int) -> pd.Series:
-    """Exponential Moving Average"""
-    return x.ewm(span=n, adjust=False).mean()
-
-def sma(x: pd.Series, n: int) -> pd.Series:
-    """Simple Moving Average"""
-    return x.rolling(window=n).mean()
-
-def std(x: pd.Series, n: int) -> pd.Series:
-    """Standard Deviation"""
-    return x.rolling(window=n).std()
+from core.alphas.transforms import ema, sma, std
 
 def compute_alpha(df: pd.DataFrame, ema_window: int = 20, sma_window: int = 30, std_window: int = 20, threshold: float = 1.5, eps: float = 1e-12) -> Tuple[pd.Series, pd.Series]:
     """
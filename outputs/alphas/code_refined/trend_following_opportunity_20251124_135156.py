@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Tuple
+from core.alphas.transforms import ema
 
 def trend_following_opportunity(df: pd.DataFrame, window_ema_1: int = 20, window_ema_2: int = 5) -> Tuple[pd.Series, pd.Series]:
     """
@@ -30,24 +31,6 @@ def trend_following_opportunity(df: pd.DataFrame, window_ema_1: int = 20, window
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
 
-    def ema(x: pd.Series, n: int) -> pd.Series:
-        """
-        Calculate the exponential moving average of a series.
-
-        Parameters
-        ----------
-        x : pd.Series
-            The input series.
-        n : int
-            The span of the exponential moving average.
-
-        Returns
-        -------
-        pd.Series
-            The exponential moving average of the input series.
-        """
-        return x.ewm(span=n, adjust=False).mean()
-
     alpha = ema(df['returns_100'], window_ema_1) - ema(df['returns_10'], window_ema_2)
     condition = df['returns_100'] > 0
 
@@ -1,77 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x: pd.Series, n: int) -> pd.Series:
-    """
-    Exponential Moving Average.
-
-    Parameters
-    ----------
-    x : pd.Series
-        Input series.
-    n : int
-        Window size.
-
-    Returns
-    -------
-    pd.Series
-        Exponential moving average of the input series.
-    """
-    return x.ewm(span=n, adjust=False).mean()
-
-def sma(x: pd.Series, n: int) -> pd.Series:
-    """
-    Simple Moving Average.
-
-    Parameters
-    ----------
-    x : pd.Series
-        Input series.
-    n : int
-        Window size.
-
-    Returns
-    -------
-    pd.Series
-        Simple moving average of the input series.
-    """
-    return x.rolling(window=n).mean()
-
-def zscore(x: pd.Series, n: int) -> pd.Series:
-    """
-    Z-score.
-
-    Parameters
-    ----------
-    x : pd.Series
-        Input series.
-    n : int
-        Window size.
-
-    Returns
-    -------
-    pd.Series
-        Z-score of the input series.
-    """
-    return (x - x.rolling(window=n).mean()) / x.rolling(window=n).std()
-
-def rank(x: pd.Series, n: int) -> pd.Series:
-    """
-    Rank.
-
-    Parameters
-    ----------
-    x : pd.Series
-        Input series.
-    n : int
-        Window size.
-
-    Returns
-    -------
-    pd.Series
-        Rank of the input series.
-    """
-    return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
+from core.alphas.transforms import ema, rank, sma, zscore
 
 def trend_persistence_alpha(df: pd.DataFrame, ema_window: int = 20, sma_window: int = 10, zscore_window: int = 100) -> Tuple[pd.Series, pd.Series]:
     """
@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Tuple
+from core.alphas.transforms import sma
 
 def volatility_exit_signal(df: pd.DataFrame, window_sma: int = 20, eps: float = 1e-12) -> Tuple[pd.Series, pd.Series]:
     """
@@ -36,9 +37,6 @@ def volatility_exit_signal(df: pd.DataFrame, window_sma: int = 20, eps: float =
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
 
-    def sma(x, n):
-        return x.rolling(window=n).mean()
-
     alpha = -1 * (df['rs_vol_50'].rank() - df['log_vol_60'].rank()) * (sma(df['tail_vol_50'], window_sma) / sma(df['oil_vol_50'], window_sma).abs().clip(lower=eps))
     condition = df['benchmark_USD_factor'] > 0
 
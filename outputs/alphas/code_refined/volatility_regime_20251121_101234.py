@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Tuple
+from core.alphas.transforms import rank, sma
 
 def volatility_regime(df: pd.DataFrame, sma_window: int = 20) -> Tuple[pd.Series, pd.Series]:
     """
@@ -35,14 +36,6 @@ def volatility_regime(df: pd.DataFrame, sma_window: int = 20) -> Tuple[pd.Series
         std = x.rolling(window=n).std()
         return (x - mean) / std.clip(lower=1e-12)
 
-    def rank(x: pd.Series, n: int) -> pd.Series:
-        """Rank"""
-        return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
-
-    def sma(x: pd.Series, n: int) -> pd.Series:
-        """Simple Moving Average"""
-        return x.rolling(window=n).mean()
-
     alpha = zscore(df['rs_vol_50'], 50) * rank(df['log_vol_60'], 60)
     condition = df['rs_vol_50'] > sma(df['rs_vol_120'], sma_window)
     return alpha, condition
\ No newline at end of file
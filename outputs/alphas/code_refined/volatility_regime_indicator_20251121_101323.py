@@ -1,21 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x: pd.Series, n: int) -> pd.Series:
-    """Exponential Moving Average"""
-    return x.ewm(span=n, adjust=False).mean()
-
-def sma(x: pd.Series, n: int) -> pd.Series:
-    """Simple Moving Average"""
-    return x.rolling(window=n).mean()
-
-def zscore(x: pd.Series, n: int) -> pd.Series:
-    """Z-Score"""
-    return (x - sma(x, n)) / x.rolling(window=n).std()
-
-def rank(x: pd.Series, n: int) -> pd.Series:
-    """Rank"""
-    return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
+from core.alphas.transforms import ema, rank, sma, zscore
 
 def volatility_regime_indicator(df: pd.DataFrame, sma_window: int = 20, zscore_window: int = 60, rank_window: int = 120, conditioning_window: int = 50) -> Tuple[pd.Series, pd.Series]:
     """
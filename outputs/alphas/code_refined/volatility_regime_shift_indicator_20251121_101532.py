@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import Tuple
+from core.alphas.transforms import rank, zscore
 
 def calculate_alpha(df: pd.DataFrame, sma_window: int = 20) -> Tuple[pd.Series, pd.Series]:
     """
@@ -31,14 +32,6 @@ def calculate_alpha(df: pd.DataFrame, sma_window: int = 20) -> Tuple[pd.Series,
     if missing:
         raise ValueError(f"Missing required columns: {sorted(missing)}")
 
-    def zscore(x: pd.Series, n: int) -> pd.Series:
-        """Z-score"""
-        return (x - x.rolling(window=n).mean()) / x.rolling(window=n).std()
-
-    def rank(x: pd.Series, n: int) -> pd.Series:
-        """Rank"""
-        return x.rolling(window=n).apply(lambda x: pd.Series(x).rank().iloc[-1])
-
     def abs(x: pd.Series) -> pd.Series:
         """Absolute value"""
         return x.abs()
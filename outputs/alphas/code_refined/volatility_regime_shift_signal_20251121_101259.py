@@ -1,21 +1,6 @@
 import pandas as pd
 from typing import Tuple
-
-def ema(x, n):
-    """Exponential Moving Average"""
-    return x.ewm(span=n, adjust=False).mean()
-
-def sma(x, n):
-    """Simple Moving Average"""
-    return x.rolling(window=n).mean()
-
-def std(x, n):
-    """Standard Deviation"""
-    return x.rolling(window=n).std()
-
-def zscore(x, n):
-    """Z-Score"""
-    return (x - sma(x, n)) / std(x, n)
+from core.alphas.transforms import ema, rank, sma, std, zscore
 
 def volatility_regime_shift_signal(df: pd.DataFrame, sma_window: int = 20) -> Tuple[pd.Series, pd.Series]:
     """
@@ -54,6 +39,6 @@ def volatility_regime_shift_signal(df: pd.DataFrame, sma_window: int = 20) -> Tu
     tail_vol_50 = df['tail_vol_50']
     rs_vol_120 = df['rs_vol_120']
 
-    alpha = zscore(rs_vol_50, 50) * log_vol_60.rolling(window=60).apply(lambda x: pd.Series(x).rank().iloc[-1]) - (tail_vol_50 - rs_vol_120).abs()
+    alpha = zscore(rs_vol_50, 50) * rank(log_vol_60, 60) - (tail_vol_50 - rs_vol_120).abs()
     condition = rs_vol_50 > sma(rs_vol_50, sma_window)
     return alpha, condition
\ No newline at end of file
@@ -0,0 +1,151 @@
+# ==========================================================
+#  QUANTREO ALPHA BUILDING BATCH RUNNER (in-process, concurrent)
+# ==========================================================
+from pathlib import Path
+from dotenv import load_dotenv
+from langchain_core.runnables import RunnableSequence, RunnableLambda
+import argparse
+import random
+import time
+
+from core.utils.io import ensure_dir
+from core.utils.io_dsr import DSRCatalog
+from core.utils.llm import build_llm
+from core.pipelines.alpha_building_steps import (
+    generate_concept,
+    generate_formula,
+    combine_yaml,
+    build_code,
+)
+
+from agents.alpha_building.alpha_ideator import AlphaIdeatorAgent
+from agents.alpha_building.alpha_formulator import AlphaFormulatorAgent
+from agents.alpha_building.alpha_coder import AlphaCoderAgent
+from agents.alpha_building.alpha_code_refiner import AlphaCodeRefinerAgent
+
+# ==========================================================
+#  1. Environment setup
+# ==========================================================
+load_dotenv()
+
+# ==========================================================
+#  2. CLI arguments and configuration
+# ==========================================================
+FOCUSES = ["trend", "volatility", "volume"]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--n", type=int, default=10, help="Number of alpha chains to run.")
+parser.add_argument("--concurrency", type=int, default=4, help="Max chains running at the same time.")
+parser.add_argument(
+    "--focus", "-f",
+    nargs="+",
+    default=["trend", "volatility"],
+    choices=FOCUSES,
+    help="Focus of each run, drawn at random among the given values."
+)
+parser.add_argument("--seed", type=int, default=None, help="Base seed (run i uses seed + i).")
+parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM response cache of the formulation and coding steps.")
+parser.add_argument(
+    "--sampling",
+    default="diverse",
+    choices=["diverse", "uniform"],
+    help="diverse: weight DSRs by assessment and favour uncovered related features; uniform: plain random sample."
+)
+parser.add_argument(
+    "--codegen",
+    default="auto",
+    choices=["auto", "llm", "compiled"],
+    help="auto: compile the formula and fall back to the LLM coder/refiner if it is not compilable."
+)
+ARGS = parser.parse_args()
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DSR_DIR = ROOT_DIR / "outputs" / "features_info" / "dsr"
+
+BASE_DIR          = ROOT_DIR / "outputs" / "alphas"
+CONCEPT_DIR       = BASE_DIR / "concepts"
+FORMULA_DIR       = BASE_DIR / "formulas"
+BUNDLE_DIR        = BASE_DIR / "bundles"
+CODE_DIR          = BASE_DIR / "code"
+CODE_REFINED_DIR  = BASE_DIR / "code_refined"
+
+for d in [CONCEPT_DIR, FORMULA_DIR, BUNDLE_DIR, CODE_DIR, CODE_REFINED_DIR]:
+    ensure_dir(d)
+
+print(f"Alpha batch: n={ARGS.n} | concurrency={ARGS.concurrency} | focus={ARGS.focus} | codegen={ARGS.codegen} | sampling={ARGS.sampling}")
+
+# ==========================================================
+#  3. Initialize LLMs and Agents (once for the whole batch)
+# ==========================================================
+USE_CACHE = not ARGS.no_cache
+llm_creative = build_llm(model="llama-3.1-8b-instant", temperature=0.65)   # ideation: never cached
+llm_precise  = build_llm(model="llama-3.3-70b-versatile", temperature=0.30, cache=USE_CACHE)
+llm_coder    = build_llm(model="llama-3.3-70b-versatile", temperature=0.15, cache=USE_CACHE)
+llm_refiner  = build_llm(model="llama-3.3-70b-versatile", temperature=0.10, cache=USE_CACHE)
+
+# The focus is baked into the ideator prompt: one ideator per focus
+ideators   = {f: AlphaIdeatorAgent(llm_creative, focus=f) for f in ARGS.focus}
+formulator = AlphaFormulatorAgent(llm_precise)
+coder      = AlphaCoderAgent(llm_coder)
+refiner    = AlphaCodeRefinerAgent(llm_refiner)
+
+# ==========================================================
+#  4. Build the chain (input: {"focus": ..., "seed": ...})
+# ==========================================================
+alpha_chain = RunnableSequence(
+    first=RunnableLambda(lambda run: generate_concept(
+        ideator=ideators[run["focus"]],
+        dsr_dir=DSR_DIR,
+        concept_dir=CONCEPT_DIR,
+        focus=run["focus"],
+        subset_size=8,
+        seed=run["seed"],
+        sampling=ARGS.sampling,
+    )),
+    middle=[
+        RunnableLambda(lambda ctx: generate_formula(formulator, ctx, FORMULA_DIR)),
+        RunnableLambda(lambda ctx: combine_yaml(ctx, BUNDLE_DIR)),
+        RunnableLambda(lambda ctx: build_code(coder, refiner, ctx, CODE_DIR, CODE_REFINED_DIR, mode=ARGS.codegen)),
+    ],
+    last=RunnableLambda(lambda ctx: {
+        "focus":   ctx["focus"],
+        "refined": str(ctx["refined_code_path"]),
+        "codegen": ctx["codegen"],
+    }),
+)
+
+# ==========================================================
+#  5. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    rng = random.Random(ARGS.seed)
+    runs = [
+        {
+            "focus": rng.choice(ARGS.focus),
+            "seed": None if ARGS.seed is None else ARGS.seed + i,
+        }
+        for i in range(ARGS.n)
+    ]
+
+    # Index new/modified DSRs once, before the runs refresh the catalog concurrently
+    DSRCatalog(DSR_DIR).refresh()
+
+    print(f"\nRunning {len(runs)} Alpha Building Chains...")
+    start = time.perf_counter()
+    results = alpha_chain.batch(
+        runs,
+        config={"max_concurrency": ARGS.concurrency},
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    ok = [r for r in results if not isinstance(r, Exception)]
+    for run, res in zip(runs, results):
+        if isinstance(res, Exception):
+            print(f"❌ [{run['focus']}] {type(res).__name__}: {res}")
+        else:
+            print(f"✅ [{res['focus']}] ({res['codegen']}) {res['refined']}")
+
+    print("\n------------------------------------------------------------")
+    print(f"Alpha Batch completed: {len(ok)}/{len(runs)} succeeded in {elapsed:.1f}s.")
+    print("------------------------------------------------------------\n")
@@ -4,7 +4,7 @@
 from pathlib import Path
 from dotenv import load_dotenv
 from langchain_core.runnables import RunnableSequence, RunnableLambda
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 import argparse
 
 from core.utils.io import ensure_dir
@@ -12,8 +12,7 @@ from core.pipelines.alpha_building_steps import (
     generate_concept,
     generate_formula,
     combine_yaml,
-    generate_code,
-    refine_code,
+    build_code,
 )
 
 from agents.alpha_building.alpha_ideator import AlphaIdeatorAgent
@@ -39,8 +38,36 @@ parser.add_argument(
         "volume"
     ]
 )
+parser.add_argument(
+    "--no-cache",
+    action="store_true",
+    help="Bypass the on-disk LLM response cache of the formulation and coding steps."
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=None,
+    help="Seed of the DSR subset sampling."
+)
+parser.add_argument(
+    "--sampling",
+    default="diverse",
+    choices=["diverse", "uniform"],
+    help="diverse: weight DSRs by assessment and favour uncovered related features; uniform: plain random sample."
+)
+
+parser.add_argument(
+    "--codegen",
+    default="auto",
+    choices=["auto", "llm", "compiled"],
+    help="auto: compile the formula and fall back to the LLM coder/refiner if it is not compilable."
+)
 
-FOCUS = parser.parse_known_args()[0].focus
+ARGS = parser.parse_known_args()[0]
+FOCUS = ARGS.focus
+USE_CACHE = not ARGS.no_cache
+SEED = ARGS.seed
+CODEGEN = ARGS.codegen
 ROOT_DIR = Path(__file__).resolve().parents[2]
 
 DSR_DIR = ROOT_DIR / "outputs" / "features_info" / "dsr"
@@ -62,25 +89,31 @@ print(f"Formulas directory:     {FORMULA_DIR}")
 print(f"Bundles directory:      {BUNDLE_DIR}")
 print(f"Code directory:         {CODE_DIR}")
 print(f"Refined code directory: {CODE_REFINED_DIR}")
+print(f"LLM response cache:     {'on' if USE_CACHE else 'off'} (formulation and coding steps)")
+print(f"Code generation:        {CODEGEN}")
+print(f"DSR sampling:           {ARGS.sampling}")
 
 # ==========================================================
 #  3. Initialize LLMs and Agents
 # ==========================================================
-llm_creative = ChatGroq(
+llm_creative = build_llm(
     model="llama-3.1-8b-instant",
-    temperature=0.65
+    temperature=0.65            # ideation: never cached
 )
-llm_precise = ChatGroq(
+llm_precise = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.30
+    temperature=0.30,
+    cache=USE_CACHE
 )
-llm_coder = ChatGroq(
+llm_coder = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.15
+    temperature=0.15,
+    cache=USE_CACHE
 )
-llm_refiner = ChatGroq(
+llm_refiner = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.10
+    temperature=0.10,
+    cache=USE_CACHE
 )
 
 ideator    = AlphaIdeatorAgent(llm_creative, focus=FOCUS)
@@ -97,13 +130,14 @@ alpha_chain = RunnableSequence(
         dsr_dir=DSR_DIR,
         concept_dir=CONCEPT_DIR,
         focus=FOCUS,
-        subset_size=8
+        subset_size=8,
+        seed=SEED,
+        sampling=ARGS.sampling,
     )),
     middle=[
         RunnableLambda(lambda ctx: generate_formula(formulator, ctx, FORMULA_DIR)),
         RunnableLambda(lambda ctx: combine_yaml(ctx, BUNDLE_DIR)),
-        RunnableLambda(lambda ctx: generate_code(coder, ctx, CODE_DIR)),
-        RunnableLambda(lambda ctx: refine_code(refiner, ctx, CODE_REFINED_DIR)),
+        RunnableLambda(lambda ctx: build_code(coder, refiner, ctx, CODE_DIR, CODE_REFINED_DIR, mode=CODEGEN)),
     ],
     last=RunnableLambda(lambda ctx: {
         "concept": str(ctx["concept_path"]),
@@ -111,6 +145,7 @@ alpha_chain = RunnableSequence(
         "bundle":  str(ctx["bundle_path"]),
         "code":    str(ctx["code_path"]),
         "refined": str(ctx["refined_code_path"]),
+        "codegen": ctx["codegen"],
     }),
 )
 
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO ALPHA CODER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from pathlib import Path
 from dotenv import load_dotenv
 from agents.alpha_building.alpha_coder import AlphaCoderAgent
@@ -44,9 +44,10 @@ with open(formula_path, "r", encoding="utf-8") as f:
 # ==========================================================
 #  4. Initialize model and Alpha Coder Agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.15
+    temperature=0.15,
+    cache=True
 )
 agent = AlphaCoderAgent(llm)
 
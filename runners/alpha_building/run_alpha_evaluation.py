@@ -0,0 +1,96 @@
+# ==========================================================
+#  QUANTREO ALPHA EVALUATION RUNNER (IC, decay, turnover — no LLM)
+# ==========================================================
+#  Runs every refined alpha (outputs/alphas/code_refined/*.py) on the feature
+#  store and scores it against forward returns, per asset. The statistics of
+#  each alpha are saved next to its bundle (bundles/<basename>_evaluation.json),
+#  and all of them in one table (outputs/alphas/evaluation/).
+from pathlib import Path
+import argparse
+import datetime
+import time
+
+import pandas as pd
+
+from core.alphas.evaluation import DEFAULT_HORIZONS, evaluate_frame, evaluation_record, load_alphas
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir
+from core.utils.io_alphas import save_evaluation
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+BASE_DIR = ROOT_DIR / "outputs" / "alphas"
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--assets", nargs="+", default=None, help="Assets to evaluate on (default: every asset of the store).")
+parser.add_argument("--store", default=str(STORE_DIR), help="Feature store root.")
+parser.add_argument("--start", default=None, help="First bar of the evaluation.")
+parser.add_argument("--end", default=None, help="Last bar of the evaluation.")
+parser.add_argument("--price-col", default="close", help="Price column of the forward returns.")
+parser.add_argument("--horizons", nargs="+", type=int, default=list(DEFAULT_HORIZONS),
+                    help="Forward-return horizons, in bars.")
+parser.add_argument("--code-dir", default=str(BASE_DIR / "code_refined"), help="Directory of the refined alpha code.")
+parser.add_argument("--out", default=str(BASE_DIR / "evaluation"), help="Output directory of the combined table.")
+ARGS = parser.parse_args()
+
+# ==========================================================
+#  2. Load alphas and evaluate per asset
+# ==========================================================
+if __name__ == "__main__":
+    functions, columns, load_errors = load_alphas(Path(ARGS.code_dir))
+    print(f"Alphas: {len(functions)} loaded, {len(load_errors)} failed | horizons: {ARGS.horizons}")
+    for name, err in load_errors.items():
+        print(f"❌ {name}: {err}")
+    if not functions:
+        raise FileNotFoundError(f"No alpha code could be loaded from {ARGS.code_dir}")
+
+    store = FeatureStore(Path(ARGS.store))
+    assets = ARGS.assets or store.assets()
+    required = sorted({c for cols in columns.values() for c in cols} | {ARGS.price_col})
+
+    scores, errors, bars = {}, {}, {}
+    for asset in assets:
+        start = time.perf_counter()
+        # one projected read per asset; alphas needing an absent column fail on their own
+        available = set(store.columns(asset))
+        df = store.read(asset, columns=[c for c in required if c in available], start=ARGS.start, end=ARGS.end)
+        loaded = time.perf_counter() - start
+        scores[asset], errors[asset] = evaluate_frame(functions, df, price_col=ARGS.price_col, horizons=ARGS.horizons)
+        bars[asset] = len(df)
+        print(f"\n[{asset}] {len(df):,} bars loaded in {loaded:.2f}s, "
+              f"{len(scores[asset])} alphas scored in {time.perf_counter() - start - loaded:.2f}s.")
+        for name, err in errors[asset].items():
+            print(f"❌ {name}: {err}")
+
+    # ==========================================================
+    #  3. Save: one JSON per bundle, one combined table
+    # ==========================================================
+    evaluated_at = datetime.datetime.now().isoformat(timespec="seconds")
+    for name in functions:
+        save_evaluation({
+            "alpha": name,
+            "code_file": f"{name}.py",
+            "evaluated_at": evaluated_at,
+            "price_col": ARGS.price_col,
+            "horizons": ARGS.horizons,
+            "bars": bars,
+            "assets": evaluation_record(scores, name),
+            "errors": {asset: errs[name] for asset, errs in errors.items() if name in errs},
+        }, BASE_DIR, name)
+
+    out_dir = Path(ARGS.out)
+    ensure_dir(out_dir)
+    table = pd.concat(
+        [frame.assign(asset=asset).reset_index() for asset, frame in scores.items()], ignore_index=True,
+    )
+    table.to_parquet(out_dir / "alpha_scores.parquet", index=False)
+    table.to_csv(out_dir / "alpha_scores.csv", index=False)
+
+    ic_cols = [f"ic_{h}" for h in ARGS.horizons]
+    mean_ic = table.groupby("alpha")[ic_cols + ["turnover", "coverage"]].mean()
+    print("\nMean over assets:")
+    print(mean_ic.sort_values(ic_cols[0], key=lambda s: -s.abs()).round(4).to_string())
+    print(f"\nSaved evaluations next to the bundles of {BASE_DIR / 'bundles'} and the table to {out_dir}")
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO ALPHA FORMULATOR RUNNER — single concept
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.alpha_building.alpha_formulator import AlphaFormulatorAgent
 from pathlib import Path
 from dotenv import load_dotenv
@@ -49,9 +49,10 @@ concept = yaml.safe_load(concept_file.read_text(encoding="utf-8"))
 # ==========================================================
 #  4. Initialize model and Agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.35
+    temperature=0.35,
+    cache=True
 )
 agent = AlphaFormulatorAgent(llm)
 
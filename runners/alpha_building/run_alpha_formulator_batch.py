@@ -0,0 +1,73 @@
+# ==========================================================
+#  QUANTREO ALPHA FORMULATOR RUNNER — batched concepts
+# ==========================================================
+#  Formulates the concepts of outputs/alphas/concepts that have no formula
+#  yet (or all of them with --all), packing --batch-size concepts into each
+#  LLM call. Formulas are saved under the basename of their concept.
+from pathlib import Path
+from dotenv import load_dotenv
+import argparse
+import time
+
+from core.utils.io import ensure_dir, load_yaml
+from core.utils.io_alphas import formula_path, save_formula
+from core.utils.llm import build_llm
+from agents.alpha_building.alpha_formulator import AlphaFormulatorAgent
+
+# ==========================================================
+#  1. Environment setup
+# ==========================================================
+load_dotenv()
+
+# ==========================================================
+#  2. CLI arguments and configuration
+# ==========================================================
+parser = argparse.ArgumentParser()
+parser.add_argument("--batch-size", type=int, default=5, help="Concepts formulated per LLM call.")
+parser.add_argument("--all", action="store_true", help="Re-formulate concepts that already have a formula.")
+parser.add_argument("--limit", type=int, default=None, help="Formulate at most N concepts.")
+parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM response cache.")
+ARGS = parser.parse_args()
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+BASE_DIR = ROOT_DIR / "outputs" / "alphas"
+CONCEPT_DIR = BASE_DIR / "concepts"
+ensure_dir(BASE_DIR / "formulas")
+
+concept_files = sorted(CONCEPT_DIR.glob("*.yaml"))
+if not concept_files:
+    raise FileNotFoundError(f"No alpha_concept YAMLs found in {CONCEPT_DIR}")
+if not ARGS.all:
+    concept_files = [p for p in concept_files if not formula_path(BASE_DIR, p.stem).exists()]
+concept_files = concept_files[:ARGS.limit] if ARGS.limit else concept_files
+
+print(f"Concepts directory: {CONCEPT_DIR}")
+print(f"Concepts to formulate: {len(concept_files)} | batch size: {ARGS.batch_size}")
+
+# ==========================================================
+#  3. Initialize model and Agent
+# ==========================================================
+llm = build_llm(model="llama-3.3-70b-versatile", temperature=0.30, cache=not ARGS.no_cache)
+agent = AlphaFormulatorAgent(llm)
+
+# ==========================================================
+#  4. Formulate and save
+# ==========================================================
+concepts = {p.stem: load_yaml(p) for p in concept_files}
+start = time.perf_counter()
+results = agent.formulate_batch(concepts, batch_size=ARGS.batch_size)
+elapsed = time.perf_counter() - start
+
+saved = 0
+for basename, formula_yaml in results.items():
+    if not formula_yaml:
+        print(f"❌ {basename}: formulation failed.")
+        continue
+    formula_yaml.setdefault("meta", {})
+    formula_yaml["meta"]["concept_file"] = f"{basename}.yaml"
+    save_formula(formula_yaml, BASE_DIR, basename)
+    saved += 1
+
+print("\n------------------------------------------------------------")
+print(f"Alpha Formulator Batch completed: {saved}/{len(results)} formulas in {elapsed:.1f}s.")
+print("------------------------------------------------------------\n")
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO ALPHA IDEATOR RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.alpha_building.alpha_ideator import AlphaIdeatorAgent
 from pathlib import Path
 from dotenv import load_dotenv
@@ -60,7 +60,7 @@ dsr_list = [data for _, data in subset]
 # ==========================================================
 #  4. Initialize model and Alpha Ideator Agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="openai/gpt-oss-120b",
     temperature=0.55
 )
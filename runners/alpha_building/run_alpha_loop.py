@@ -1,7 +1,8 @@
-import os, time, random
+import os, random
 
+# LLM calls are paced by the shared rate limiter (core/utils/llm.py),
+# so runs are chained back to back instead of sleeping between them.
 focuses = ["trend", "volatility"]
 for _ in range(10):
     f = random.choice(focuses)
     os.system(f"python run_alpha_chain.py --focus {f}")
-    time.sleep(20)
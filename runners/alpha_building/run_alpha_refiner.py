@@ -3,7 +3,7 @@
 # ==========================================================
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.alpha_building.alpha_code_refiner import AlphaCodeRefinerAgent
 
 # ==========================================================
@@ -27,9 +27,10 @@ print(f"Output directory:      {OUT_DIR}")
 # ==========================================================
 #  3. Initialize model and Alpha Code Refiner Agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.1
+    temperature=0.1,
+    cache=True
 )
 agent = AlphaCodeRefinerAgent(llm)
 
@@ -0,0 +1,125 @@
+# ==========================================================
+#  QUANTREO ALPHA SIGNALS RUNNER (batch evaluation, no LLM)
+# ==========================================================
+from pathlib import Path
+import argparse
+import time
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.alphas.batch import AlphaBatch
+from core.feature_store.mmap_store import DEFAULT_CHUNK_ROWS, MmapStore
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+BUNDLE_DIR = ROOT_DIR / "outputs" / "alphas" / "bundles"
+SIGNAL_DIR = ROOT_DIR / "outputs" / "alphas" / "signals"
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+MMAP_DIR = ROOT_DIR / "data" / "feature_mmap"
+
+parser = argparse.ArgumentParser()
+source = parser.add_mutually_exclusive_group(required=True)
+source.add_argument("--features", help="Single feature frame (.parquet or .csv, time index first).")
+source.add_argument("--assets", nargs="+", help="Assets to read from the feature store (e.g. 6E 6B).")
+parser.add_argument("--store", default=None,
+                    help=f"Feature store root (with --assets; default {STORE_DIR}, or {MMAP_DIR} with --mmap).")
+parser.add_argument("--mmap", action="store_true",
+                    help="Scan a memory-mapped store chunk by chunk (bounded memory, see run_export_mmap).")
+parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS, help="Rows per chunk with --mmap.")
+parser.add_argument("--start", default=None, help="First bar to evaluate (with --assets).")
+parser.add_argument("--end", default=None, help="Last bar to evaluate (with --assets).")
+parser.add_argument("--bundles", default=str(BUNDLE_DIR), help="Directory of alpha bundle YAMLs.")
+parser.add_argument("--out", default=str(SIGNAL_DIR), help="Output directory of the alpha/condition frames.")
+ARGS = parser.parse_args()
+if ARGS.mmap and not ARGS.assets:
+    parser.error("--mmap requires --assets")
+
+
+def load_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col=0, parse_dates=True)
+
+
+def scan_mmap(batch: AlphaBatch, store: MmapStore, asset: str, out_dir: Path) -> int:
+    """Evaluate chunk by chunk with warm-up overlap and stream the results: one chunk is resident at a time."""
+    columns = [c for c in batch.columns() if c in set(store.columns(asset))]
+    writers, rows = {}, 0
+    chunks = store.iter_frames(asset, columns, ARGS.chunk_rows, batch.lookback(), ARGS.start, ARGS.end)
+    try:
+        for frame, n_warmup in chunks:
+            alphas, conditions = batch.evaluate(frame)
+            for kind, out in (("alphas", alphas), ("conditions", conditions)):
+                table = pa.Table.from_pandas(out.iloc[n_warmup:])
+                if kind not in writers:
+                    writers[kind] = pq.ParquetWriter(out_dir / f"{asset}_{kind}.parquet", table.schema)
+                writers[kind].write_table(table)
+            rows += len(frame) - n_warmup
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return rows
+
+
+# ==========================================================
+#  2. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    out_dir = Path(ARGS.out)
+    ensure_dir(out_dir)
+
+    batch = AlphaBatch.from_dir(Path(ARGS.bundles))
+    stats = batch.stats()
+    print(f"Compiled {stats['alphas']} alphas ({stats['failed']} failed): "
+          f"{stats['nodes_shared']} shared nodes instead of {stats['nodes_separate']}.")
+    for expr, count in batch.shared_nodes()[:10]:
+        print(f"  x{count}  {expr}")
+    for key, err in batch.errors.items():
+        print(f"❌ {key}: {err}")
+
+    if ARGS.mmap:
+        store = MmapStore(Path(ARGS.store or MMAP_DIR))
+        for asset in ARGS.assets:
+            start = time.perf_counter()
+            rows = scan_mmap(batch, store, asset, out_dir)
+            print(f"\n[{asset}] scanned {rows:,} rows (warm-up {batch.lookback()}) in "
+                  f"{time.perf_counter() - start:.2f}s.")
+            for key, err in batch.skipped.items():
+                print(f"❌ {key}: {err}")
+        frames = {}
+    elif ARGS.features:
+        frames = {Path(ARGS.features).stem: lambda: load_frame(Path(ARGS.features))}
+    else:
+        # Projected reads: only the columns the alphas use (and available for the asset)
+        store = FeatureStore(Path(ARGS.store or STORE_DIR))
+        frames = {
+            asset: (lambda a=asset: store.read(
+                a,
+                columns=[c for c in batch.columns() if c in set(store.columns(a))],
+                start=ARGS.start,
+                end=ARGS.end,
+            ))
+            for asset in ARGS.assets
+        }
+
+    for name, load in frames.items():
+        start = time.perf_counter()
+        df = load()
+        loaded = time.perf_counter() - start
+        alphas, conditions = batch.evaluate(df)
+        elapsed = time.perf_counter() - start - loaded
+        print(f"\n[{name}] loaded {df.shape[1]} columns x {len(df):,} rows in {loaded:.2f}s, "
+              f"evaluated {alphas.shape[1]} alphas in {elapsed:.2f}s.")
+
+        for key, err in batch.skipped.items():
+            print(f"❌ {key}: {err}")
+
+        alphas.to_parquet(out_dir / f"{name}_alphas.parquet")
+        conditions.to_parquet(out_dir / f"{name}_conditions.parquet")
+    print(f"\nSaved alpha signals to {out_dir}")
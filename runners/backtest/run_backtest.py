@@ -0,0 +1,70 @@
+# ==========================================================
+#  QUANTREO STRATEGY BACKTEST RUNNER (one strategy, no LLM)
+# ==========================================================
+from pathlib import Path
+import argparse
+import time
+
+import pandas as pd
+
+from core.backtest.engine import backtest, performance_stats
+from core.backtest.expressions import compile_strategy
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir, load_yaml, save_yaml
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--strategy", required=True, help="Strategy YAML (outputs/strategies/Strategy_*/<name>.yaml).")
+parser.add_argument("--assets", nargs="+", default=None, help="Assets to backtest (default: every asset of the store).")
+parser.add_argument("--store", default=str(STORE_DIR), help="Feature store root.")
+parser.add_argument("--start", default=None, help="First bar of the backtest.")
+parser.add_argument("--end", default=None, help="Last bar of the backtest.")
+parser.add_argument("--price-col", default="close", help="Execution price column of the feature store.")
+parser.add_argument("--cost-bps", type=float, default=0.0, help="Cost per unit of turnover, in basis points.")
+parser.add_argument("--no-strict", action="store_true",
+                    help="Do not check the expressions against their identifiers_used.")
+parser.add_argument("--out", default=None, help="Output directory (default: <strategy dir>/backtest).")
+ARGS = parser.parse_args()
+
+STRATEGY_PATH = Path(ARGS.strategy)
+OUT_DIR = Path(ARGS.out) if ARGS.out else STRATEGY_PATH.parent / "backtest"
+
+# ==========================================================
+#  2. Compile and run
+# ==========================================================
+if __name__ == "__main__":
+    strategy = compile_strategy(load_yaml(STRATEGY_PATH), strict=not ARGS.no_strict)
+    store = FeatureStore(Path(ARGS.store))
+    assets = ARGS.assets or store.assets()
+    ensure_dir(OUT_DIR)
+
+    print(f"Strategy: {strategy.name} ({STRATEGY_PATH.name})")
+    print(f"Columns:  {strategy.columns} + {ARGS.price_col}")
+    print(f"Exit:     max_duration={strategy.max_duration} stop_loss={strategy.stop_loss} "
+          f"take_profit={strategy.take_profit} signal={'yes' if strategy.exit_step is not None else 'no'}")
+
+    summary = {}
+    for asset in assets:
+        df = store.read(asset, columns=strategy.columns + [ARGS.price_col], start=ARGS.start, end=ARGS.end)
+        start = time.perf_counter()
+        result = backtest(strategy, df, price_col=ARGS.price_col, cost_bps=ARGS.cost_bps)
+        elapsed = time.perf_counter() - start
+
+        stats = performance_stats(result["series"], result["trades"])
+        stats.update({"bars": len(df), "runtime_s": round(elapsed, 3)})
+        summary[asset] = stats
+
+        result["series"].to_parquet(OUT_DIR / f"{asset}_series.parquet")
+        result["trades"].to_csv(OUT_DIR / f"{asset}_trades.csv", index=False)
+        print(f"✅ {asset}: {len(df)} bars, {stats['n_trades']} trades, sharpe {stats['sharpe']:.2f}, "
+              f"max DD {stats['max_drawdown']:.4f} in {elapsed:.2f}s")
+
+    save_yaml({"strategy": strategy.name, "source": STRATEGY_PATH.name, "assets": summary},
+              OUT_DIR / "summary.yaml")
+    print(f"\nSummary saved to {OUT_DIR / 'summary.yaml'}")
+    print(pd.DataFrame(summary).T.to_string())
@@ -0,0 +1,90 @@
+# ==========================================================
+#  QUANTREO STRATEGY LEADERBOARD RUNNER (all strategies, no LLM)
+# ==========================================================
+#  Compiles every outputs/strategies/Strategy_*/*.yaml, reads the feature
+#  store once per asset and backtests all strategies against a shared signal
+#  cache. Writes a leaderboard ranked by Sharpe ratio.
+from pathlib import Path
+import argparse
+import time
+
+from core.backtest.scoring import compile_all, discover_strategies, score_strategies
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir, save_yaml
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STRATEGY_DIR = ROOT_DIR / "outputs" / "strategies"
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--strategies", default=str(STRATEGY_DIR), help="Folder of the Strategy_* directories.")
+parser.add_argument("--assets", nargs="+", default=None, help="Assets to backtest (default: every asset of the store).")
+parser.add_argument("--store", default=str(STORE_DIR), help="Feature store root.")
+parser.add_argument("--start", default=None, help="First bar of the backtest.")
+parser.add_argument("--end", default=None, help="Last bar of the backtest.")
+parser.add_argument("--price-col", default="close", help="Execution price column of the feature store.")
+parser.add_argument("--cost-bps", type=float, default=0.0, help="Cost per unit of turnover, in basis points.")
+parser.add_argument("--cache-gb", type=float, default=2.0, help="Signal cache budget per asset, in GB.")
+parser.add_argument("--limit", type=int, default=None, help="Score at most N strategies.")
+parser.add_argument("--no-strict", action="store_true",
+                    help="Do not check the expressions against their identifiers_used.")
+parser.add_argument("--out", default=None, help="Output directory (default: <strategies>/leaderboard).")
+ARGS = parser.parse_args()
+
+OUT_DIR = Path(ARGS.out) if ARGS.out else Path(ARGS.strategies) / "leaderboard"
+
+# ==========================================================
+#  2. Compile, load and score
+# ==========================================================
+if __name__ == "__main__":
+    paths = discover_strategies(Path(ARGS.strategies))
+    paths = paths[:ARGS.limit] if ARGS.limit else paths
+    if not paths:
+        raise FileNotFoundError(f"No strategy YAML found in {ARGS.strategies}")
+
+    start = time.perf_counter()
+    strategies, errors = compile_all(paths, strict=not ARGS.no_strict)
+    print(f"Strategies: {len(paths)} found, {len(strategies)} compiled, {len(errors)} failed "
+          f"({time.perf_counter() - start:.1f}s)")
+    for source, message in errors.items():
+        print(f"❌ {source}: {message}")
+
+    store = FeatureStore(Path(ARGS.store))
+    assets = ARGS.assets or store.assets()
+    required = sorted({c for s in strategies.values() for c in s.columns} | {ARGS.price_col})
+    frames = {}
+    for asset in assets:
+        # columns absent from an asset only fail the strategies that use them
+        available = set(store.columns(asset))
+        frames[asset] = store.read(asset, columns=[c for c in required if c in available],
+                                   start=ARGS.start, end=ARGS.end)
+    print(f"Columns:    {len(required)} over {len(frames)} assets, "
+          f"{sum(len(df) for df in frames.values())} bars")
+
+    start = time.perf_counter()
+    board = score_strategies(
+        strategies, frames, price_col=ARGS.price_col, cost_bps=ARGS.cost_bps,
+        errors=errors, max_cache_bytes=int(ARGS.cache_gb * 1024 ** 3),
+    )
+    elapsed = time.perf_counter() - start
+
+    # ==========================================================
+    #  3. Save
+    # ==========================================================
+    ensure_dir(OUT_DIR)
+    board.to_parquet(OUT_DIR / "leaderboard.parquet", index=False)
+    board.to_csv(OUT_DIR / "leaderboard.csv", index=False)
+    save_yaml({
+        "strategies": len(board),
+        "scored": int(board["error"].isna().sum()),
+        "assets": list(frames),
+        "cost_bps": ARGS.cost_bps,
+        "runtime_s": round(elapsed, 3),
+    }, OUT_DIR / "summary.yaml")
+
+    print(f"\n✅ {len(board)} strategies scored in {elapsed:.1f}s")
+    print(board.head(20).to_string(index=False))
+    print(f"\nLeaderboard saved to {OUT_DIR}")
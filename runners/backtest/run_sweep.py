@@ -0,0 +1,125 @@
+# ==========================================================
+#  QUANTREO STRATEGY PARAMETER SWEEP RUNNER (no LLM)
+# ==========================================================
+#  Backtests one strategy over a grid (or a random sample) of its exit and
+#  sizing parameters, and ranks the combinations by deflated Sharpe ratio.
+#
+#  Example:
+#    python -m runners.backtest.run_sweep --strategy outputs/strategies/Strategy_000001/x.yaml \
+#        --param max_duration=10:60:10 --param stop_loss=0.005,0.01,0.02
+from pathlib import Path
+import argparse
+import time
+
+import numpy as np
+
+from core.backtest.expressions import compile_strategy
+from core.backtest.sweep import (
+    INTEGER_PARAMETERS,
+    default_space,
+    parameter_grid,
+    random_combinations,
+    run_sweep,
+    strategy_parameters,
+)
+from core.feature_store.parquet_store import FeatureStore
+from core.utils.io import ensure_dir, load_yaml, save_yaml
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--strategy", required=True, help="Strategy YAML (outputs/strategies/Strategy_*/<name>.yaml).")
+parser.add_argument("--param", action="append", default=[],
+                    help="Parameter values: name=lo:hi:step or name=v1,v2,... (repeatable). "
+                         "Parameters not given keep their declared value; "
+                         "without any --param, every parameter is swept around its declared value.")
+parser.add_argument("--random", type=int, default=None,
+                    help="Draw N random combinations within the ranges instead of the full grid.")
+parser.add_argument("--seed", type=int, default=0, help="Seed of --random.")
+parser.add_argument("--assets", nargs="+", default=None, help="Assets to backtest (default: every asset of the store).")
+parser.add_argument("--store", default=str(STORE_DIR), help="Feature store root.")
+parser.add_argument("--start", default=None, help="First bar of the backtest.")
+parser.add_argument("--end", default=None, help="Last bar of the backtest.")
+parser.add_argument("--price-col", default="close", help="Execution price column of the feature store.")
+parser.add_argument("--cost-bps", type=float, default=0.0, help="Cost per unit of turnover, in basis points.")
+parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU).")
+parser.add_argument("--chunk-size", type=int, default=16, help="Combinations per worker task.")
+parser.add_argument("--no-strict", action="store_true",
+                    help="Do not check the expressions against their identifiers_used.")
+parser.add_argument("--out", default=None, help="Output directory (default: <strategy dir>/sweep).")
+ARGS = parser.parse_args()
+
+STRATEGY_PATH = Path(ARGS.strategy)
+OUT_DIR = Path(ARGS.out) if ARGS.out else STRATEGY_PATH.parent / "sweep"
+
+
+def parse_param(text: str):
+    """'name=lo:hi:step' or 'name=v1,v2' -> (name, values)."""
+    name, _, spec = text.partition("=")
+    if not spec:
+        raise ValueError(f"Invalid --param '{text}' (expected name=lo:hi:step or name=v1,v2).")
+    if ":" in spec:
+        lo, hi, step = (float(x) for x in spec.split(":"))
+        values = np.arange(lo, hi + step / 2, step).round(10).tolist()
+    else:
+        values = [float(x) for x in spec.split(",")]
+    if name.strip() in INTEGER_PARAMETERS:
+        values = sorted({int(round(v)) for v in values})
+    return name.strip(), values
+
+
+# ==========================================================
+#  2. Build the parameter space and run
+# ==========================================================
+if __name__ == "__main__":
+    strategy_yaml = load_yaml(STRATEGY_PATH)
+    strategy = compile_strategy(strategy_yaml, strict=not ARGS.no_strict)
+    declared = strategy_parameters(strategy_yaml)
+    if ARGS.param:
+        space = {name: [value] for name, value in declared.items()}
+        space.update(dict(parse_param(p) for p in ARGS.param))
+    else:
+        space = default_space(declared)
+    if not space:
+        raise ValueError(f"{STRATEGY_PATH.name} declares no exit or sizing parameter to sweep.")
+    combos = random_combinations(space, ARGS.random, seed=ARGS.seed) if ARGS.random else parameter_grid(space)
+
+    store = FeatureStore(Path(ARGS.store))
+    assets = ARGS.assets or store.assets()
+    frames = {
+        asset: store.read(asset, columns=strategy.columns + [ARGS.price_col], start=ARGS.start, end=ARGS.end)
+        for asset in assets
+    }
+
+    print(f"Strategy: {strategy.name} ({STRATEGY_PATH.name})")
+    for name, values in space.items():
+        print(f"  {name}: {values}")
+    print(f"Combinations: {len(combos)} | assets: {len(frames)} | bars: {sum(len(df) for df in frames.values())}")
+
+    start = time.perf_counter()
+    results, summary = run_sweep(
+        strategy_yaml, frames, combos,
+        price_col=ARGS.price_col, cost_bps=ARGS.cost_bps, workers=ARGS.workers,
+        strict=not ARGS.no_strict, chunk_size=ARGS.chunk_size,
+    )
+    elapsed = time.perf_counter() - start
+    summary.update({"source": STRATEGY_PATH.name, "runtime_s": round(elapsed, 3)})
+
+    # ==========================================================
+    #  3. Save
+    # ==========================================================
+    ensure_dir(OUT_DIR)
+    results = results.sort_values("dsr", ascending=False, na_position="last").reset_index(drop=True)
+    results.to_parquet(OUT_DIR / "results.parquet", index=False)
+    save_yaml(summary, OUT_DIR / "summary.yaml")
+
+    print(f"\n✅ {len(results)} combinations in {elapsed:.1f}s "
+          f"({elapsed / len(results) * 1000:.0f} ms each)")
+    print(f"Sharpe threshold (expected max of {summary['trials']} trials): {summary['sharpe_threshold']:.2f} | "
+          f"DSR > 0.95: {summary['significant_share']:.1%}")
+    print(results.head(10).to_string())
+    print(f"\nResults saved to {OUT_DIR}")
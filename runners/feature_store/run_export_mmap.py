@@ -0,0 +1,37 @@
+# ==========================================================
+#  QUANTREO FEATURE STORE -> MEMORY-MAPPED LAYOUT
+# ==========================================================
+from pathlib import Path
+import argparse
+import time
+
+from core.feature_store.mmap_store import DTYPES, MmapStore
+from core.feature_store.parquet_store import FeatureStore
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--store", default=str(ROOT_DIR / "data" / "feature_store"), help="Parquet feature store root.")
+parser.add_argument("--out", default=str(ROOT_DIR / "data" / "feature_mmap"), help="Memory-mapped store root.")
+parser.add_argument("--assets", nargs="+", default=None, help="Assets to export (default: all).")
+parser.add_argument("--columns", nargs="+", default=None, help="Columns to export (default: all).")
+parser.add_argument("--dtype", default="float64", choices=list(DTYPES),
+                    help="Column dtype. float32 halves memory but rounds features to ~7 digits.")
+ARGS = parser.parse_args()
+
+# ==========================================================
+#  2. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    store = FeatureStore(Path(ARGS.store))
+    mmap_store = MmapStore(Path(ARGS.out))
+
+    for asset in ARGS.assets or store.assets():
+        start = time.perf_counter()
+        rows = mmap_store.export_from(store, asset, columns=ARGS.columns, dtype=ARGS.dtype)
+        n_cols = len(mmap_store.columns(asset))
+        print(f"✅ {asset}: {rows:,} rows x {n_cols} columns ({ARGS.dtype}) in {time.perf_counter() - start:.2f}s")
+    print(f"\nMemory-mapped store: {mmap_store.root}")
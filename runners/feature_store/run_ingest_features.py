@@ -0,0 +1,50 @@
+# ==========================================================
+#  QUANTREO FEATURE STORE INGESTION
+# ==========================================================
+from pathlib import Path
+import argparse
+
+import pandas as pd
+
+from core.feature_store.parquet_store import TIME_COLUMN, FeatureStore
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--input", required=True, help="Precomputed feature frame (.parquet or .csv).")
+parser.add_argument("--asset", required=True, help="Asset name the rows belong to (e.g. 6E).")
+parser.add_argument("--store", default=str(ROOT_DIR / "data" / "feature_store"))
+parser.add_argument("--partition", default="D", choices=["D", "M", "Y"],
+                    help="Date partition granularity (only used when the store is created).")
+parser.add_argument("--mode", default="append", choices=["append", "overwrite"])
+ARGS = parser.parse_args()
+
+
+def load_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".csv":
+        df = pd.read_csv(path)
+    else:
+        df = pd.read_parquet(path)
+    if TIME_COLUMN in df.columns:
+        df = df.set_index(TIME_COLUMN)
+        df.index = pd.to_datetime(df.index)
+    elif not isinstance(df.index, pd.DatetimeIndex):
+        # A RangeIndex would otherwise be stored as nanoseconds after the epoch
+        raise ValueError(
+            f"{path} has no '{TIME_COLUMN}' column and is not indexed by timestamps."
+        )
+    return df
+
+
+# ==========================================================
+#  2. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    store = FeatureStore(Path(ARGS.store), partition=ARGS.partition)
+    df = load_frame(Path(ARGS.input))
+    written = store.write(ARGS.asset, df, mode=ARGS.mode)
+    print(f"✅ {len(df):,} rows x {df.shape[1]} columns written to {len(written)} partitions "
+          f"of asset '{ARGS.asset}' ({store.root}, partition={store.partition})")
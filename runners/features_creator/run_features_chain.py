@@ -2,13 +2,13 @@
 #  QUANTREO FEATURE CREATION CHAIN RUNNER
 # ==========================================================
 from langchain_core.runnables import RunnableSequence, RunnableLambda
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.feature_creator.ideator import FeatureIdeatorAgent
 from agents.feature_creator.coder import FeatureCoderAgent
 from agents.feature_creator.refiner import FeatureCodeRefinerAgent
 from agents.feature_creator.explainer import FeatureExplainerAgent
 from core.pipelines.feature_chain_steps import (
-    generate_idea, generate_code, refine_code, generate_explanation
+    generate_idea, generate_code, refine_code, performance_gate, generate_explanation
 )
 from core.utils.io import ensure_dir
 from pathlib import Path
@@ -25,10 +25,11 @@ ensure_dir(FEATURES_DIR)
 # ==========================================================
 #  2. Initialize LLMs and agents
 # ==========================================================
-llm_creative = ChatGroq(model="llama-3.1-8b-instant", temperature=0.75)
-llm_precise = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.35)
-llm_refiner = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2)
-llm_explainer = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2)
+# Response cache only for the deterministic steps: the ideator must not replay its first idea
+llm_creative = build_llm(model="llama-3.1-8b-instant", temperature=0.75)
+llm_precise = build_llm(model="llama-3.3-70b-versatile", temperature=0.35, cache=True)
+llm_refiner = build_llm(model="llama-3.3-70b-versatile", temperature=0.2, cache=True)
+llm_explainer = build_llm(model="llama-3.3-70b-versatile", temperature=0.2, cache=True)
 
 ideator = FeatureIdeatorAgent(llm_creative, focus="volatility anomalies")
 coder = FeatureCoderAgent(llm_precise)
@@ -43,6 +44,7 @@ feature_chain = RunnableSequence(
     middle=[
         RunnableLambda(lambda inputs: generate_code(coder, inputs)),
         RunnableLambda(lambda inputs: refine_code(refiner, inputs)),
+        RunnableLambda(lambda inputs: performance_gate(refiner, inputs)),
     ],
     last=RunnableLambda(lambda inputs: generate_explanation(explainer, inputs)),
 )
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO FEATURE CODER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.feature_creator.coder import FeatureCoderAgent
 from core.utils.io import ensure_dir
 from pathlib import Path
@@ -35,9 +35,10 @@ print(f"Parameters: {feature_yaml.get('parameters')}")
 # ==========================================================
 #  4. Initialize model and agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.2
+    temperature=0.2,
+    cache=True
 )
 agent = FeatureCoderAgent(llm)
 
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO FEATURE EXPLAINER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.feature_creator.explainer import FeatureExplainerAgent
 from pathlib import Path
 from core.utils.io import ensure_dir
@@ -31,7 +31,7 @@ print(f"Loaded feature code: {INPUT_FILE.name}")
 # ==========================================================
 #  4. Initialize model and explainer agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
     temperature=0.4
 )
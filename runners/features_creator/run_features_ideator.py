@@ -1,5 +1,5 @@
 from agents.feature_creator.ideator import FeatureIdeatorAgent
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from core.utils.io import save_yaml, ensure_dir
 from pathlib import Path
 from dotenv import load_dotenv
@@ -17,7 +17,7 @@ ensure_dir(OUTPUT_DIR)
 # ---------------------------------------------------------------------
 # LLM initialization
 # ---------------------------------------------------------------------
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.75)
+llm = build_llm(model="llama-3.3-70b-versatile", temperature=0.75)
 
 # ---------------------------------------------------------------------
 # Agent instantiation and feature generation
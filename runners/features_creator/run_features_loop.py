@@ -1,6 +1,6 @@
 import os
-import time
 
+# LLM calls are paced by the shared rate limiter (core/utils/llm.py),
+# so runs are chained back to back instead of sleeping between them.
 for _ in range(10):
     os.system("python run_features_chain.py")
-    time.sleep(30)
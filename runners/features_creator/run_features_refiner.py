@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO FEATURE CODE REFINER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.feature_creator.refiner import FeatureCodeRefinerAgent
 from core.utils.io import ensure_dir
 from pathlib import Path
@@ -29,9 +29,10 @@ with open(INPUT_FILE, "r", encoding="utf-8") as f:
 # ==========================================================
 #  4. Initialize model and refiner agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="llama-3.3-70b-versatile",
-    temperature=0.2
+    temperature=0.2,
+    cache=True
 )
 refiner = FeatureCodeRefinerAgent(llm)
 
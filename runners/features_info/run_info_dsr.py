@@ -1,18 +1,30 @@
 # ==========================================================
 #  QUANTREO FEATURE DSR OBSERVER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
+from core.utils.io_dsr import DSRCatalog, DSRManifest
 from agents.features_info.feature_dsr_observer import FeatureDSRObserver
 from pathlib import Path
 from dotenv import load_dotenv
+import argparse
+import asyncio
 import yaml
-import time
 
 # ==========================================================
 #  1. Environment setup
 # ==========================================================
 load_dotenv()
 
+parser = argparse.ArgumentParser()
+parser.add_argument("--mode", default="async", choices=["sequential", "async"])
+parser.add_argument("--concurrency", type=int, default=4, help="Max in-flight LLM calls (async mode).")
+parser.add_argument("--rpm", type=float, default=None, help="Requests per minute allowed by the provider.")
+parser.add_argument("--tpm", type=float, default=None, help="Tokens per minute allowed by the provider.")
+parser.add_argument("--limit", type=int, default=None, help="Only analyze the first N raw_info files.")
+parser.add_argument("--refresh", default="changed", choices=["changed", "all"],
+                    help="'changed': only new/modified raw_info files (or a new prompt/model); 'all': every file.")
+ARGS = parser.parse_args()
+
 # ==========================================================
 #  2. Define paths
 # ==========================================================
@@ -24,7 +36,7 @@ OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 # ==========================================================
 #  3. Load normalized feature YAML files
 # ==========================================================
-yaml_files = list(INPUT_DIR.glob("*.yaml"))
+yaml_files = sorted(INPUT_DIR.glob("*.yaml"))
 if not yaml_files:
     raise FileNotFoundError(f"No normalized feature YAMLs found in {INPUT_DIR}")
 
@@ -33,33 +45,88 @@ print(f"Found {len(yaml_files)} normalized YAML files.")
 # ==========================================================
 #  4. Initialize model and DSR observer agent
 # ==========================================================
-llm = ChatGroq(
-    model="llama-3.3-70b-versatile",
-    temperature=0.2
+# Every call goes through the shared rate limiter (see core/utils/llm.py);
+# --refresh all rebuilds every DSR instead of replaying cached responses
+MODEL = "llama-3.3-70b-versatile"
+llm = build_llm(
+    model=MODEL,
+    temperature=0.2,
+    cache=True,
+    refresh=ARGS.refresh == "all",
+    rpm=ARGS.rpm,
+    tpm=ARGS.tpm
 )
 observer = FeatureDSRObserver(llm)
 
-# ==========================================================
-#  5. Sequential analysis
-# ==========================================================
-for i, INPUT_FILE in enumerate(yaml_files[:1]):  # Limit to first 10 for testing
-    print(f"\n📄 Analyzing {INPUT_FILE.name} ({i + 1}/{len(yaml_files)})...\n")
+# Incremental refresh: skip the files whose content, prompt and model match the manifest
+manifest = DSRManifest(OUTPUT_DIR)
+catalog = DSRCatalog(OUTPUT_DIR)
+manifest.prune(p.name for p in yaml_files)
+if ARGS.refresh == "all":
+    targets = list(yaml_files)
+else:
+    targets = []
+    for p in yaml_files:
+        reason = manifest.stale_reason(p, observer.prompt_version, MODEL)
+        if reason:
+            print(f"🔄 {p.name}: {reason}")
+            targets.append(p)
+    print(f"{len(yaml_files) - len(targets)} unchanged files skipped (prompt {observer.prompt_version}).")
+
+targets = targets[:ARGS.limit] if ARGS.limit else targets
 
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        feature_yaml = yaml.safe_load(f)
 
-    dsr_result = observer.analyze(feature_yaml)
+def load_feature_yaml(input_file: Path) -> dict:
+    with open(input_file, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f)
 
+
+def save_result(dsr_result, input_file: Path):
     if dsr_result:
-        feature_name = dsr_result.get("feature", INPUT_FILE.stem)
-        observer.save(dsr_result, OUTPUT_DIR, feature_name)
+        feature_name = dsr_result.get("feature", input_file.stem)
+        out_path = observer.save(dsr_result, OUTPUT_DIR, feature_name)
+        manifest.record(input_file, observer.prompt_version, MODEL, out_path)
+        catalog.add(out_path, dsr_result)
     else:
-        print("❌ DSR observation failed.\n")
+        print(f"❌ DSR observation failed for {input_file.name}.\n")
+
+
+# ==========================================================
+#  5a. Sequential analysis
+# ==========================================================
+def run_sequential():
+    for i, input_file in enumerate(targets):
+        print(f"\n📄 Analyzing {input_file.name} ({i + 1}/{len(targets)})...\n")
+        save_result(observer.analyze(load_feature_yaml(input_file)), input_file)
+
+
+# ==========================================================
+#  5b. Concurrent analysis
+# ==========================================================
+async def run_async():
+    semaphore = asyncio.Semaphore(ARGS.concurrency)
+
+    async def analyze_one(i: int, input_file: Path):
+        async with semaphore:
+            print(f"📄 Analyzing {input_file.name} ({i + 1}/{len(targets)})...")
+            try:
+                dsr_result = await observer.aanalyze(load_feature_yaml(input_file))
+            except Exception as e:
+                print(f"❌ {input_file.name}: {e}")
+                dsr_result = None
+            save_result(dsr_result, input_file)
+
+    await asyncio.gather(*(analyze_one(i, f) for i, f in enumerate(targets)))
+
 
-    # Add a small delay to respect API limits
-    time.sleep(10)
+print(f"Mode: {ARGS.mode} | concurrency: {ARGS.concurrency} | files: {len(targets)}")
+if ARGS.mode == "async":
+    asyncio.run(run_async())
+else:
+    run_sequential()
 
 # ==========================================================
 #  6. Completion
 # ==========================================================
+print(f"Rate limiter usage: {llm.limiter.utilization()}")
 print("\n🏁 All DSR analyses completed successfully.\n")
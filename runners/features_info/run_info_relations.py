@@ -0,0 +1,90 @@
+# ==========================================================
+#  QUANTREO FEATURE RELATIONS RUNNER (raw_info YAMLs, no LLM)
+# ==========================================================
+from functools import partial
+from pathlib import Path
+import argparse
+import re
+import time
+
+from core.feature_store.parquet_store import FeatureStore
+from core.features_info.parallel import compute_relations_parallel
+from core.features_info.relations import (
+    CORR_WINDOW,
+    MI_BINS,
+    MI_STEP,
+    MI_WINDOW,
+    N_OBS,
+    compute_relations,
+    save_raw_info,
+)
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+STORE_DIR = ROOT_DIR / "data" / "feature_store"
+OUTPUT_DIR = ROOT_DIR / "outputs" / "features_info" / "raw_info"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--targets", nargs="+", required=True,
+                    help="Targets, e.g. future_rs_vol_120 (built from rs_vol_120 when not stored).")
+parser.add_argument("--features", nargs="+", default=None, help="Features to relate (default: all stored).")
+parser.add_argument("--assets", nargs="+", default=None, help="Assets of the feature store (default: all).")
+parser.add_argument("--store", default=str(STORE_DIR))
+parser.add_argument("--out", default=str(OUTPUT_DIR))
+parser.add_argument("--regime-col", default=None, help="Column of regime labels (nested statistics per regime).")
+parser.add_argument("--top", type=int, default=None, help="Keep the N strongest features per section.")
+parser.add_argument("--n-obs", type=int, default=N_OBS)
+parser.add_argument("--corr-window", type=int, default=CORR_WINDOW)
+parser.add_argument("--mi-window", type=int, default=MI_WINDOW)
+parser.add_argument("--mi-step", type=int, default=MI_STEP)
+parser.add_argument("--bins", type=int, default=MI_BINS)
+parser.add_argument("--workers", type=int, default=None,
+                    help="Processes for the (asset, target) grid (default: one per CPU; 1 = in-process).")
+parser.add_argument("--decimals", type=int, default=2)
+parser.add_argument("--suffix", default="", help="File name suffix, e.g. _exo_var.")
+ARGS = parser.parse_args()
+
+# ==========================================================
+#  2. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    store = FeatureStore(Path(ARGS.store))
+    assets = ARGS.assets or store.assets()
+    if not assets:
+        raise FileNotFoundError(f"No asset found in feature store {store.root}")
+
+    # Only the tail is needed: the analysed rows, the correlation warm-up and the target horizon
+    horizon = max((int(m.group(1)) for t in ARGS.targets if (m := re.search(r"_(\d+)$", t))), default=0)
+    n_rows = ARGS.n_obs + ARGS.corr_window + horizon
+    if ARGS.regime_col:
+        n_rows = None  # each regime needs its own n_obs rows
+
+    start = time.perf_counter()
+    frames = {
+        a: store.read(a) if n_rows is None else store.read_tail(a, n_rows)
+        for a in assets
+    }
+    loaded = time.perf_counter() - start
+
+    compute = compute_relations if ARGS.workers == 1 else partial(compute_relations_parallel, workers=ARGS.workers)
+    docs = compute(
+        frames,
+        ARGS.targets,
+        features=ARGS.features,
+        regime_col=ARGS.regime_col,
+        top=ARGS.top,
+        n_obs=ARGS.n_obs,
+        corr_window=ARGS.corr_window,
+        mi_window=ARGS.mi_window,
+        mi_step=ARGS.mi_step,
+        bins=ARGS.bins,
+    )
+    elapsed = time.perf_counter() - start - loaded
+
+    for doc in docs.values():
+        path = save_raw_info(doc, Path(ARGS.out), suffix=ARGS.suffix, decimals=ARGS.decimals)
+        n_feat = len(doc["relations"]["correlation"])
+        print(f"✅ {doc['target']}: {n_feat} features x {len(assets)} assets -> {path}")
+    print(f"\nLoaded {len(assets)} assets in {loaded:.2f}s, computed relations in {elapsed:.2f}s")
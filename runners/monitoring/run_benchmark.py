@@ -0,0 +1,77 @@
+# ==========================================================
+#  QUANTREO GENERATED CODE BENCHMARK
+# ==========================================================
+from pathlib import Path
+import argparse
+
+import pandas as pd
+
+from core.benchmark.harness import (
+    DEFAULT_SIZES,
+    alpha_files,
+    benchmark_files,
+    feature_files,
+    slowest,
+)
+from core.utils.io import ensure_dir, timestamp
+
+# ==========================================================
+#  1. CLI arguments and configuration
+# ==========================================================
+ROOT_DIR = Path(__file__).resolve().parents[2]
+FEATURES_DIR = ROOT_DIR / "outputs" / "features"
+ALPHA_CODE_DIR = ROOT_DIR / "outputs" / "alphas" / "code_refined"
+REPORT_DIR = ROOT_DIR / "outputs" / "benchmarks"
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--kind", default="all", choices=["all", "feature", "alpha"])
+parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Synthetic frame sizes (rows).")
+parser.add_argument("--max-seconds", type=float, default=60.0,
+                    help="Skip a size when the extrapolated run time exceeds this budget.")
+parser.add_argument("--min-rows-per-s", type=float, default=1e6,
+                    help="Throughput under which a function is flagged as too slow.")
+parser.add_argument("--no-memory", action="store_true", help="Skip the traced run measuring peak memory.")
+ARGS = parser.parse_args()
+
+# ==========================================================
+#  2. Entry point
+# ==========================================================
+if __name__ == "__main__":
+    suites = []
+    if ARGS.kind in ("all", "feature"):
+        suites.append(("feature", feature_files(FEATURES_DIR)))
+    if ARGS.kind in ("all", "alpha"):
+        suites.append(("alpha", alpha_files(ALPHA_CODE_DIR)))
+
+    reports = []
+    for kind, files in suites:
+        print(f"Benchmarking {len(files)} {kind} functions on sizes {ARGS.sizes}...")
+        reports.append(benchmark_files(
+            files, kind,
+            sizes=ARGS.sizes,
+            max_seconds=ARGS.max_seconds,
+            memory=not ARGS.no_memory,
+        ))
+    report = pd.concat(reports, ignore_index=True)
+    report["file"] = report["file"].map(lambda p: str(Path(p).relative_to(ROOT_DIR)))
+
+    ensure_dir(REPORT_DIR)
+    out_path = REPORT_DIR / f"benchmark_{timestamp()}.csv"
+    report.to_csv(out_path, index=False)
+
+    with pd.option_context("display.max_rows", None, "display.width", 200, "display.max_colwidth", 60):
+        print(report.drop(columns=["file", "error"]).round(4).to_string(index=False))
+
+        flagged = slowest(report, ARGS.min_rows_per_s)
+        print(f"\n{flagged['file'].nunique()} functions flagged (< {ARGS.min_rows_per_s:,.0f} rows/s, "
+              f"wrong output length, error or skipped):")
+        for _, row in flagged.iterrows():
+            if row["status"] != "ok":
+                detail = f"{row['status']}: {row['error']}"
+            elif not row["length_ok"]:
+                detail = f"output length differs from the input ({row['n_rows']:,} rows)"
+            else:
+                detail = f"{row['rows_per_s']:,.0f} rows/s at {row['n_rows']:,} rows"
+            print(f"  ⚠️ {row['function']} ({row['file']}): {detail}")
+
+    print(f"\nReport saved to: {out_path}")
@@ -0,0 +1,25 @@
+# ==========================================================
+#  QUANTREO LLM QUOTA MONITOR
+# ==========================================================
+from core.utils.llm import RATE_LIMIT_DIR
+from core.utils.rate_limit import SharedRateLimiter
+
+# ==========================================================
+#  1. Discover shared limiter states
+# ==========================================================
+state_files = sorted(RATE_LIMIT_DIR.glob("*.json")) if RATE_LIMIT_DIR.exists() else []
+if not state_files:
+    print(f"No rate limiter state found in {RATE_LIMIT_DIR}")
+
+# ==========================================================
+#  2. Print utilization per model
+# ==========================================================
+for path in state_files:
+    u = SharedRateLimiter.from_state_file(path).utilization()
+    tpm = f"{u['tokens_last_minute']}/{u['tpm_limit']:.0f} tok" if u["tpm_limit"] else f"{u['tokens_last_minute']} tok"
+    print(
+        f"{path.stem:<30} "
+        f"{u['requests_last_minute']}/{u['rpm_limit']:.0f} req ({u['request_utilization']:.0%})  "
+        f"{tpm}  | total: {u['totals']['requests']} req, "
+        f"{u['totals']['tokens']} tok, waited {u['totals']['wait_s']:.1f}s"
+    )
@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO STRATEGY BLOCK RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from agents.strategy_conception.strategy_builder import StrategyBuilder
 from pathlib import Path
 from dotenv import load_dotenv
@@ -50,7 +50,7 @@ for file in subset:
 # ==========================================================
 #  4. Initialize model and Strategy Block Agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="openai/gpt-oss-120b",
     temperature=0.65
 )
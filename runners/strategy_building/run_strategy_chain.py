@@ -2,7 +2,7 @@
 #  QUANTREO STRATEGY BUILDING CHAIN RUNNER
 # ==========================================================
 from langchain_core.runnables import RunnableSequence, RunnableLambda
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -30,8 +30,8 @@ ensure_dir(STRATEGIES_DIR)
 # --------------------------------------------------
 # 2. Agents
 # --------------------------------------------------
-llm_block = ChatGroq(model="openai/gpt-oss-120b", temperature=0.65)
-llm_report = ChatGroq(model="openai/gpt-oss-120b", temperature=0.2)
+llm_block = build_llm(model="openai/gpt-oss-120b", temperature=0.65)
+llm_report = build_llm(model="openai/gpt-oss-120b", temperature=0.2, cache=True)
 
 builder = StrategyBuilder(llm_block)
 reporter = StrategyReporterAgent(llm_report)
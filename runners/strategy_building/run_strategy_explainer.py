@@ -1,7 +1,7 @@
 # ==========================================================
 #  QUANTREO STRATEGY REPORTER RUNNER
 # ==========================================================
-from langchain_groq import ChatGroq
+from core.utils.llm import build_llm
 from pathlib import Path
 
 from agents.strategy_conception.strategy_explainer import StrategyReporterAgent
@@ -30,9 +30,10 @@ print(f"Loaded strategy YAML: {INPUT_FILE.name}")
 # ==========================================================
 #  4. Initialize model and reporter agent
 # ==========================================================
-llm = ChatGroq(
+llm = build_llm(
     model="openai/gpt-oss-120b",
-    temperature=0.2
+    temperature=0.2,
+    cache=True
 )
 reporter = StrategyReporterAgent(llm)
 